@@ -3,6 +3,7 @@ tests to run and debug your minimax and alphabeta agents locally.  The test
 cases used by the project assistant are not public.
 """
 
+import random
 import unittest
 
 import isolation
@@ -21,5 +22,244 @@ class IsolationTest(unittest.TestCase):
         self.game = isolation.Board(self.player1, self.player2)
 
 
+class BitBoardTest(unittest.TestCase):
+    """The bitboard variant must follow the rules of isolation.Board"""
+
+    def play_both(self, width, height, seed):
+        rng = random.Random(seed)
+        board = isolation.Board("Player1", "Player2", width, height)
+        bitboard = isolation.BitBoard("Player1", "Player2", width, height)
+        while True:
+            for player in ("Player1", "Player2"):
+                self.assertEqual(sorted(board.get_legal_moves(player)),
+                                 sorted(bitboard.get_legal_moves(player)))
+                self.assertEqual(bitboard.mobility(player),
+                                 len(board.get_legal_moves(player)))
+                self.assertEqual(board.get_player_location(player),
+                                 bitboard.get_player_location(player))
+                self.assertEqual(board.utility(player), bitboard.utility(player))
+            self.assertEqual(board.to_string(), bitboard.to_string())
+            self.assertEqual(board.get_blank_spaces(), bitboard.get_blank_spaces())
+            moves = board.get_legal_moves()
+            if not moves:
+                break
+            move = rng.choice(moves)
+            self.assertTrue(bitboard.move_is_legal(move))
+            forecast = bitboard.forecast_move(move)
+            board.apply_move(move)
+            self.assertNotEqual(forecast.to_string(), bitboard.to_string())
+            bitboard.apply_move(move)
+            self.assertEqual(forecast.to_string(), bitboard.to_string())
+        self.assertTrue(bitboard.is_loser(bitboard.active_player))
+        self.assertTrue(bitboard.is_winner(bitboard.inactive_player))
+
+    def test_same_games(self):
+        for seed, (width, height) in enumerate([(7, 7), (7, 7), (5, 8), (9, 4)]):
+            self.play_both(width, height, seed)
+
+    def test_illegal_moves(self):
+        bitboard = isolation.BitBoard("Player1", "Player2")
+        bitboard.apply_move((3, 3))
+        self.assertFalse(bitboard.move_is_legal((3, 3)))
+        self.assertFalse(bitboard.move_is_legal((-1, 0)))
+        self.assertFalse(bitboard.move_is_legal((0, 7)))
+        with self.assertRaises(RuntimeError):
+            bitboard.get_player_location("Player3")
+
+
+class PushPopTest(unittest.TestCase):
+    """push() and pop() must leave the board exactly as it was"""
+
+    def check_push_pop(self, board_class):
+        rng = random.Random(7)
+        game = board_class("Player1", "Player2")
+        states = []
+        while game.get_legal_moves():
+            states.append((game.to_string(), game.hash(), game.move_count,
+                           game.active_player, sorted(game.get_legal_moves())))
+            game.push(rng.choice(game.get_legal_moves()))
+        while states:
+            game.pop()
+            self.assertEqual((game.to_string(), game.hash(), game.move_count,
+                              game.active_player, sorted(game.get_legal_moves())),
+                             states.pop())
+
+    def test_board(self):
+        self.check_push_pop(isolation.Board)
+
+    def test_bitboard(self):
+        self.check_push_pop(isolation.BitBoard)
+
+
+class InPlaceSearchTest(unittest.TestCase):
+    """The in-place players search the same tree as the copying ones"""
+
+    def board(self, player):
+        game = isolation.BitBoard(player, "Player2")
+        game.apply_move((3, 3))
+        game.apply_move((2, 5))
+        return game
+
+    def test_same_moves(self):
+        no_timeout = lambda: float("inf")
+        for depth in (1, 2, 3, 4):
+            for copying, in_place, search in (
+                    (game_agent.MinimaxPlayer, game_agent.InPlaceMinimaxPlayer, "minimax"),
+                    (game_agent.AlphaBetaPlayer, game_agent.InPlaceAlphaBetaPlayer, "alphabeta")):
+                expected, player = copying(search_depth=depth), in_place(search_depth=depth)
+                expected.time_left = player.time_left = no_timeout
+                game = self.board(player)
+                before = game.to_string()
+                self.assertEqual(getattr(player, search)(game, depth),
+                                 getattr(expected, search)(self.board(expected), depth))
+                self.assertEqual(game.to_string(), before)
+
+    def test_timeout_restores_board(self):
+        player = game_agent.InPlaceAlphaBetaPlayer()
+        game = self.board(player)
+        before = game.to_string()
+        calls = [0]
+
+        def time_left():
+            calls[0] += 1
+            return 100. if calls[0] < 500 else 0.
+
+        move = player.get_move(game, time_left)
+        self.assertIn(move, game.get_legal_moves())
+        self.assertEqual(game.to_string(), before)
+
+
+class TranspositionTableTest(unittest.TestCase):
+    """The transposition table is bounded and the search agrees without it"""
+
+    def board(self, player):
+        game = isolation.BitBoard(player, "Player2")
+        game.apply_move((3, 3))
+        game.apply_move((2, 5))
+        return game
+
+    def test_replacement(self):
+        table = game_agent.TranspositionTable(size=4)
+        table.store(1, 3, game_agent.EXACT, 1., (0, 0))
+        table.store(5, 2, game_agent.EXACT, 2., (0, 1))
+        self.assertEqual(table.probe(1)[3], 1.)
+        self.assertIsNone(table.probe(5))
+        table.store(5, 3, game_agent.LOWER, 2., (0, 1))
+        self.assertEqual(table.probe(5)[2], game_agent.LOWER)
+        # entries of an earlier search give way to anything
+        table.new_search()
+        table.store(9, 0, game_agent.UPPER, 3., None)
+        self.assertEqual(table.probe(9)[3], 3.)
+        self.assertEqual((table.probes, table.hits), (4, 3))
+        for key in range(100):
+            table.store(key, 0, game_agent.EXACT, 0., None)
+        self.assertEqual(len(table), 4)
+
+    def test_same_moves(self):
+        no_timeout = lambda: float("inf")
+        for depth in (1, 2, 3, 4, 5):
+            expected = game_agent.InPlaceAlphaBetaPlayer()
+            player = game_agent.TTAlphaBetaPlayer()
+            expected.time_left = player.time_left = no_timeout
+            self.assertEqual(player.alphabeta(self.board(player), depth),
+                             expected.alphabeta(self.board(expected), depth))
+
+    def test_search_again(self):
+        evaluations = [0]
+
+        def score(game, player):
+            evaluations[0] += 1
+            return game_agent.custom_score(game, player)
+
+        player = game_agent.TTAlphaBetaPlayer(score_fn=score)
+        player.time_left = lambda: float("inf")
+        game = self.board(player)
+        move = player.alphabeta(game, 4)
+        self.assertGreater(evaluations[0], 0)
+        evaluations[0] = 0
+        # a repeated search is answered from the table
+        self.assertEqual(player.alphabeta(game, 4), move)
+        self.assertEqual(evaluations[0], 0)
+        self.assertGreater(player.table.hits, 0)
+
+
+class MoveOrderingTest(unittest.TestCase):
+    """Move ordering searches the PV move and killers first and prunes more"""
+
+    def test_order(self):
+        ordering = game_agent.MoveOrdering()
+        moves = [(0, 1), (1, 2), (2, 3), (3, 4)]
+        ordering.cutoff((3, 4), 2, 1)
+        ordering.cutoff((1, 2), 5, 3)
+        ordering.cutoff((2, 3), 5, 1)
+        self.assertEqual(ordering.order(None, moves, 5, best_move=(0, 1)),
+                         [(0, 1), (2, 3), (1, 2), (3, 4)])
+        self.assertEqual(ordering.order(None, moves, 2), [(3, 4), (1, 2), (2, 3), (0, 1)])
+        ordering.new_search()
+        self.assertEqual(ordering.killers, {})
+        self.assertEqual(ordering.history, {(1, 2): 4})
+
+    def test_pruning_gain(self):
+        def search(ordering):
+            player = game_agent.TTAlphaBetaPlayer(ordering=ordering)
+            player.time_left = lambda: float("inf")
+            game = isolation.BitBoard(player, "Player2")
+            game.apply_move((3, 3))
+            game.apply_move((2, 5))
+            for depth in range(1, 7):
+                player.alphabeta(game, depth)
+            return player.stats(), player.table.probe(game.hash())[3]
+
+        plain, plain_score = search(None)
+        for ordering in (game_agent.MoveOrdering(), game_agent.MobilityOrdering()):
+            stats, score = search(ordering)
+            self.assertEqual(score, plain_score)
+            self.assertLess(stats["nodes"], plain["nodes"])
+            self.assertGreater(stats["first_cutoff_rate"], plain["first_cutoff_rate"])
+
+
+class TournamentTest(unittest.TestCase):
+    """The games of a tournament give the same results in worker processes"""
+
+    def test_parallel_games(self):
+        import tournament
+        from sample_players import GreedyPlayer, RandomPlayer, improved_score
+
+        random.seed(3)
+        cpu_agents = [tournament.Agent(GreedyPlayer(), "Greedy"), tournament.Agent(RandomPlayer(), "Random")]
+        test_agents = [tournament.Agent(GreedyPlayer(score_fn=improved_score), "Greedy_Improved"),
+                       tournament.Agent(GreedyPlayer(), "Greedy_2")]
+        tasks = tournament.round_games(0, len(test_agents), 3) + tournament.round_games(1, len(test_agents), 2)
+        self.assertEqual(len(tasks), 20)
+        self.assertEqual(len(set(tuple(task[2]) for task in tasks)), 5)
+        sequential = list(tournament.play_games(cpu_agents, test_agents, tasks))
+        parallel = list(tournament.play_games(cpu_agents, test_agents, tasks, workers=2))
+        self.assertEqual(parallel, sequential)
+        self.assertEqual([result[1] for result in parallel], [task[1] for task in tasks])
+        # the random player makes the same moves in every process and after any other game
+        self.assertEqual(list(tournament.play_games(cpu_agents, test_agents, tasks[::-1], workers=3)),
+                         parallel[::-1])
+        # the workers play on the board class they are given
+        self.assertIs(tournament.BOARD_CLASS, isolation.Board)
+        self.assertEqual(list(tournament.play_games(cpu_agents, test_agents, tasks, workers=2,
+                                                    board_class=isolation.BitBoard)),
+                         list(tournament.play_games(cpu_agents, test_agents, tasks,
+                                                    board_class=isolation.BitBoard)))
+
+    def test_new_game(self):
+        player = game_agent.TTAlphaBetaPlayer(ordering=game_agent.MoveOrdering())
+        player.time_left = lambda: float("inf")
+        game = isolation.BitBoard(player, "Player2")
+        game.apply_move((3, 3))
+        game.apply_move((2, 5))
+        player.alphabeta(game, 4)
+        self.assertGreater(len(player.table), 0)
+        self.assertTrue(player.ordering.history)
+        player.new_game()
+        self.assertEqual(len(player.table), 0)
+        self.assertEqual((player.ordering.history, player.ordering.killers), ({}, {}))
+        self.assertEqual(player.stats()["nodes"], 0)
+
+
 if __name__ == '__main__':
     unittest.main()
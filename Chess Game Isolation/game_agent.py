@@ -420,3 +420,502 @@ class AlphaBetaPlayer(IsolationPlayer):
                 alpha = max(alpha, score)
 
         return score
+
+
+class InPlaceMinimaxPlayer(MinimaxPlayer):
+    """MinimaxPlayer that searches a single board, making and unmaking every
+    move with `Board.push()` and `Board.pop()` instead of allocating a copy
+    of the board for every node with `forecast_move()`. It plays the same
+    moves as MinimaxPlayer.
+    """
+
+    def minimax(self, game, depth):
+        """Depth-limited minimax search, see MinimaxPlayer.minimax(). The
+        board is searched in place and left as it was found.
+        """
+        if self.time_left() < self.TIMER_THRESHOLD:
+            raise SearchTimeout()
+
+        best_score = float("-inf")
+        best_move = (-1, -1)
+
+        for move in game.get_legal_moves():
+            game.push(move)
+            try:
+                score = self.min_value(game, depth-1)
+            finally:
+                game.pop()
+            if score > best_score:
+                best_score = score
+                best_move = move
+
+        return best_move
+
+    def min_value(self, game, depth):
+        if self.time_left() < self.TIMER_THRESHOLD:
+            raise SearchTimeout()
+
+        if self.terminal_test(game, depth):
+            return self.score(game, self)
+
+        score = float("inf")
+        for move in game.get_legal_moves():
+            game.push(move)
+            try:
+                score = min(score, self.max_value(game, depth-1))
+            finally:
+                game.pop()
+        return score
+
+    def max_value(self, game, depth):
+        if self.time_left() < self.TIMER_THRESHOLD:
+            raise SearchTimeout()
+
+        if self.terminal_test(game, depth):
+            return self.score(game, self)
+
+        score = float("-inf")
+        for move in game.get_legal_moves():
+            game.push(move)
+            try:
+                score = max(score, self.min_value(game, depth-1))
+            finally:
+                game.pop()
+        return score
+
+
+class InPlaceAlphaBetaPlayer(AlphaBetaPlayer):
+    """AlphaBetaPlayer that searches a single board with `Board.push()` and
+    `Board.pop()` instead of copying it at every node, so that more nodes fit
+    in each turn. The moves are pushed in the order of get_legal_moves(), so
+    it plays the same moves as AlphaBetaPlayer to the same depth.
+    """
+
+    def alphabeta(self, game, depth, alpha=float("-inf"), beta=float("inf")):
+        """Depth-limited minimax search with alpha-beta pruning, see
+        AlphaBetaPlayer.alphabeta(). The board is searched in place and left
+        as it was found, also when the search times out.
+        """
+        if self.time_left() < self.TIMER_THRESHOLD:
+            raise SearchTimeout()
+
+        best_score = float("-inf")
+        best_move = (-1, -1)
+
+        for move in game.get_legal_moves():
+            game.push(move)
+            try:
+                score = self.min_value(game, depth-1, alpha, beta)
+            finally:
+                game.pop()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                alpha = best_score
+
+        return best_move
+
+    def min_value(self, game, depth, alpha, beta):
+        if self.time_left() < self.TIMER_THRESHOLD:
+            raise SearchTimeout()
+
+        if self.terminal_test(game, depth):
+            return self.score(game, self)
+
+        score = float("inf")
+        for move in game.get_legal_moves():
+            game.push(move)
+            try:
+                score = min(score, self.max_value(game, depth-1, alpha, beta))
+            finally:
+                game.pop()
+            if score <= alpha:
+                break
+            beta = min(beta, score)
+        return score
+
+    def max_value(self, game, depth, alpha, beta):
+        if self.time_left() < self.TIMER_THRESHOLD:
+            raise SearchTimeout()
+
+        if self.terminal_test(game, depth):
+            return self.score(game, self)
+
+        score = float("-inf")
+        for move in game.get_legal_moves():
+            game.push(move)
+            try:
+                score = max(score, self.min_value(game, depth-1, alpha, beta))
+            finally:
+                game.pop()
+            if score >= beta:
+                break
+            alpha = max(alpha, score)
+        return score
+
+
+# Bound flags of a TranspositionTable entry: the stored score is the exact
+# value of the position, a lower bound on it (the search failed high) or an
+# upper bound on it (the search failed low)
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Mixed into the hash of the positions where the searching player is not the
+# one to move, so that the value of a position is stored apart for a player
+# searching it as player 1 and as player 2
+MIN_NODE_KEY = 0x9E3779B97F4A7C15
+
+
+class TranspositionTable:
+    """A fixed-size table of alpha-beta search results keyed by the Zobrist
+    hash of the position, see `isolation.Board.hash()`.
+
+    Each position has one slot, ``key % size``. A slot is overwritten by a
+    result for the same position, by any result once its entry is left over
+    from an earlier search (see new_search()), and otherwise only by a result
+    searched at least as deep, so the most expensive results of the current
+    search are kept.
+
+    Parameters
+    ----------
+    size : int
+        The number of slots.
+
+    Attributes
+    ----------
+    probes, hits, stores : int
+        The lookups, the lookups that found their position and the results
+        written to the table.
+    """
+    def __init__(self, size=1 << 16):
+        self.size = size
+        self.slots = [None] * size
+        self.generation = 0
+        self.probes = self.hits = self.stores = 0
+
+    def new_search(self):
+        """Mark the entries stored so far as left over from an earlier search.
+        """
+        self.generation += 1
+
+    def clear(self):
+        """Empty the table, e.g. before a new game."""
+        self.slots = [None] * self.size
+        self.generation = 0
+
+    def probe(self, key):
+        """Return the (key, depth, flag, score, move, generation) entry of a
+        position, or None if it is not in the table.
+        """
+        self.probes += 1
+        entry = self.slots[key % self.size]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, flag, score, move):
+        """Record the score of a position searched depth plies deep, with the
+        bound flag and the best move found.
+        """
+        slot = key % self.size
+        entry = self.slots[slot]
+        if (entry is None or entry[0] == key or entry[5] != self.generation or
+                depth >= entry[1]):
+            self.slots[slot] = (key, depth, flag, score, move, self.generation)
+            self.stores += 1
+
+    def __len__(self):
+        return sum(1 for entry in self.slots if entry is not None)
+
+
+def bound_flag(score, alpha, beta):
+    """Return the bound flag of a score searched with the window (alpha, beta).
+    """
+    if score <= alpha:
+        return UPPER
+    if score >= beta:
+        return LOWER
+    return EXACT
+
+
+def mobility(game, player=None):
+    """Return the number of legal moves of a player, the active player if
+    None, with `isolation.BitBoard.mobility()` when the board has it.
+    """
+    count = getattr(game, "mobility", None)
+    if count is not None:
+        return count(player)
+    return len(game.get_legal_moves(player))
+
+
+class MoveOrdering:
+    """Decides the order in which the alpha-beta search tries the moves of a
+    node: the best move stored for the position in the transposition table,
+    i.e. the principal variation move of the previous iteration, then the
+    killer moves of the ply, the last moves that caused a cutoff as many
+    plies from the root, then the rest ranked by rank(). This class ranks
+    them by their history score, the sum of depth**2 over the cutoffs each
+    move caused.
+
+    Parameters
+    ----------
+    killers : int (optional)
+        The number of killer moves kept per ply.
+    """
+    def __init__(self, killers=2):
+        self.killers_per_ply = killers
+        self.killers = {}
+        self.history = {}
+
+    def new_search(self):
+        """Forget the killer moves and halve the history scores, before the
+        search of a new turn.
+        """
+        self.killers = {}
+        self.history = {move: score // 2 for move, score in self.history.items() if score > 1}
+
+    def clear(self):
+        """Forget the killer moves and the history scores, e.g. before a new
+        game.
+        """
+        self.killers = {}
+        self.history = {}
+
+    def order(self, game, moves, ply, best_move=None):
+        """Return the moves of a node in the order to search them."""
+        first = []
+        if best_move in moves:
+            first.append(best_move)
+        for move in self.killers.get(ply, ()):
+            if move in moves and move not in first:
+                first.append(move)
+        rest = [move for move in moves if move not in first]
+        return first + self.rank(game, rest)
+
+    def rank(self, game, moves):
+        """Return the moves that are neither the PV move nor killers, best
+        first.
+        """
+        history = self.history
+        return sorted(moves, key=lambda move: history.get(move, 0), reverse=True)
+
+    def cutoff(self, move, ply, depth):
+        """Record that move caused a cutoff ply plies from the root, with
+        depth plies left to search.
+        """
+        killers = self.killers.setdefault(ply, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[self.killers_per_ply:]
+        self.history[move] = self.history.get(move, 0) + depth * depth
+
+
+class MobilityOrdering(MoveOrdering):
+    """MoveOrdering that ranks the moves after the PV move and the killers by
+    the mobility they leave: the moves of the mover from its new cell minus
+    the moves of the opponent.
+    """
+    def rank(self, game, moves):
+        scores = {}
+        for move in moves:
+            game.push(move)
+            scores[move] = mobility(game, game.inactive_player) - mobility(game)
+            game.pop()
+        return sorted(moves, key=scores.get, reverse=True)
+
+
+class TTAlphaBetaPlayer(InPlaceAlphaBetaPlayer):
+    """InPlaceAlphaBetaPlayer with a transposition table that is kept across
+    the iterations of iterative deepening and across turns, so positions
+    already searched deep enough are answered from the table instead of
+    being searched again, and with a pluggable move ordering.
+
+    Parameters
+    ----------
+    table_size : int (optional)
+        The number of slots of the TranspositionTable.
+
+    ordering : MoveOrdering (optional)
+        Orders the moves of every node, e.g. MoveOrdering() or
+        MobilityOrdering(). The moves are searched in the order of
+        get_legal_moves() when None.
+
+    Attributes
+    ----------
+    nodes, cutoffs, first_cutoffs : int
+        The nodes searched, the nodes cut off by alpha-beta pruning and the
+        cutoffs caused by the first move searched, since reset_stats().
+    """
+    def __init__(self, search_depth=3, score_fn=custom_score, timeout=10.,
+                 table_size=1 << 16, ordering=None):
+        super().__init__(search_depth, score_fn, timeout)
+        self.table = TranspositionTable(table_size)
+        self.ordering = ordering
+        self._root_move_count = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.nodes = self.cutoffs = self.first_cutoffs = 0
+
+    def new_game(self):
+        """Forget the table, the move ordering state and the stats of the
+        previous games, so a game doesn't depend on the games played before
+        it by the same player.
+        """
+        self.table.clear()
+        if self.ordering is not None:
+            self.ordering.clear()
+        self.reset_stats()
+
+    def stats(self):
+        """Return the node counts as a dictionary, with the share of the
+        cutoffs that the first move caused: the closer to 1, the better the
+        move ordering.
+        """
+        return {
+            "nodes": self.nodes,
+            "cutoffs": self.cutoffs,
+            "first_cutoffs": self.first_cutoffs,
+            "first_cutoff_rate": self.first_cutoffs / self.cutoffs if self.cutoffs else 0.,
+            "table_hits": self.table.hits,
+        }
+
+    def get_move(self, game, time_left):
+        self.table.new_search()
+        if self.ordering is not None:
+            self.ordering.new_search()
+        return super().get_move(game, time_left)
+
+    def lookup(self, key, depth, alpha, beta):
+        """Look a position up in the table.
+
+        Returns
+        -------
+        (float, (int, int))
+            The stored score if the position was searched at least depth
+            plies deep and the score settles the window (alpha, beta), else
+            None, and the best move stored for the position, or None.
+        """
+        entry = self.table.probe(key)
+        if entry is None:
+            return None, None
+        flag, score, move = entry[2], entry[3], entry[4]
+        if entry[1] >= depth and (flag == EXACT or (flag == LOWER and score >= beta) or
+                                  (flag == UPPER and score <= alpha)):
+            return score, move
+        return None, move
+
+    def moves(self, game, best_move):
+        """Return the legal moves of the active player in search order."""
+        moves = game.get_legal_moves()
+        if self.ordering is None:
+            return moves
+        return self.ordering.order(game, moves, game.move_count - self._root_move_count, best_move)
+
+    def cutoff(self, game, move, depth, first):
+        """Count a cutoff caused by move and tell the move ordering."""
+        self.cutoffs += 1
+        if first:
+            self.first_cutoffs += 1
+        if self.ordering is not None:
+            self.ordering.cutoff(move, game.move_count - self._root_move_count, depth)
+
+    def alphabeta(self, game, depth, alpha=float("-inf"), beta=float("inf")):
+        """Depth-limited minimax search with alpha-beta pruning, a
+        transposition table and move ordering, see AlphaBetaPlayer.alphabeta().
+        """
+        if self.time_left() < self.TIMER_THRESHOLD:
+            raise SearchTimeout()
+
+        self._root_move_count = game.move_count
+        self.nodes += 1
+        key = game.hash()
+        _, pv_move = self.lookup(key, depth, alpha, beta)
+        alpha_start = alpha
+        best_score = float("-inf")
+        best_move = (-1, -1)
+
+        for move in self.moves(game, pv_move):
+            game.push(move)
+            try:
+                score = self.min_value(game, depth-1, alpha, beta)
+            finally:
+                game.pop()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                alpha = max(alpha, best_score)
+
+        self.table.store(key, depth, bound_flag(best_score, alpha_start, beta),
+                         best_score, best_move)
+        return best_move
+
+    def min_value(self, game, depth, alpha, beta):
+        if self.time_left() < self.TIMER_THRESHOLD:
+            raise SearchTimeout()
+
+        self.nodes += 1
+        key = game.hash() ^ MIN_NODE_KEY
+        score, stored_move = self.lookup(key, depth, alpha, beta)
+        if score is not None:
+            return score
+
+        if self.terminal_test(game, depth):
+            score = self.score(game, self)
+            self.table.store(key, depth, EXACT, score, None)
+            return score
+
+        beta_start = beta
+        score = float("inf")
+        best_move = None
+        for i, move in enumerate(self.moves(game, stored_move)):
+            game.push(move)
+            try:
+                value = self.max_value(game, depth-1, alpha, beta)
+            finally:
+                game.pop()
+            if value < score:
+                score = value
+                best_move = move
+            if score <= alpha:
+                self.cutoff(game, move, depth, i == 0)
+                break
+            beta = min(beta, score)
+
+        self.table.store(key, depth, bound_flag(score, alpha, beta_start), score, best_move)
+        return score
+
+    def max_value(self, game, depth, alpha, beta):
+        if self.time_left() < self.TIMER_THRESHOLD:
+            raise SearchTimeout()
+
+        self.nodes += 1
+        key = game.hash()
+        score, stored_move = self.lookup(key, depth, alpha, beta)
+        if score is not None:
+            return score
+
+        if self.terminal_test(game, depth):
+            score = self.score(game, self)
+            self.table.store(key, depth, EXACT, score, None)
+            return score
+
+        alpha_start = alpha
+        score = float("-inf")
+        best_move = None
+        for i, move in enumerate(self.moves(game, stored_move)):
+            game.push(move)
+            try:
+                value = self.min_value(game, depth-1, alpha, beta)
+            finally:
+                game.pop()
+            if value > score:
+                score = value
+                best_move = move
+            if score >= beta:
+                self.cutoff(game, move, depth, i == 0)
+                break
+            alpha = max(alpha, score)
+
+        self.table.store(key, depth, bound_flag(score, alpha_start, beta), score, best_move)
+        return score
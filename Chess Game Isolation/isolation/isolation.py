@@ -13,6 +13,10 @@ from copy import copy
 
 TIME_LIMIT_MILLIS = 150
 
+# The (row, column) steps of a knight
+DIRECTIONS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
+              (1, -2), (1, 2), (2, -1), (2, 1)]
+
 
 class Board(object):
     """Implement a model for the game Isolation assuming each player moves like
@@ -52,8 +56,19 @@ class Board(object):
         self._board_state[-1] = Board.NOT_MOVED
         self._board_state[-2] = Board.NOT_MOVED
 
+        # What push() changed, for pop() to restore
+        self._undo = []
+
+        # Zobrist hash of the state, updated by every move, see zobrist_keys()
+        self._zobrist = zobrist_keys(width, height)
+        self._hash = 0
+
     def hash(self):
-        return str(self._board_state).__hash__()
+        """Return the Zobrist hash of the blocked cells, the player locations
+        and the initiative. Equal states hash the same on every Board and
+        BitBoard of the same size, in every process.
+        """
+        return self._hash
 
     @property
     def active_player(self):
@@ -97,6 +112,7 @@ class Board(object):
         new_board._active_player = self._active_player
         new_board._inactive_player = self._inactive_player
         new_board._board_state = copy(self._board_state)
+        new_board._hash = self._hash
         return new_board
 
     def forecast_move(self, move):
@@ -201,12 +217,44 @@ class Board(object):
         """
         idx = move[0] + move[1] * self.height
         last_move_idx = int(self.active_player == self._player_2) + 1
+        cells, locations, side = self._zobrist
+        keys = locations[last_move_idx - 1]
+        last_move = self._board_state[-last_move_idx]
+        if last_move != Board.NOT_MOVED:
+            self._hash ^= keys[last_move]
+        self._hash ^= keys[idx] ^ cells[idx] ^ side
         self._board_state[-last_move_idx] = idx
         self._board_state[idx] = 1
         self._board_state[-3] ^= 1
         self._active_player, self._inactive_player = self._inactive_player, self._active_player
         self.move_count += 1
 
+    def push(self, move):
+        """Apply a move in place like apply_move(), remembering what it
+        changed so that pop() can take it back. Searching with push() and
+        pop() avoids a copy of the board for every node of the game tree.
+
+        Parameters
+        ----------
+        move : (int, int)
+            A coordinate pair (row, column) indicating the next position for
+            the active player on the board.
+        """
+        idx = move[0] + move[1] * self.height
+        last_move_idx = int(self.active_player == self._player_2) + 1
+        self._undo.append((idx, self._board_state[idx], self._board_state[-last_move_idx], self._hash))
+        self.apply_move(move)
+
+    def pop(self):
+        """Take back the last move applied with push()."""
+        idx, cell, last_move, self._hash = self._undo.pop()
+        self._active_player, self._inactive_player = self._inactive_player, self._active_player
+        self.move_count -= 1
+        self._board_state[-3] ^= 1
+        last_move_idx = int(self.active_player == self._player_2) + 1
+        self._board_state[-last_move_idx] = last_move
+        self._board_state[idx] = cell
+
     def is_winner(self, player):
         """ Test whether the specified player has won the game. """
         return player == self._inactive_player and not self.get_legal_moves(self._active_player)
@@ -255,9 +303,7 @@ class Board(object):
             return self.get_blank_spaces()
 
         r, c = loc
-        directions = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
-                      (1, -2), (1, 2), (2, -1), (2, 1)]
-        valid_moves = [(r + dr, c + dc) for dr, dc in directions
+        valid_moves = [(r + dr, c + dc) for dr, dc in DIRECTIONS
                        if self.move_is_legal((r + dr, c + dc))]
         random.shuffle(valid_moves)
         return valid_moves
@@ -295,7 +341,7 @@ class Board(object):
 
         return out
 
-    def play(self, time_limit=TIME_LIMIT_MILLIS):
+    def play(self, time_limit=TIME_LIMIT_MILLIS, timer=None):
         """Execute a match between the players by alternately soliciting them
         to select a move and applying it in the game.
 
@@ -305,6 +351,12 @@ class Board(object):
             The maximum number of milliseconds to allow before timeout
             during each turn.
 
+        timer : callable (optional)
+            Returns the current time in seconds, timeit.default_timer if None.
+            Pass time.process_time to time the turns by the CPU time of the
+            current process, which other processes running at the same time
+            do not affect.
+
         Returns
         ----------
         (player, list<[(int, int),]>, str)
@@ -314,7 +366,8 @@ class Board(object):
         """
         move_history = []
 
-        time_millis = lambda: 1000 * timeit.default_timer()
+        timer = timer or timeit.default_timer
+        time_millis = lambda: 1000 * timer()
 
         while True:
 
@@ -340,3 +393,234 @@ class Board(object):
             move_history.append(list(curr_move))
 
             self.apply_move(curr_move)
+
+
+_tables = {}
+_zobrist = {}
+
+
+def zobrist_keys(width, height):
+    """Return the random 64-bit keys of the Zobrist hash of a board size.
+
+    The hash of a state is the XOR of the key of every blocked cell, the
+    location key of each player that has moved, and the side key when
+    player 2 has the initiative. The keys are drawn from a generator seeded
+    by the board size, so they are the same in every process.
+
+    Returns
+    -------
+    (list<int>, (list<int>, list<int>), int)
+        The key of every blocked cell, the keys of the locations of player 1
+        and of player 2, and the side key.
+    """
+    key = (width, height)
+    if key not in _zobrist:
+        rng = random.Random("zobrist-{}x{}".format(width, height))
+        cells = width * height
+        keys = [rng.getrandbits(64) for _ in range(3 * cells + 1)]
+        _zobrist[key] = keys[:cells], (keys[cells:2 * cells], keys[2 * cells:3 * cells]), keys[-1]
+    return _zobrist[key]
+
+
+def knight_tables(width, height):
+    """Return the precomputed tables of a board size for `BitBoard`.
+
+    Cell (row, column) is bit ``row + column * height`` of a mask, the same
+    index as in `Board._board_state`.
+
+    Returns
+    -------
+    (list<int>, list<(int, int)>)
+        The mask of the cells a knight reaches from every cell, and the
+        (row, column) coordinates of every cell.
+    """
+    key = (width, height)
+    if key not in _tables:
+        masks = []
+        cells = []
+        for c in range(width):
+            for r in range(height):
+                mask = 0
+                for dr, dc in DIRECTIONS:
+                    if 0 <= r + dr < height and 0 <= c + dc < width:
+                        mask |= 1 << (r + dr + (c + dc) * height)
+                masks.append(mask)
+                cells.append((r, c))
+        _tables[key] = masks, cells
+    return _tables[key]
+
+
+class BitBoard(Board):
+    """A `Board` that keeps the blocked cells in a single integer bitmask.
+
+    The legal moves of a player are the precomputed knight mask of its cell
+    with the blocked cells masked out, so move generation, mobility counts
+    and move application are a handful of integer operations, and copies
+    only copy a few attributes. The public API is the same as `Board`,
+    except that the legal moves are listed in cell order rather than
+    shuffled.
+
+    Parameters
+    ----------
+    player_1 : object
+        An object with a get_move() function.
+
+    player_2 : object
+        An object with a get_move() function.
+
+    width : int (optional)
+        The number of columns that the board should have.
+
+    height : int (optional)
+        The number of rows that the board should have.
+    """
+
+    def __init__(self, player_1, player_2, width=7, height=7):
+        self.width = width
+        self.height = height
+        self.move_count = 0
+        self._player_1 = player_1
+        self._player_2 = player_2
+        self._active_player = player_1
+        self._inactive_player = player_2
+
+        # Bit i is set once cell i has been occupied; the location of each
+        # player is a cell index, and the initiative is 0 for player 1 and 1
+        # for player 2
+        self._occupied = 0
+        self._locations = [Board.NOT_MOVED, Board.NOT_MOVED]
+        self._initiative = 0
+        self._full = (1 << (width * height)) - 1
+        self._knight_masks, self._cells = knight_tables(width, height)
+        self._undo = []
+        self._zobrist = zobrist_keys(width, height)
+        self._hash = 0
+
+    @property
+    def _board_state(self):
+        """The equivalent `Board._board_state` list, e.g. for to_string()."""
+        state = [(self._occupied >> i) & 1 for i in range(self.width * self.height)]
+        return state + [self._initiative, self._locations[1], self._locations[0]]
+
+    def copy(self):
+        """ Return a deep copy of the current board. """
+        new_board = object.__new__(type(self))
+        new_board.__dict__.update(self.__dict__)
+        new_board._locations = list(self._locations)
+        new_board._undo = []
+        return new_board
+
+    def move_is_legal(self, move):
+        """Test whether a move is legal in the current game state, see
+        `Board.move_is_legal`.
+        """
+        return (0 <= move[0] < self.height and 0 <= move[1] < self.width and
+                not self._occupied >> (move[0] + move[1] * self.height) & 1)
+
+    def get_blank_spaces(self):
+        """Return a list of the locations that are still available on the board.
+        """
+        return self._to_moves(self._full & ~self._occupied)
+
+    def _player_index(self, player):
+        if player == self._player_1:
+            return 0
+        elif player == self._player_2:
+            return 1
+        raise RuntimeError(
+            "Invalid player in get_player_location: {}".format(player))
+
+    def get_player_location(self, player):
+        """Find the current location of the specified player on the board,
+        see `Board.get_player_location`.
+        """
+        idx = self._locations[self._player_index(player)]
+        if idx == Board.NOT_MOVED:
+            return Board.NOT_MOVED
+        return self._cells[idx]
+
+    def _moves_mask(self, index):
+        """Return the mask of the legal moves of player 1 (index 0) or player
+        2 (index 1).
+        """
+        loc = self._locations[index]
+        if loc == Board.NOT_MOVED:
+            return self._full & ~self._occupied
+        return self._knight_masks[loc] & ~self._occupied
+
+    def _to_moves(self, mask):
+        """Return the (row, column) coordinates of the cells set in a mask."""
+        cells = self._cells
+        moves = []
+        while mask:
+            low = mask & -mask
+            moves.append(cells[low.bit_length() - 1])
+            mask ^= low
+        return moves
+
+    def get_legal_moves(self, player=None):
+        """Return the list of all legal moves for the specified player, the
+        active player if None.
+        """
+        index = self._initiative if player is None else self._player_index(player)
+        return self._to_moves(self._moves_mask(index))
+
+    def mobility(self, player=None):
+        """Return the number of legal moves of the specified player, the
+        active player if None, without listing them.
+        """
+        index = self._initiative if player is None else self._player_index(player)
+        return bin(self._moves_mask(index)).count('1')
+
+    def apply_move(self, move):
+        """Move the active player to a specified location, see
+        `Board.apply_move`.
+        """
+        idx = move[0] + move[1] * self.height
+        cells, locations, side = self._zobrist
+        keys = locations[self._initiative]
+        last_move = self._locations[self._initiative]
+        if last_move != Board.NOT_MOVED:
+            self._hash ^= keys[last_move]
+        self._hash ^= keys[idx] ^ cells[idx] ^ side
+        self._locations[self._initiative] = idx
+        self._occupied |= 1 << idx
+        self._initiative ^= 1
+        self._active_player, self._inactive_player = self._inactive_player, self._active_player
+        self.move_count += 1
+
+    def push(self, move):
+        """Apply a move in place, remembering it for pop(), see `Board.push`.
+        """
+        self._undo.append((self._occupied, self._locations[self._initiative], self._hash))
+        self.apply_move(move)
+
+    def pop(self):
+        """Take back the last move applied with push()."""
+        self._occupied, location, self._hash = self._undo.pop()
+        self._initiative ^= 1
+        self._locations[self._initiative] = location
+        self._active_player, self._inactive_player = self._inactive_player, self._active_player
+        self.move_count -= 1
+
+    def is_winner(self, player):
+        """ Test whether the specified player has won the game. """
+        return player == self._inactive_player and not self._moves_mask(self._initiative)
+
+    def is_loser(self, player):
+        """ Test whether the specified player has lost the game. """
+        return player == self._active_player and not self._moves_mask(self._initiative)
+
+    def utility(self, player):
+        """Returns the utility of the current game state from the perspective
+        of the specified player, see `Board.utility`.
+        """
+        if not self._moves_mask(self._initiative):
+
+            if player == self._inactive_player:
+                return float("inf")
+
+            if player == self._active_player:
+                return float("-inf")
+
+        return 0.
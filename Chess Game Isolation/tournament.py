@@ -10,14 +10,20 @@ The matches are fair because the board is initialized randomly for both
 players, and the players play each match twice -- once as the first player and
 once as the second player.  Randomizing the openings and switching the player
 order corrects for imbalances due to both starting position and initiative.
+
+The games are independent of each other, so they can be played by several
+processes at once, e.g. `python tournament.py --workers 4`.
 """
+import argparse
 import itertools
+import multiprocessing
 import random
+import time
 import warnings
 
 from collections import namedtuple
 
-from isolation import Board
+from isolation import Board, BitBoard
 from sample_players import (RandomPlayer, open_move_score,
                             improved_score, center_score)
 from game_agent import (MinimaxPlayer, AlphaBetaPlayer, custom_score,
@@ -25,6 +31,11 @@ from game_agent import (MinimaxPlayer, AlphaBetaPlayer, custom_score,
 
 NUM_MATCHES = 5  # number of matches against each opponent
 TIME_LIMIT = 150  # number of milliseconds before timeout
+# The board the matches are played on by default; BitBoard follows the same
+# rules faster, but lists the legal moves in a fixed order where Board
+# shuffles them, so the agents that break ties by that order play other
+# games on it. Pass --bitboard to play on it anyway.
+BOARD_CLASS = Board
 
 DESCRIPTION = """
 This script evaluates the performance of the custom_score evaluation
@@ -37,49 +48,114 @@ game_agent.py.
 Agent = namedtuple("Agent", ["player", "name"])
 
 
-def play_round(cpu_agent, test_agents, win_counts, num_matches):
-    """Compare the test agents to the cpu agent in "fair" matches.
+# The agents, the turn timer and the board class of the current process,
+# see _init_worker
+_worker_agents = None
+_worker_timer = None
+_worker_board_class = BOARD_CLASS
 
-    "Fair" matches use random starting locations and force the agents to
-    play as both first and second player to control for advantages resulting
-    from choosing better opening moves or having first initiative to move.
-    """
-    timeout_count = 0
-    forfeit_count = 0
-    for _ in range(num_matches):
 
-        games = sum([[Board(cpu_agent.player, agent.player),
-                      Board(agent.player, cpu_agent.player)]
-                    for agent in test_agents], [])
+def _init_worker(cpu_agents, test_agents, timer=None, board_class=BOARD_CLASS):
+    global _worker_agents, _worker_timer, _worker_board_class
+    _worker_agents = (cpu_agents, test_agents)
+    _worker_timer = timer
+    _worker_board_class = board_class
 
-        # initialize all games with a random move and response
-        for _ in range(2):
-            move = random.choice(games[0].get_legal_moves())
-            for game in games:
-                game.apply_move(move)
 
-        # play all games and tally the results
-        for game in games:
-            winner, _, termination = game.play(time_limit=TIME_LIMIT)
-            win_counts[winner] += 1
+def random_opening():
+    """Return a random move and response, legal on an empty board."""
+    game = BOARD_CLASS("player_1", "player_2")
+    opening = []
+    for _ in range(2):
+        move = random.choice(game.get_legal_moves())
+        game.apply_move(move)
+        opening.append(move)
+    return opening
 
-            if termination == "timeout":
-                timeout_count += 1
-            elif termination == "forfeit":
-                forfeit_count += 1
 
-    return timeout_count, forfeit_count
+def round_games(cpu_index, num_tests, num_matches):
+    """List the games of a round of "fair" matches against the cpu agent
+    cpu_index as (cpu_index, test_index, opening, cpu_first, seed) tuples.
 
+    "Fair" matches use random starting locations and force the agents to
+    play as both first and second player to control for advantages resulting
+    from choosing better opening moves or having first initiative to move.
+    Every match shares its random opening between all the test agents, and
+    every game gets its own seed for the random choices of the agents.
+    """
+    games = []
+    for _ in range(num_matches):
+        opening = random_opening()
+        for test_index in range(num_tests):
+            for cpu_first in (True, False):
+                games.append((cpu_index, test_index, opening, cpu_first,
+                              random.getrandbits(32)))
+    return games
 
-def update(total_wins, wins):
-    for player in total_wins:
-        total_wins[player] += wins[player]
-    return total_wins
 
+def play_game(task):
+    """Play one game of round_games() with the agents of the current process.
 
-def play_matches(cpu_agents, test_agents, num_matches):
-    """Play matches between the test agent and each cpu_agent individually. """
-    total_wins = {agent.player: 0 for agent in test_agents}
+    The players start the game without the state kept from their earlier
+    games, see new_game() of game_agent.TTAlphaBetaPlayer, and the random
+    module is seeded with the seed of the game, so its outcome doesn't
+    depend on which process plays it or after which games; only the search
+    depth the timed agents reach still depends on the load of the machine.
+
+    Returns the cpu and test agent indices, whether the test agent won and
+    how the game ended.
+    """
+    cpu_index, test_index, opening, cpu_first, seed = task
+    cpu_agents, test_agents = _worker_agents
+    cpu, test = cpu_agents[cpu_index].player, test_agents[test_index].player
+    for player in (cpu, test):
+        new_game = getattr(player, "new_game", None)
+        if new_game is not None:
+            new_game()
+    random.seed(seed)
+    board_class = _worker_board_class
+    game = board_class(cpu, test) if cpu_first else board_class(test, cpu)
+    for move in opening:
+        game.apply_move(move)
+    winner, _, termination = game.play(time_limit=TIME_LIMIT,
+                                       timer=_worker_timer)
+    return cpu_index, test_index, winner is test, termination
+
+
+def play_games(cpu_agents, test_agents, tasks, workers=1,
+               board_class=BOARD_CLASS):
+    """Play the games of round_games() and yield their results in order.
+
+    With more than one worker the games are spread across a process pool.
+    Every worker holds its own copy of the agents and times the turns with
+    time.process_time(), the CPU time of the worker, so a worker waiting for
+    a core does not lose its turn to a timeout; the wall clock time limit of
+    a sequential tournament would be skewed by the contention. The games are
+    played on instances of board_class.
+    """
+    if workers <= 1:
+        _init_worker(cpu_agents, test_agents, board_class=board_class)
+        for task in tasks:
+            yield play_game(task)
+        return
+    with multiprocessing.Pool(workers, _init_worker,
+                              (cpu_agents, test_agents, time.process_time,
+                               board_class)) as pool:
+        for result in pool.imap(play_game, tasks):
+            yield result
+
+
+def play_matches(cpu_agents, test_agents, num_matches, workers=1,
+                 board_class=BOARD_CLASS):
+    """Play matches between the test agent and each cpu_agent individually.
+
+    The games of every round are played by `workers` processes, see
+    play_games(). Agents whose moves don't depend on the time they are
+    given get the same table whatever their number; the table of timed
+    agents varies from run to run anyway, with the depth their searches
+    reach.
+    """
+    total_wins = [0] * len(test_agents)
     total_timeouts = 0.
     total_forfeits = 0.
     total_matches = 2 * num_matches * len(cpu_agents)
@@ -87,31 +163,35 @@ def play_matches(cpu_agents, test_agents, num_matches):
     print("\n{:^9}{:^13}".format("Match #", "Opponent") + ''.join(['{:^13}'.format(x[1].name) for x in enumerate(test_agents)]))
     print("{:^9}{:^13} ".format("", "") +  ' '.join(['{:^5}| {:^5}'.format("Won", "Lost") for x in enumerate(test_agents)]))
 
+    # the openings and the seeds are drawn here, not in the workers, whose
+    # random state is a copy of this one when they are forked
+    tasks = sum([round_games(idx, len(test_agents), num_matches)
+                 for idx in range(len(cpu_agents))], [])
+    results = play_games(cpu_agents, test_agents, tasks, workers, board_class)
     for idx, agent in enumerate(cpu_agents):
-        wins = {key: 0 for (key, value) in test_agents}
-        wins[agent.player] = 0
+        wins = [0] * len(test_agents)
 
         print("{!s:^9}{:^13}".format(idx + 1, agent.name), end="", flush=True)
 
-        counts = play_round(agent, test_agents, wins, num_matches)
-        total_timeouts += counts[0]
-        total_forfeits += counts[1]
-        total_wins = update(total_wins, wins)
+        for _, test_index, test_won, termination in itertools.islice(
+                results, 2 * num_matches * len(test_agents)):
+            wins[test_index] += test_won
+            if termination == "timeout":
+                total_timeouts += 1
+            elif termination == "forfeit":
+                total_forfeits += 1
+        total_wins = [a + b for a, b in zip(total_wins, wins)]
         _total = 2 * num_matches
-        round_totals = sum([[wins[agent.player], _total - wins[agent.player]]
-                            for agent in test_agents], [])
         print(' ' + ' '.join([
-            '{:^5}| {:^5}'.format(
-                round_totals[i],round_totals[i+1]
-            ) for i in range(0, len(round_totals), 2)
+            '{:^5}| {:^5}'.format(won, _total - won) for won in wins
         ]))
 
     print("-" * 74)
     print('{:^9}{:^13}'.format("", "Win Rate:") +
         ''.join([
             '{:^13}'.format(
-                "{:.1f}%".format(100 * total_wins[x[1].player] / total_matches)
-            ) for x in enumerate(test_agents)
+                "{:.1f}%".format(100 * won / total_matches)
+            ) for won in total_wins
     ]))
 
     if total_timeouts:
@@ -124,7 +204,20 @@ def play_matches(cpu_agents, test_agents, num_matches):
                "legal moves available to play.\n").format(total_forfeits))
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="number of processes playing games at the same "
+                             "time, 0 for one per CPU (default: 1)")
+    parser.add_argument("-n", "--matches", type=int, default=NUM_MATCHES,
+                        help="number of matches against each opponent "
+                             "(default: {})".format(NUM_MATCHES))
+    parser.add_argument("--bitboard", action="store_true",
+                        help="play on isolation.BitBoard, faster than the "
+                             "default isolation.Board but with its legal "
+                             "moves in a fixed order instead of shuffled")
+    args = parser.parse_args(argv)
+    workers = args.workers or multiprocessing.cpu_count()
 
     # Define two agents to compare -- these agents will play from the same
     # starting position against the same adversaries in the tournament
@@ -150,7 +243,8 @@ def main():
     print("{:^74}".format("*************************"))
     print("{:^74}".format("Playing Matches"))
     print("{:^74}".format("*************************"))
-    play_matches(cpu_agents, test_agents, NUM_MATCHES)
+    play_matches(cpu_agents, test_agents, args.matches, workers,
+                 BitBoard if args.bitboard else Board)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,135 @@
+"""
+Solve many Sudoku grids at once across a pool of worker processes.
+
+Each worker builds its own solution.Solver when it starts, so nothing is shared between
+processes and the global assignments list of solution.py is never touched. Example:
+
+    from batch import solve_many
+    for result in solve_many(open('puzzles.txt'), workers=8):
+        print(result.index, result.seconds, bool(result.values))
+"""
+import itertools
+import multiprocessing
+import queue
+import time
+from collections import namedtuple
+
+from solution import Solver
+
+SolveResult = namedtuple('SolveResult', ['index', 'grid', 'values', 'seconds', 'stats'])
+
+# The Solver owned by the current worker process, see _init_worker
+_worker_solver = None
+
+
+def _init_worker(options):
+    global _worker_solver
+    _worker_solver = Solver(**options)
+
+
+def _solve_one(item):
+    """
+    Solve one (index, grid) pair with the worker's Solver and time it.
+    """
+    index, grid = item
+    grid = grid.strip()
+    start = time.perf_counter()
+    try:
+        values = _worker_solver.solve(grid)
+    except (AssertionError, ValueError):
+        # grid_values() and the engine parsers reject grids that can't be read
+        values = None
+    seconds = time.perf_counter() - start
+    stats = None
+    if _worker_solver.collect_stats and values is not None:
+        stats = _worker_solver.stats.to_dict()
+    return SolveResult(index, grid, values, seconds, stats)
+
+
+def _solve_chunk(items):
+    return [_solve_one(item) for item in items]
+
+
+def _batches(iterable, size):
+    """
+    Split iterable into lists of at most size items without reading it all in memory.
+    """
+    iterator = iter(iterable)
+    batch = list(itertools.islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(itertools.islice(iterator, size))
+
+
+def imap_chunks(pool, func, items, chunksize, limit, ordered=True):
+    """
+    Run func on chunks of items across pool with at most limit chunks sent and not yet yielded.
+    Args:
+        pool(multiprocessing.Pool): the pool running func.
+        func: called in a worker with a list of items, returns a list of results.
+        items(iterable): read lazily, chunksize items at a time, so it can be endless.
+        chunksize(int): number of items sent to a worker at a time.
+        limit(int): number of chunks read ahead of the results yielded.
+        ordered(bool): yield the results in chunk order, or as soon as they finish when False.
+    Returns:
+        A generator of the results of every chunk. A new chunk is sent as soon as one is yielded,
+        so the workers don't wait for the slowest chunk of a window. An exception raised by func
+        is raised again here.
+    """
+    chunks = _batches(items, chunksize)
+    # (chunk number, results or exception) of every finished chunk, put there by the pool
+    done = queue.Queue()
+    # finished chunks waiting for the ones before them when ordered
+    finished = {}
+    sent = yielded = 0
+    while True:
+        for chunk in itertools.islice(chunks, limit - (sent - yielded)):
+            pool.apply_async(func, (chunk,), callback=lambda r, n=sent: done.put((n, r)),
+                             error_callback=lambda e, n=sent: done.put((n, e)))
+            sent += 1
+        if sent == yielded:
+            return
+        number, results = done.get()
+        if isinstance(results, BaseException):
+            raise results
+        if not ordered:
+            yielded += 1
+            for result in results:
+                yield result
+            continue
+        finished[number] = results
+        while yielded in finished:
+            for result in finished.pop(yielded):
+                yield result
+            yielded += 1
+
+
+def solve_many(grids, workers=None, ordered=True, chunksize=64, **options):
+    """
+    Solve an iterable of grids across a process pool.
+    Args:
+        grids(iterable): grids in the string form accepted by solution.grid_values().
+        workers(int): number of worker processes, os.cpu_count() when None. With 1 the grids are
+            solved in the current process.
+        ordered(bool): yield the results in input order, or as soon as they finish when False.
+        chunksize(int): number of grids sent to a worker at a time.
+        options: keyword arguments for solution.Solver, e.g. engine='bitboard', or
+            collect_stats=True to get the stats of every grid.
+    Returns:
+        A generator of SolveResult(index, grid, values, seconds, stats) where values is the solved
+        dictionary, False if there is no solution or None if the grid could not be read, and seconds is the time spent solving that grid in its worker.
+        stats is the SolveStats.to_dict() of the grid with collect_stats, None otherwise.
+        At most workers * 4 chunks are read ahead of the results yielded, so memory does not grow
+        with the length of the input, and a new chunk is sent as soon as one finishes so the
+        workers don't wait for the slowest grid of a window.
+    """
+    if workers == 1:
+        _init_worker(options)
+        for item in enumerate(grids):
+            yield _solve_one(item)
+        return
+
+    workers = workers or multiprocessing.cpu_count()
+    with multiprocessing.Pool(workers, _init_worker, (options,)) as pool:
+        for result in imap_chunks(pool, _solve_chunk, enumerate(grids), chunksize, workers * 4, ordered):
+            yield result
@@ -0,0 +1,55 @@
+import batch
+import solution_test
+import unittest
+
+
+class TestSolveMany(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+    solved = solution_test.TestDiagonalSudoku.solved_diag_sudoku
+    unsolvable_grid = '22' + '.' * 79
+
+    def check_results(self, results, grids):
+        self.assertEqual(sorted(r.index for r in results), list(range(len(grids))))
+        for result in results:
+            self.assertEqual(result.grid, grids[result.index])
+            self.assertGreaterEqual(result.seconds, 0)
+            if result.grid == self.diagonal_grid:
+                self.assertEqual(result.values, self.solved)
+            else:
+                self.assertFalse(result.values)
+
+    def test_in_process(self):
+        grids = [self.diagonal_grid, self.unsolvable_grid]
+        results = list(batch.solve_many(grids, workers=1))
+        self.assertEqual([r.index for r in results], [0, 1])
+        self.check_results(results, grids)
+
+    def test_pool_ordered(self):
+        grids = [self.diagonal_grid, self.unsolvable_grid] * 5
+        results = list(batch.solve_many(iter(grids), workers=2, chunksize=1, engine='bitboard'))
+        self.assertEqual([r.index for r in results], list(range(len(grids))))
+        self.check_results(results, grids)
+
+    def test_pool_unordered(self):
+        grids = [self.unsolvable_grid, self.diagonal_grid] * 5
+        results = list(batch.solve_many(grids, workers=2, ordered=False, chunksize=2, propagation='queue'))
+        self.check_results(results, grids)
+
+    def test_pool_reads_ahead_a_bounded_window(self):
+        read = []
+
+        def grids():
+            for i in range(1000):
+                read.append(i)
+                yield self.diagonal_grid if i % 2 else self.unsolvable_grid
+
+        results = batch.solve_many(grids(), workers=2, chunksize=2)
+        first = [next(results) for _ in range(6)]
+        self.assertEqual([r.index for r in first], list(range(6)))
+        # 2 workers keep at most 8 chunks of 2 grids sent and not yielded
+        self.assertLessEqual(len(read), 6 + 8 * 2 + 2)
+        results.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,299 @@
+"""
+Compare the speed of the Sudoku engines.
+
+Without a corpus every engine solves the same randomly generated puzzles, 9x9 for the engines
+behind solution.solve() and 9x9, 16x16 and 25x25 for the size-parametric engine in nxn.py. With
+--corpus the 9x9 engines solve the puzzles of a file instead, one per line, e.g. the hard puzzles
+in puzzles/hardest.txt, and --per-puzzle shows which engine wins on each of them.
+
+--suite runs the regression benchmark instead: every engine of SUITE_ENGINES solves the easy,
+hard and diagonal corpora of SUITE_CORPORA, made by generator.py from a fixed seed, and reports
+puzzles per second, p50 and p99 latency and peak memory. --json saves the results and --baseline
+compares them with saved ones, exiting with status 1 when an engine got slower or bigger by more
+than --threshold. --corpora keeps the generated corpora in a directory so that later runs solve
+exactly the same puzzles. Example:
+
+    python benchmark.py --count 20 --seed 1
+    python benchmark.py --corpus puzzles/hardest.txt --classic --per-puzzle
+    python benchmark.py --suite --corpora corpora --json baseline.json
+    python benchmark.py --suite --corpora corpora --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import generator
+import nxn
+import solution
+from rules import CLASSIC, DIAGONAL
+from stats import SolveStats
+
+ENGINES = ('strings', 'bitboard', 'nxn', 'dlx')
+# The engines that count their search nodes in a SolveStats
+COUNTING_ENGINES = ('strings', 'dlx')
+
+# Fraction of the cells given in the random puzzles of each box size. Larger grids need more
+# clues: random 25x25 puzzles with half of their cells given can take the DFS minutes.
+CLUES = {3: 0.35, 4: 0.5, 5: 0.6}
+
+
+def random_grid(rules, clues, rng):
+    """
+    Return a random puzzle for nxn.GridRules: a random full grid with all but a fraction
+    of clues of its cells blanked out. The puzzle is solvable but its solution may not be unique.
+    """
+    full = nxn.solve('.' * rules.cells, rules, rng)
+    keep = set(rng.sample(range(rules.cells), int(rules.cells * clues)))
+    return ''.join(ch if i in keep else '.' for i, ch in enumerate(full))
+
+
+def read_corpus(path):
+    """
+    Return the puzzles of a file with one puzzle per line, skipping blank lines.
+    """
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def time_solver(solve, grids):
+    """
+    Solve every grid with solve(grid). Returns the number solved and the time taken in seconds.
+    """
+    solved = 0
+    start = time.perf_counter()
+    for grid in grids:
+        if solve(grid):
+            solved += 1
+    return solved, time.perf_counter() - start
+
+
+def report(name, size, grids, solved, seconds, nodes=None):
+    print('{:<10}{:>7}{:>8}{:>8}{:>10.3f}{:>12.2f}{:>10}'.format(
+        name, size, len(grids), solved, seconds, 1000 * seconds / len(grids),
+        '' if nodes is None else '{:.0f}'.format(nodes / len(grids))))
+
+
+def count_nodes(grid, engine, rules):
+    """
+    Return the search nodes solution.solve() records in a SolveStats for grid.
+    """
+    stats = SolveStats(grid)
+    solution.solve(grid, engine=engine, rules=rules, stats=stats)
+    return stats.nodes
+
+
+def compare_engines(grids, rules, per_puzzle=False):
+    """
+    Time every engine in ENGINES on 9x9 grids, with the mean node count of the COUNTING_ENGINES.
+    The nodes are counted in a second run, so collecting the stats doesn't slow down the timed one.
+    """
+    for engine in ENGINES:
+        solved, seconds = time_solver(lambda grid: solution.solve(grid, engine=engine, rules=rules), grids)
+        nodes = sum(count_nodes(grid, engine, rules) for grid in grids) if engine in COUNTING_ENGINES else None
+        report(engine, '9x9', grids, solved, seconds, nodes)
+
+    if per_puzzle:
+        print('\n{:<6}'.format('puzzle') + ''.join('{:>12}'.format(e + ' ms') for e in ENGINES) + '{:>12}'.format('fastest'))
+        for i, grid in enumerate(grids):
+            times = [time_solver(lambda g: solution.solve(g, engine=engine, rules=rules), [grid])[1]
+                     for engine in ENGINES]
+            print('{:<6}'.format(i + 1) + ''.join('{:>12.2f}'.format(1000 * t) for t in times) +
+                  '{:>12}'.format(ENGINES[times.index(min(times))]))
+
+
+# The corpora of the suite: their rules and the generator.py grades they are made of
+SUITE_CORPORA = {
+    'easy': (CLASSIC, ('easy',)),
+    'hard': (CLASSIC, ('hard', 'expert')),
+    'diagonal': (DIAGONAL, None),
+}
+
+SUITE_ENGINES = {
+    'strings': lambda grid, rules: solution.solve(grid, rules=rules),
+    'strings-queue': lambda grid, rules: solution.solve(grid, propagation='queue', trail=True, rules=rules),
+    'bitboard': lambda grid, rules: solution.solve(grid, engine='bitboard', rules=rules),
+    'nxn': lambda grid, rules: solution.solve(grid, engine='nxn', rules=rules),
+    'dlx': lambda grid, rules: solution.solve(grid, engine='dlx', rules=rules),
+}
+
+# The metrics compare_results() checks, and whether a larger value is better
+GATED_METRICS = (('puzzles_per_second', True), ('p99_ms', False), ('peak_kb', False))
+
+
+def suite_corpus(name, count, seed=0, directory=None):
+    """
+    Return the grids and the rules of a corpus of SUITE_CORPORA, the same ones for the same seed.
+    With a directory the grids are read from directory/<name>.txt, which is written the first time
+    and extended when it holds fewer than count grids. Raises ValueError when a file that has to be
+    extended was not made with this seed.
+    """
+    rules, grades = SUITE_CORPORA[name]
+    path = os.path.join(directory, name + '.txt') if directory else None
+    stored = read_corpus(path) if path and os.path.exists(path) else None
+    if stored is not None and len(stored) >= count:
+        return stored[:count], rules
+    # generate_many yields the puzzles of a seed in order, so a smaller corpus is a prefix of this one
+    grids = [puzzle.puzzle for puzzle in generator.generate_many(
+        count, workers=1, seed='{}:{}'.format(name, seed), rules=rules, grades=grades)]
+    if stored is not None and grids[:len(stored)] != stored:
+        raise ValueError('{} was not made with seed {}, remove it to make {} grids'.format(path, seed, count))
+    if path:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(path, 'w') as f:
+            f.write('\n'.join(grids) + '\n')
+    return grids, rules
+
+
+def percentile(values, fraction):
+    """
+    Return the nearest-rank percentile of a sorted list, e.g. fraction 0.99 for p99.
+    """
+    return values[max(0, min(len(values) - 1, int(round(fraction * len(values))) - 1))]
+
+
+def measure(solve, grids, rules):
+    """
+    Solve every grid with solve(grid, rules), timing each one, then once more under tracemalloc.
+    Returns: a dictionary of the metrics of the suite.
+    """
+    latencies = []
+    solved = 0
+    for grid in grids:
+        start = time.perf_counter()
+        if solve(grid, rules):
+            solved += 1
+        latencies.append(time.perf_counter() - start)
+    seconds = sum(latencies)
+    latencies.sort()
+
+    # peak memory is measured separately, tracemalloc slows everything down
+    tracemalloc.start()
+    for grid in grids:
+        solve(grid, rules)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'puzzles': len(grids),
+        'solved': solved,
+        'seconds': seconds,
+        'puzzles_per_second': len(grids) / seconds if seconds else 0.,
+        'p50_ms': 1000 * percentile(latencies, 0.5),
+        'p99_ms': 1000 * percentile(latencies, 0.99),
+        'peak_kb': peak / 1024.,
+    }
+
+
+def run_suite(count=20, seed=0, engines=None, corpora=None, directory=None):
+    """
+    Measure every engine on every corpus.
+    Returns: {'meta': {...}, 'results': {corpus: {engine: metrics}}}, ready for JSON.
+    """
+    results = {}
+    for name in corpora or sorted(SUITE_CORPORA):
+        grids, rules = suite_corpus(name, count, seed, directory)
+        results[name] = dict((engine, measure(SUITE_ENGINES[engine], grids, rules))
+                             for engine in engines or sorted(SUITE_ENGINES))
+    meta = {'count': count, 'seed': seed, 'python': platform.python_version(), 'machine': platform.machine()}
+    return {'meta': meta, 'results': results}
+
+
+def compare_results(results, baseline, threshold=0.2):
+    """
+    Compare suite results with a baseline from an earlier run.
+    Returns: a list of (corpus, engine, metric, old, new) for every GATED_METRICS value that got
+        worse by more than threshold, e.g. 0.2 for 20%.
+    """
+    regressions = []
+    for name, engines in sorted(results['results'].items()):
+        for engine, metrics in sorted(engines.items()):
+            old_metrics = baseline['results'].get(name, {}).get(engine)
+            if old_metrics is None:
+                continue
+            for metric, higher_is_better in GATED_METRICS:
+                old, new = old_metrics[metric], metrics[metric]
+                worse = new < old * (1 - threshold) if higher_is_better else new > old * (1 + threshold)
+                if worse:
+                    regressions.append((name, engine, metric, old, new))
+    return regressions
+
+
+def report_suite(results):
+    print('{:<10}{:<15}{:>8}{:>8}{:>12}{:>10}{:>10}{:>12}'.format(
+        'corpus', 'engine', 'puzzles', 'solved', 'puzzles/s', 'p50 ms', 'p99 ms', 'peak KiB'))
+    for name, engines in sorted(results['results'].items()):
+        for engine, m in sorted(engines.items()):
+            print('{:<10}{:<15}{:>8}{:>8}{:>12.1f}{:>10.2f}{:>10.2f}{:>12.1f}'.format(
+                name, engine, m['puzzles'], m['solved'], m['puzzles_per_second'], m['p50_ms'],
+                m['p99_ms'], m['peak_kb']))
+
+
+def suite_main(args):
+    results = run_suite(args.count, args.seed, args.engine, args.suite_corpus, args.corpora)
+    report_suite(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_results(results, json.load(f), args.threshold)
+        for name, engine, metric, old, new in regressions:
+            print('REGRESSION {} {} {}: {:.2f} -> {:.2f}'.format(name, engine, metric, old, new))
+        if regressions:
+            return 1
+        print('no regressions against {}'.format(args.baseline))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare the speed of the Sudoku engines.')
+    parser.add_argument('--corpus', help='file of 9x9 puzzles, one per line, instead of random puzzles')
+    parser.add_argument('--classic', action='store_true',
+                        help='solve the corpus with classic rules instead of solution.default_rules')
+    parser.add_argument('--per-puzzle', action='store_true', help='time every engine on every puzzle')
+    parser.add_argument('--count', type=int, default=20, help='puzzles per grid size (default: 20)')
+    parser.add_argument('--clues', type=float, help='fraction of cells given (default: depends on the size)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the puzzles (default: 0)')
+    suite = parser.add_argument_group('regression suite')
+    suite.add_argument('--suite', action='store_true', help='run the regression suite')
+    suite.add_argument('--suite-corpus', action='append', choices=sorted(SUITE_CORPORA),
+                       help='only run this corpus, can be repeated')
+    suite.add_argument('--engine', action='append', choices=sorted(SUITE_ENGINES),
+                       help='only run this engine, can be repeated')
+    suite.add_argument('--corpora', metavar='DIR', help='read the corpora from DIR, writing them the first time')
+    suite.add_argument('--json', metavar='FILE', help='save the results to FILE')
+    suite.add_argument('--baseline', metavar='FILE', help='compare the results with the ones saved in FILE')
+    suite.add_argument('--threshold', type=float, default=0.2,
+                       help='relative change that counts as a regression (default: 0.2)')
+    args = parser.parse_args(argv)
+
+    if args.suite:
+        return suite_main(args)
+
+    print('{:<10}{:>7}{:>8}{:>8}{:>10}{:>12}{:>10}'.format(
+        'engine', 'size', 'puzzles', 'solved', 'total s', 'ms/puzzle', 'nodes'))
+
+    if args.corpus:
+        rules = CLASSIC if args.classic else solution.default_rules
+        compare_engines(read_corpus(args.corpus), rules, args.per_puzzle)
+        return
+
+    rng = random.Random(args.seed)
+    grids = [random_grid(nxn.get_rules(3), args.clues or CLUES[3], rng) for _ in range(args.count)]
+    compare_engines(grids, CLASSIC, args.per_puzzle)
+
+    for box_size in (4, 5):
+        rules = nxn.get_rules(box_size)
+        grids = [random_grid(rules, args.clues or CLUES[box_size], rng) for _ in range(args.count)]
+        solved, seconds = time_solver(lambda grid: nxn.solve(grid, rules), grids)
+        report('nxn', '{0}x{0}'.format(rules.n), grids, solved, seconds)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
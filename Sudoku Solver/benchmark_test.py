@@ -0,0 +1,47 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import benchmark
+
+
+class TestSuite(unittest.TestCase):
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(benchmark.percentile(values, 0.5), 50)
+        self.assertEqual(benchmark.percentile(values, 0.99), 99)
+        self.assertEqual(benchmark.percentile([7], 0.99), 7)
+
+    def test_corpus_reproducible(self):
+        directory = tempfile.mkdtemp()
+        try:
+            grids, rules = benchmark.suite_corpus('easy', 2, seed=3, directory=directory)
+            self.assertEqual(len(grids), 2)
+            self.assertEqual(benchmark.suite_corpus('easy', 2, seed=3, directory=directory), (grids, rules))
+            self.assertEqual(benchmark.suite_corpus('easy', 2, seed=3)[0], grids)
+            # asking for more grids than stored extends the file with the same seed
+            more, _ = benchmark.suite_corpus('easy', 3, seed=3, directory=directory)
+            self.assertEqual(more[:2], grids)
+            self.assertEqual(len(benchmark.read_corpus(os.path.join(directory, 'easy.txt'))), 3)
+            self.assertRaises(ValueError, benchmark.suite_corpus, 'easy', 4, seed=4, directory=directory)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_run_and_compare(self):
+        results = benchmark.run_suite(2, seed=3, engines=['bitboard'], corpora=['easy'])
+        metrics = results['results']['easy']['bitboard']
+        self.assertEqual((metrics['puzzles'], metrics['solved']), (2, 2))
+        self.assertLessEqual(metrics['p50_ms'], metrics['p99_ms'])
+        self.assertGreater(metrics['peak_kb'], 0)
+        self.assertEqual(benchmark.compare_results(results, results), [])
+
+        baseline = {'results': {'easy': {'bitboard': dict(metrics, puzzles_per_second=metrics['puzzles_per_second'] * 2,
+                                                        p99_ms=metrics['p99_ms'] / 2)}}}
+        regressions = benchmark.compare_results(results, baseline, threshold=0.2)
+        self.assertEqual(sorted(r[2] for r in regressions), ['p99_ms', 'puzzles_per_second'])
+
+
+if __name__ == '__main__':
+    unittest.main()
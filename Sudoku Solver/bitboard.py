@@ -0,0 +1,200 @@
+"""
+Bitmask engine for the Sudoku solver.
+
+Boxes are addressed by their index 0..80 (row-major, so 'A1' is 0 and 'I9' is
+80) and the candidates of a box are stored as a 9-bit integer where bit d - 1
+is set while digit d is still possible. A puzzle is a plain list of 81 masks,
+so the propagation rules below only do integer arithmetic and never build
+strings. The unit and peer index tables come from a rules.SudokuRules object,
+solution.default_rules when none is given.
+"""
+import solution
+
+DIGITS = '123456789'
+ALL_DIGITS = (1 << len(DIGITS)) - 1
+
+BOXES = solution.boxes
+BOX_INDEX = dict((box, i) for i, box in enumerate(BOXES))
+
+# Lookup tables indexed by mask
+DIGIT_MASK = dict((d, 1 << i) for i, d in enumerate(DIGITS))
+BIT_COUNT = [bin(mask).count('1') for mask in range(ALL_DIGITS + 1)]
+MASK_DIGITS = [''.join(d for i, d in enumerate(DIGITS) if mask >> i & 1) for mask in range(ALL_DIGITS + 1)]
+
+
+def grid_masks(grid):
+    """
+    Convert grid into a list of 81 candidate masks.
+    Args:
+        grid(string) - A grid in string form, '.' for empty boxes.
+    Returns:
+        A list of masks, ALL_DIGITS for the empty boxes.
+    """
+    masks = []
+    for col in grid:
+        if col == '.':
+            masks.append(ALL_DIGITS)
+        if col in DIGIT_MASK:
+            masks.append(DIGIT_MASK[col])
+    assert len(masks) == 81
+    return masks
+
+
+def values_to_masks(values):
+    """
+    Convert a values dictionary of the form {'A1': '123', ...} into a list of masks.
+    """
+    masks = [0] * len(BOXES)
+    for box, digits in values.items():
+        mask = 0
+        for d in digits:
+            mask |= DIGIT_MASK[d]
+        masks[BOX_INDEX[box]] = mask
+    return masks
+
+
+def masks_to_values(masks):
+    """
+    Convert a list of masks back into the values dictionary used by solution.py.
+    """
+    return dict((box, MASK_DIGITS[mask]) for box, mask in zip(BOXES, masks))
+
+
+def eliminate(masks, rules=None):
+    """
+    Args:
+        masks(list): the candidate masks of the puzzle
+        rules(SudokuRules): the units to use, solution.default_rules when None
+    Returns: removes the digit of every solved box from the masks of its peers
+
+    """
+    peers = (rules or solution.default_rules).peer_index
+    for box, mask in enumerate(masks):
+        if BIT_COUNT[mask] == 1:
+            clear = ~mask
+            for peer in peers[box]:
+                masks[peer] &= clear
+    return masks
+
+
+def only_choice(masks, rules=None):
+    """
+    Args:
+        masks(list): the candidate masks of the puzzle
+        rules(SudokuRules): the units to use, solution.default_rules when None
+    Returns: assigns every digit that fits in a single box of a unit to that box
+
+    """
+    for unit in (rules or solution.default_rules).unit_index:
+        # Fold the unit into the digits seen once and the digits seen more than once
+        once = twice = 0
+        for box in unit:
+            twice |= once & masks[box]
+            once |= masks[box]
+        hidden = once & ~twice
+        if hidden:
+            for box in unit:
+                digit = masks[box] & hidden
+                if digit and masks[box] != digit:
+                    # Two hidden singles in the same box is a contradiction
+                    masks[box] = digit if BIT_COUNT[digit] == 1 else 0
+    return masks
+
+
+def naked_twins(masks, rules=None):
+    """
+    Args:
+        masks(list): the candidate masks of the puzzle
+        rules(SudokuRules): the units to use, solution.default_rules when None
+    Returns: removes the digits of each pair of naked twins from the other boxes of their units
+        and cages
+
+    """
+    for unit in (rules or solution.default_rules).group_index:
+        seen = set()
+        for box in unit:
+            mask = masks[box]
+            if BIT_COUNT[mask] != 2:
+                continue
+            if mask not in seen:
+                seen.add(mask)
+                continue
+            clear = ~mask
+            for other in unit:
+                if masks[other] != mask:
+                    masks[other] &= clear
+    return masks
+
+
+def reduce_puzzle(masks, rules=None):
+    """
+    Args:
+        masks(list): the candidate masks of the puzzle
+        rules(SudokuRules): the units to use, solution.default_rules when None
+    Returns: the reduced masks, or False if a box ran out of candidates
+
+    """
+    stalled = False
+
+    while not stalled:
+        solved_before = sum(1 for mask in masks if BIT_COUNT[mask] == 1)
+        eliminate(masks, rules)
+        only_choice(masks, rules)
+        naked_twins(masks, rules)
+        solved_after = sum(1 for mask in masks if BIT_COUNT[mask] == 1)
+
+        stalled = solved_before == solved_after
+
+        if 0 in masks:
+            return False
+    return masks
+
+
+def search(masks, rules=None):
+    """
+    Args:
+        masks(list): the candidate masks of the puzzle
+        rules(SudokuRules): the units to use, solution.default_rules when None
+    Returns: depth-first search over the box with the fewest candidates, or False if there is no solution
+
+    """
+    masks = reduce_puzzle(masks, rules)
+    if masks is False:
+        return False
+
+    # Choose one of the unfilled boxes with the fewest possibilities
+    box, count = None, 10
+    for i, mask in enumerate(masks):
+        if 1 < BIT_COUNT[mask] < count:
+            box, count = i, BIT_COUNT[mask]
+            if count == 2:
+                break
+    if box is None:
+        return masks
+
+    mask = masks[box]
+    while mask:
+        digit = mask & -mask
+        mask ^= digit
+        masks_try = masks[:]
+        masks_try[box] = digit
+        solve_try = search(masks_try, rules)
+        if solve_try:
+            return solve_try
+    return False
+
+
+def solve(grid, rules=None):
+    """
+    Find the solution to a Sudoku grid with the bitmask engine.
+    Args:
+        grid(string): a string representing a sudoku grid.
+        rules(SudokuRules): the variant to solve, solution.default_rules when None.
+    Returns:
+        The dictionary representation of the final sudoku grid, the same as solution.solve().
+        False if no solution exists.
+    """
+    masks = search(grid_masks(grid), rules)
+    if masks is False:
+        return False
+    return masks_to_values(masks)
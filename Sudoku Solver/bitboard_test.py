@@ -0,0 +1,52 @@
+import bitboard
+import rules
+import solution
+import solution_test
+import unittest
+
+
+class TestBitboardNakedTwins(unittest.TestCase):
+
+    def check_naked_twins(self, before, possible_solutions):
+        masks = bitboard.naked_twins(bitboard.values_to_masks(before))
+        self.assertIn(bitboard.masks_to_values(masks), possible_solutions)
+
+    def test_naked_twins(self):
+        case = solution_test.TestNakedTwins
+        self.check_naked_twins(case.before_naked_twins_1, case.possible_solutions_1)
+
+    def test_naked_twins2(self):
+        case = solution_test.TestNakedTwins
+        self.check_naked_twins(case.before_naked_twins_2, case.possible_solutions_2)
+
+    def test_twins_in_cage(self):
+        caged = rules.get_rules(cages=[['A1', 'E5', 'I9']])
+        values = dict((box, '123456789') for box in solution.boxes)
+        values.update({'A1': '12', 'E5': '12'})
+        masks = bitboard.naked_twins(bitboard.values_to_masks(values), caged)
+        self.assertEqual(bitboard.masks_to_values(masks)['I9'], '3456789')
+        self.assertEqual(bitboard.masks_to_values(masks), solution.naked_twins(values, rules=caged))
+
+
+class TestBitboardSolve(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+
+    def test_round_trip(self):
+        values = solution.grid_values(self.diagonal_grid)
+        self.assertEqual(bitboard.masks_to_values(bitboard.values_to_masks(values)), values)
+        self.assertEqual(bitboard.grid_masks(self.diagonal_grid), bitboard.values_to_masks(values))
+
+    def test_solve(self):
+        self.assertEqual(bitboard.solve(self.diagonal_grid), solution_test.TestDiagonalSudoku.solved_diag_sudoku)
+
+    def test_solve_engine(self):
+        self.assertEqual(solution.solve(self.diagonal_grid, engine='bitboard'),
+                         solution_test.TestDiagonalSudoku.solved_diag_sudoku)
+
+    def test_no_solution(self):
+        # Two 2s in the first row
+        self.assertFalse(bitboard.solve('22' + '.' * 79))
+
+
+if __name__ == '__main__':
+    unittest.main()
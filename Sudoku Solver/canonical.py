@@ -0,0 +1,223 @@
+"""
+Canonical forms of Sudoku grids and a solve cache keyed by them.
+
+Transposing a grid, swapping its bands of three rows or its stacks of three columns and
+relabelling its digits all give a puzzle that is solved by applying the same change to the
+solution. canonical_form() picks one representative for all the variants of a grid that a
+rules.SudokuRules allows: the smallest string among its symmetries with the digits relabelled in
+order of first appearance. SolveCache stores the solutions of canonical grids, so that every
+variant of a puzzle it has seen is answered from the cache. Example:
+
+    cache = SolveCache(maxsize=10000, path='solutions.db', engine='bitboard')
+    values = cache.solve(grid)
+    print(cache.hits, cache.misses)
+"""
+import itertools
+import shelve
+from collections import OrderedDict
+
+import solution
+from rules import boxes
+
+DIGITS = '123456789'
+
+
+class Transform(object):
+    """
+    A symmetry of the grid followed by a relabelling of the digits.
+    Args:
+        perm(tuple): box i of the transformed grid is box perm[i] of the original one.
+        labels(dict): maps the digits of the original grid to those of the transformed one.
+    """
+
+    def __init__(self, perm, labels):
+        self.perm = perm
+        self.labels = labels
+        self._apply_table = str.maketrans(labels)
+        self._undo_table = str.maketrans(dict((new, old) for old, new in labels.items()))
+
+    def apply(self, grid):
+        """
+        Return the transformed grid string.
+        """
+        return ''.join(map(grid.__getitem__, self.perm)).translate(self._apply_table)
+
+    def undo(self, grid):
+        """
+        Map a transformed grid string, e.g. the solution of the transformed puzzle, back.
+        """
+        grid = grid.translate(self._undo_table)
+        original = [''] * len(self.perm)
+        for i, box in enumerate(self.perm):
+            original[box] = grid[i]
+        return ''.join(original)
+
+
+def _relabel(grid):
+    """
+    Return the digits of grid relabelled in order of first appearance, and the relabelling.
+    """
+    labels = {}
+    for ch in grid:
+        if ch != '.' and ch not in labels:
+            labels[ch] = DIGITS[len(labels)]
+            if len(labels) == len(DIGITS):
+                break
+    # digits that are not in the grid keep a free label, so that the relabelling can be undone
+    free = iter(d for d in DIGITS if d not in labels.values())
+    for d in DIGITS:
+        if d not in labels:
+            labels[d] = next(free)
+    return grid.translate(str.maketrans(labels)), labels
+
+
+def _geometric_perms():
+    """
+    Yield the 72 permutations of the boxes made of a transposition, a permutation of the bands
+    and a permutation of the stacks.
+    """
+    for transpose in (False, True):
+        for bands in itertools.permutations(range(3)):
+            for stacks in itertools.permutations(range(3)):
+                perm = []
+                for r in range(9):
+                    for c in range(9):
+                        row, col = bands[r // 3] * 3 + r % 3, stacks[c // 3] * 3 + c % 3
+                        if transpose:
+                            row, col = col, row
+                        perm.append(row * 9 + col)
+                yield tuple(perm)
+
+
+_cache = {}
+
+
+def symmetries(rules=None):
+    """
+    Return the permutations of the boxes that map every group of a rules.SudokuRules onto a group,
+    solution.default_rules when None. All 72 for classic Sudoku, fewer for the variants.
+    """
+    rules = rules or solution.default_rules
+    if rules not in _cache:
+        box_index = dict((box, i) for i, box in enumerate(boxes))
+        groups = set(frozenset(box_index[box] for box in group) for group in rules.group_list)
+        perms = []
+        for perm in _geometric_perms():
+            if all(frozenset(perm[i] for i in group) in groups for group in groups):
+                perms.append(perm)
+        _cache[rules] = perms
+    return _cache[rules]
+
+
+def canonical_form(grid, rules=None):
+    """
+    Return the canonical form of a grid.
+    Args:
+        grid(string): a string representing a sudoku grid, '.' for the blanks.
+        rules(SudokuRules): the variant of the grid, solution.default_rules when None.
+    Returns:
+        (canonical, transform): the canonical grid string and the Transform that turns grid into it.
+    """
+    grid = solution.grid_string(solution.grid_values(grid))
+    best = None
+    for perm in symmetries(rules):
+        candidate, labels = _relabel(''.join(map(grid.__getitem__, perm)))
+        if best is None or candidate < best[0]:
+            best = candidate, perm, labels
+    canonical, perm, labels = best
+    return canonical, Transform(perm, labels)
+
+
+class SolveCache(object):
+    """
+    A least recently used cache of solutions in front of solution.solve(), keyed by canonical form.
+    Args:
+        maxsize(int): the number of solutions kept in memory.
+        path(string): also keep every solution in a shelve database at this path, which outlives
+            the process and is looked up when a grid is not in memory.
+        rules(SudokuRules): the variant to solve, solution.default_rules when None.
+        options: keyword arguments for solution.solve(), e.g. engine='bitboard'.
+    Attributes:
+        hits, misses(int): lookups answered from memory or from disk, and solves.
+        disk_hits(int): the hits that were answered from disk.
+    """
+
+    def __init__(self, maxsize=1024, path=None, rules=None, **options):
+        self.maxsize = maxsize
+        self.rules = rules or solution.default_rules
+        self.options = options
+        self.hits = self.misses = self.disk_hits = 0
+        self._solutions = OrderedDict()
+        self._disk = shelve.open(path) if path else None
+        self._prefix = repr(self.rules) + ':'
+
+    def solve(self, grid):
+        """
+        Find the solution to a Sudoku grid, the same as solution.solve().
+        """
+        canonical, transform = canonical_form(grid, self.rules)
+        solved = self._lookup(canonical)
+        if solved is None:
+            self.misses += 1
+            values = solution.solve(canonical, rules=self.rules, **self.options)
+            solved = solution.grid_string(values) if values else ''
+            if self._disk is not None:
+                self._disk[self._prefix + canonical] = solved
+            self._store(canonical, solved)
+        else:
+            self.hits += 1
+        if not solved:
+            return False
+        return dict(zip(boxes, transform.undo(solved)))
+
+    def _lookup(self, canonical):
+        solved = self._solutions.get(canonical)
+        if solved is not None:
+            self._solutions.move_to_end(canonical)
+            return solved
+        if self._disk is not None:
+            solved = self._disk.get(self._prefix + canonical)
+            if solved is not None:
+                self.disk_hits += 1
+                self._store(canonical, solved)
+        return solved
+
+    def _store(self, canonical, solved):
+        self._solutions[canonical] = solved
+        if len(self._solutions) > self.maxsize:
+            self._solutions.popitem(last=False)
+
+    def __len__(self):
+        return len(self._solutions)
+
+    def stats(self):
+        """
+        Return the hit and miss counts as a dictionary.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_hits': self.disk_hits,
+            'size': len(self._solutions),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.,
+        }
+
+    def clear(self):
+        """
+        Empty the memory cache and reset the counts. The disk database is kept.
+        """
+        self._solutions.clear()
+        self.hits = self.misses = self.disk_hits = 0
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
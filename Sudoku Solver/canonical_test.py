@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import canonical
+import solution
+import solution_test
+from rules import CLASSIC, DIAGONAL, WINDOKU, get_rules
+
+
+class TestCanonicalForm(unittest.TestCase):
+    hard_grid = '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......'
+
+    def variants(self, grid, rules):
+        relabel = dict(zip('123456789', '918273645'))
+        return [canonical.Transform(perm, relabel).apply(grid) for perm in canonical.symmetries(rules)]
+
+    def test_symmetries(self):
+        self.assertEqual(len(canonical.symmetries(CLASSIC)), 72)
+        # the diagonals only survive the transposition and the reversal of both bands and stacks
+        self.assertEqual(len(canonical.symmetries(DIAGONAL)), 4)
+        self.assertEqual(len(canonical.symmetries(WINDOKU)), 2)
+        self.assertEqual(len(canonical.symmetries(get_rules(cages=[['A1', 'B2']]))), 8)
+
+    def test_variants(self):
+        canonical_grid, transform = canonical.canonical_form(self.hard_grid, CLASSIC)
+        self.assertEqual(transform.apply(self.hard_grid), canonical_grid)
+        self.assertEqual(transform.undo(canonical_grid), self.hard_grid)
+        variants = self.variants(self.hard_grid, CLASSIC)
+        self.assertEqual(len(set(variants)), 72)
+        for variant in variants:
+            self.assertEqual(canonical.canonical_form(variant, CLASSIC)[0], canonical_grid)
+
+    def test_rules(self):
+        grid = solution_test.TestDiagonalSudoku.diagonal_grid
+        forms = set(canonical.canonical_form(variant, DIAGONAL)[0] for variant in self.variants(grid, DIAGONAL))
+        self.assertEqual(len(forms), 1)
+        self.assertNotEqual(canonical.canonical_form(grid, DIAGONAL)[0], canonical.canonical_form(grid, CLASSIC)[0])
+
+
+class TestSolveCache(unittest.TestCase):
+    hard_grid = TestCanonicalForm.hard_grid
+
+    def test_hits(self):
+        cache = canonical.SolveCache(rules=CLASSIC)
+        for variant in TestCanonicalForm('variants').variants(self.hard_grid, CLASSIC)[:10]:
+            values = cache.solve(variant)
+            self.assertEqual(values, solution.solve(variant, rules=CLASSIC))
+        self.assertEqual((cache.hits, cache.misses), (9, 1))
+        self.assertFalse(cache.solve('22' + '.' * 79))
+        self.assertFalse(cache.solve('33' + '.' * 79))
+        self.assertEqual(cache.stats()['misses'], 2)
+
+    def test_maxsize(self):
+        cache = canonical.SolveCache(maxsize=2, rules=CLASSIC, engine='bitboard')
+        grids = ['1' + '.' * 80, '12' + '.' * 79, '123' + '.' * 78]
+        for grid in grids:
+            cache.solve(grid)
+        self.assertEqual(len(cache), 2)
+        cache.solve(grids[0])
+        self.assertEqual(cache.misses, 4)
+        cache.solve(grids[2])
+        self.assertEqual(cache.hits, 1)
+
+    def test_disk(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'solutions')
+            with canonical.SolveCache(path=path, rules=CLASSIC) as cache:
+                expected = cache.solve(self.hard_grid)
+            with canonical.SolveCache(path=path, rules=CLASSIC) as cache:
+                self.assertEqual(cache.solve(self.hard_grid), expected)
+                self.assertEqual((cache.hits, cache.disk_hits, cache.misses), (1, 1, 0))
+            with canonical.SolveCache(path=path, rules=DIAGONAL) as cache:
+                cache.solve(self.hard_grid)
+                self.assertEqual(cache.misses, 1)
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+Exact cover backend for the Sudoku solver.
+
+A Sudoku is an exact cover problem: every choice of a digit for a box is a row covering one
+"box is filled" column and one "unit holds the digit" column per unit of the box, and a solution
+picks rows that cover every column exactly once. This module solves it with Knuth's Algorithm X,
+with the dancing links replaced by Python sets: covering a column removes the rows that clash
+with it from the other columns and uncovering puts them back, in the same order as the links
+would be relinked. Cages of a rules.SudokuRules are secondary columns, covered at most once.
+"""
+from rules import boxes, columns as digits
+import solution
+
+
+class ExactCover(object):
+    """
+    The columns and rows of the exact cover problem for a rules.SudokuRules.
+    Attributes:
+        rows(dict): maps each (box, digit) choice to the columns it covers.
+        primary(list): the columns every solution must cover.
+        secondary(list): the columns a solution may cover at most once.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.primary = [('box', box) for box in boxes]
+        self.primary += [('unit', i, d) for i, _ in enumerate(rules.unit_list) for d in digits]
+        self.secondary = [('cage', i, d) for i, _ in enumerate(rules.cages) for d in digits]
+
+        units_of = dict((box, [i for i, unit in enumerate(rules.unit_list) if box in unit]) for box in boxes)
+        cages_of = dict((box, [i for i, cage in enumerate(rules.cages) if box in cage]) for box in boxes)
+        self.rows = {}
+        for box in boxes:
+            for d in digits:
+                self.rows[(box, d)] = ([('box', box)] + [('unit', i, d) for i in units_of[box]] +
+                                       [('cage', i, d) for i in cages_of[box]])
+
+    def columns(self):
+        """
+        Return a fresh mapping from every column to the set of rows covering it.
+        """
+        cols = dict((col, set()) for col in self.primary + self.secondary)
+        for row, row_cols in self.rows.items():
+            for col in row_cols:
+                cols[col].add(row)
+        return cols
+
+
+_cache = {}
+
+
+def get_cover(rules):
+    """
+    Return the ExactCover for a rules.SudokuRules, building it only the first time.
+    """
+    if rules not in _cache:
+        _cache[rules] = ExactCover(rules)
+    return _cache[rules]
+
+
+def select(cols, rows, row):
+    """
+    Cover the columns of row, removing every clashing row from the remaining columns.
+    Returns the removed columns so that deselect() can put them back.
+    """
+    removed = []
+    for col in rows[row]:
+        for other in cols[col]:
+            for other_col in rows[other]:
+                if other_col != col:
+                    cols[other_col].remove(other)
+        removed.append(cols.pop(col))
+    return removed
+
+
+def deselect(cols, rows, row, removed):
+    """
+    Undo select(), uncovering the columns of row in reverse order.
+    """
+    for col in reversed(rows[row]):
+        cols[col] = removed.pop()
+        for other in cols[col]:
+            for other_col in rows[other]:
+                if other_col != col:
+                    cols[other_col].add(other)
+
+
+class Search(object):
+    """
+    Algorithm X over the columns of an ExactCover, counting the nodes it visits.
+    Args:
+        cover(ExactCover): the problem to solve.
+        limit(int): stop after finding this many solutions.
+    Attributes:
+        nodes(int): _search() calls.
+        max_depth(int): the most rows selected on top of the givens.
+        backtracks(int): selected rows that were deselected again.
+    """
+
+    def __init__(self, cover, limit=1):
+        self.cover = cover
+        self.limit = limit
+        self.nodes = 0
+        self.max_depth = 0
+        self.backtracks = 0
+        self.solutions = []
+        self._givens = 0
+
+    def run(self, givens):
+        """
+        Select the given (box, digit) rows and search for solutions.
+        Returns False if the givens clash, True otherwise; the solutions found are in self.solutions.
+        """
+        cols, rows = self.cover.columns(), self.cover.rows
+        primary = self.cover.primary
+        for row in givens:
+            if any(col not in cols or row not in cols[col] for col in rows[row]):
+                return False
+            select(cols, rows, row)
+        self._givens = len(givens)
+        self._search(cols, rows, [c for c in primary if c in cols], list(givens))
+        return True
+
+    def _search(self, cols, rows, primary, partial):
+        self.nodes += 1
+        self.max_depth = max(self.max_depth, len(partial) - self._givens)
+        open_cols = [c for c in primary if c in cols]
+        if not open_cols:
+            self.solutions.append(list(partial))
+            return len(self.solutions) >= self.limit
+        # Choose the column covered by the fewest rows
+        col = min(open_cols, key=lambda c: len(cols[c]))
+        for row in sorted(cols[col]):
+            partial.append(row)
+            removed = select(cols, rows, row)
+            done = self._search(cols, rows, open_cols, partial)
+            deselect(cols, rows, row, removed)
+            partial.pop()
+            if done:
+                return True
+            self.backtracks += 1
+        return False
+
+
+def search(grid, rules=None, limit=1):
+    """
+    Run Algorithm X on a grid.
+    Args:
+        grid(string): a string representing a sudoku grid.
+        rules(SudokuRules): the variant to solve, solution.default_rules when None.
+        limit(int): stop after finding this many solutions.
+    Returns:
+        The Search, with the solutions found as lists of (box, digit) rows and the node count.
+    """
+    values = solution.grid_values(grid)
+    givens = [(box, values[box]) for box in boxes if len(values[box]) == 1]
+    run = Search(get_cover(rules or solution.default_rules), limit)
+    run.run(givens)
+    return run
+
+
+def solve(grid, rules=None, stats=None):
+    """
+    Find the solution to a Sudoku grid with Algorithm X.
+    Args:
+        stats(SolveStats): record the nodes, the depth and the backtracks of the search in it.
+    Returns:
+        The dictionary representation of the final sudoku grid, the same as solution.solve().
+        False if no solution exists.
+    """
+    run = search(grid, rules)
+    if stats is not None:
+        stats.nodes += run.nodes
+        stats.max_depth = max(stats.max_depth, run.max_depth)
+        stats.backtracks += run.backtracks
+    if not run.solutions:
+        return False
+    return dict(run.solutions[0])
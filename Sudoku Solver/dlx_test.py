@@ -0,0 +1,50 @@
+import unittest
+
+import dlx
+import rules
+import solution
+import solution_test
+from stats import SolveStats
+
+
+class TestExactCover(unittest.TestCase):
+    classic_grid = '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......'
+
+    def test_diagonal(self):
+        self.assertEqual(solution.solve(solution_test.TestDiagonalSudoku.diagonal_grid, engine='dlx'),
+                         solution_test.TestDiagonalSudoku.solved_diag_sudoku)
+
+    def test_classic(self):
+        values = dlx.solve(self.classic_grid, rules.CLASSIC)
+        self.assertEqual(solution.grid_string(values),
+                         '417369825632158947958724316825437169791586432346912758289643571573291684164875293')
+
+    def test_node_count(self):
+        run = dlx.search(self.classic_grid, rules.CLASSIC, limit=2)
+        self.assertEqual(len(run.solutions), 1)
+        self.assertGreater(run.nodes, 1)
+
+    def test_stats(self):
+        stats = SolveStats(self.classic_grid)
+        values = solution.solve(self.classic_grid, engine='dlx', rules=rules.CLASSIC, stats=stats)
+        run = dlx.search(self.classic_grid, rules.CLASSIC)
+        self.assertEqual(stats.nodes, run.nodes)
+        self.assertEqual((stats.max_depth, stats.backtracks), (run.max_depth, run.backtracks))
+        self.assertEqual(run.max_depth, 81 - 17)
+        self.assertTrue(stats.solved)
+        self.assertEqual(stats.to_dict()['nodes'], run.nodes)
+        self.assertTrue(values)
+
+    def test_no_solution(self):
+        self.assertFalse(dlx.solve('22' + '.' * 79))
+        self.assertEqual(dlx.search('22' + '.' * 79).nodes, 0)
+
+    def test_cages(self):
+        caged = rules.get_rules(cages=[['A1', 'E5', 'I9']])
+        values = dlx.solve('.' * 81, caged)
+        self.assertEqual(len(set(values[box] for box in ('A1', 'E5', 'I9'))), 3)
+        self.assertFalse(dlx.solve('1' + '.' * 39 + '1' + '.' * 40, caged))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+Generate graded Sudoku puzzles with a unique solution.
+
+A puzzle starts as a random solved grid, filled by the size-parametric engine in nxn.py with the
+candidates tried in random order. Its clues are then removed in random order, putting a clue back
+whenever solution.count_solutions() finds that the puzzle lost its unique solution. The finished
+puzzle is graded by the easiest strategies of solution.py that solve it without guessing, or by
+how deep the search had to guess. Example:
+
+    python generator.py --count 1000 --parallel 8 --grade hard --classic > puzzles.tsv
+
+writes one tab separated line per puzzle as soon as it is generated:
+
+    <puzzle>  <grade>  <clues>  <search depth>
+"""
+import argparse
+import itertools
+import multiprocessing
+import random
+import sys
+import time
+from collections import namedtuple
+
+import batch
+import nxn
+import solution
+from rules import get_rules
+from stats import SolveStats
+
+Puzzle = namedtuple('Puzzle', ['puzzle', 'solution', 'clues', 'grade', 'depth'])
+
+# The strategies a puzzle of each grade is solved with, easiest first. Puzzles that none of them
+# solve need a search: 'hard' when it never guesses more than HARD_DEPTH boxes deep, 'expert' otherwise.
+GRADES = (
+    ('easy', (solution.eliminate, solution.only_choice)),
+    ('medium', (solution.eliminate, solution.only_choice, solution.naked_twins)),
+)
+HARD_DEPTH = 2
+GRADE_NAMES = tuple(name for name, _ in GRADES) + ('hard', 'expert')
+
+
+def random_solution(rules=None, rng=None):
+    """
+    Return a random solved grid string for a rules.SudokuRules, solution.default_rules when None.
+    """
+    return nxn.solve('.' * 81, nxn.from_sudoku_rules(rules or solution.default_rules), rng or random.Random())
+
+
+def remove_clues(grid, rules=None, rng=None):
+    """
+    Blank out the boxes of a solved grid in random order, keeping every clue whose removal would
+    leave more than one solution. Returns the puzzle as a string with '.' for the blanks.
+    """
+    rng = rng or random.Random()
+    puzzle = list(grid)
+    order = list(range(len(puzzle)))
+    rng.shuffle(order)
+    for i in order:
+        clue, puzzle[i] = puzzle[i], '.'
+        if solution.count_solutions(''.join(puzzle), 2, rules=rules) != 1:
+            puzzle[i] = clue
+    return ''.join(puzzle)
+
+
+def grade(puzzle, rules=None):
+    """
+    Grade a puzzle with a unique solution.
+    Returns:
+        (grade, depth): the name of the easiest entry of GRADES whose strategies solve the puzzle,
+        or 'hard' or 'expert' and the deepest the search had to guess. depth is 0 without a search.
+    """
+    for name, strategies in GRADES:
+        values = solution.reduce_puzzle(solution.grid_values(puzzle), rules=rules, strategies=strategies)
+        if values and all(len(v) == 1 for v in values.values()):
+            return name, 0
+    stats = SolveStats()
+    solution.solve(puzzle, propagation='queue', trail=True, rules=rules, stats=stats)
+    return ('hard' if stats.max_depth <= HARD_DEPTH else 'expert'), stats.max_depth
+
+
+def generate(rules=None, rng=None):
+    """
+    Generate and grade one puzzle. Returns a Puzzle(puzzle, solution, clues, grade, depth).
+    """
+    rng = rng or random.Random()
+    full = random_solution(rules, rng)
+    puzzle = remove_clues(full, rules, rng)
+    name, depth = grade(puzzle, rules)
+    return Puzzle(puzzle, full, sum(1 for ch in puzzle if ch != '.'), name, depth)
+
+
+# The rules of the current worker process, see _init_worker
+_worker_rules = None
+
+
+def _init_worker(rules):
+    global _worker_rules
+    _worker_rules = rules
+
+
+def _generate_one(args):
+    """
+    Generate the puzzle of one (seed, index) pair, the same one whichever worker gets it.
+    """
+    seed, index = args
+    rng = random.Random('{}:{}'.format(seed, index)) if seed is not None else random.Random()
+    return generate(_worker_rules, rng)
+
+
+def _generate_chunk(tasks):
+    return [_generate_one(task) for task in tasks]
+
+
+def generate_many(count=None, workers=None, seed=None, rules=None, grades=None, chunksize=4):
+    """
+    Generate puzzles across a process pool.
+    Args:
+        count(int): stop after this many puzzles, never when None.
+        workers(int): number of worker processes, os.cpu_count() when None. With 1 the puzzles are
+            generated in the current process.
+        seed: make the puzzles reproducible, with any number of workers. Random when None.
+        rules(SudokuRules): the variant to generate, solution.default_rules when None.
+        grades(collection): only yield puzzles of these grades, all of them when None.
+        chunksize(int): number of puzzles handed to a worker at a time.
+    Returns:
+        A generator of Puzzle tuples in the order of their index, the same ones whichever worker
+        made them. At most workers * 4 chunks are queued ahead of the puzzles yielded, refilled as
+        soon as one is yielded, so the pool stops soon after the consumer does.
+    """
+    tasks = ((seed, index) for index in itertools.count())
+    if workers == 1:
+        _init_worker(rules)
+        results = map(_generate_one, tasks)
+        pool = None
+    else:
+        workers = workers or multiprocessing.cpu_count()
+        pool = multiprocessing.Pool(workers, _init_worker, (rules,))
+        results = batch.imap_chunks(pool, _generate_chunk, tasks, chunksize, workers * 4)
+    try:
+        produced = 0
+        for puzzle in results:
+            if grades is None or puzzle.grade in grades:
+                yield puzzle
+                produced += 1
+                if count is not None and produced >= count:
+                    return
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate graded Sudoku puzzles with a unique solution.')
+    parser.add_argument('-n', '--count', type=int, default=10, help='number of puzzles (default: 10)')
+    parser.add_argument('-p', '--parallel', type=int, default=1, metavar='N',
+                        help='number of worker processes (default: 1, generate in this process)')
+    parser.add_argument('--seed', help='make the output reproducible')
+    parser.add_argument('--grade', action='append', choices=GRADE_NAMES,
+                        help='only keep puzzles of this grade, can be repeated')
+    variant = parser.add_mutually_exclusive_group()
+    variant.add_argument('--diagonal', dest='variant', action='store_const', const='diagonal',
+                         default='diagonal', help='the two main diagonals are units too (default)')
+    variant.add_argument('--classic', dest='variant', action='store_const', const='classic',
+                         help='only rows, columns and squares are units')
+    variant.add_argument('--windoku', dest='variant', action='store_const', const='windoku',
+                         help='four extra 3x3 windows are units too')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    count = 0
+    for puzzle in generate_many(args.count, args.parallel, args.seed, get_rules(args.variant), args.grade):
+        sys.stdout.write('{}\t{}\t{}\t{}\n'.format(puzzle.puzzle, puzzle.grade, puzzle.clues, puzzle.depth))
+        sys.stdout.flush()
+        count += 1
+
+    elapsed = time.perf_counter() - start
+    sys.stderr.write('{} puzzles in {:.2f}s ({:.1f} puzzles/s)\n'.format(
+        count, elapsed, count / elapsed if elapsed else 0.))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
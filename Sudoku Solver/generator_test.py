@@ -0,0 +1,68 @@
+import random
+import unittest
+
+import generator
+import solution
+from rules import CLASSIC, get_rules
+
+
+class TestGenerator(unittest.TestCase):
+
+    def test_random_solution(self):
+        grid = generator.random_solution(CLASSIC, random.Random(1))
+        self.assertEqual(len(grid), 81)
+        self.assertEqual(solution.count_solutions(grid, rules=CLASSIC), 1)
+        self.assertNotEqual(grid, generator.random_solution(CLASSIC, random.Random(2)))
+
+    def test_generate(self):
+        puzzle = generator.generate(CLASSIC, random.Random(1))
+        self.assertTrue(solution.is_unique(puzzle.puzzle, rules=CLASSIC))
+        self.assertEqual(solution.grid_string(solution.solve(puzzle.puzzle, rules=CLASSIC)), puzzle.solution)
+        self.assertEqual(puzzle.clues, 81 - puzzle.puzzle.count('.'))
+        self.assertIn(puzzle.grade, generator.GRADE_NAMES)
+        # every remaining clue is needed
+        for i, ch in enumerate(puzzle.puzzle):
+            if ch != '.':
+                fewer = puzzle.puzzle[:i] + '.' + puzzle.puzzle[i + 1:]
+                self.assertEqual(solution.count_solutions(fewer, rules=CLASSIC), 2)
+
+    def test_grade(self):
+        hard = '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......'
+        name, depth = generator.grade(hard, CLASSIC)
+        self.assertIn(name, ('hard', 'expert'))
+        self.assertGreater(depth, 0)
+        grid = generator.random_solution(CLASSIC, random.Random(3))
+        self.assertEqual(generator.grade('.' + grid[1:], CLASSIC), ('easy', 0))
+
+    def test_generate_many(self):
+        puzzles = list(generator.generate_many(2, workers=1, seed=5, rules=CLASSIC))
+        self.assertEqual(len(puzzles), 2)
+        self.assertEqual(puzzles, list(generator.generate_many(2, workers=1, seed=5, rules=CLASSIC)))
+        pooled = list(generator.generate_many(2, workers=2, seed=5, rules=CLASSIC, chunksize=1))
+        self.assertEqual(pooled, puzzles)
+        for puzzle in pooled:
+            self.assertTrue(solution.is_unique(puzzle.puzzle, rules=CLASSIC))
+
+    def test_generate_many_grades_with_workers(self):
+        # which puzzles pass the filter doesn't depend on which worker finishes first
+        options = dict(seed=7, rules=CLASSIC, grades=['easy', 'medium'])
+        self.assertEqual(list(generator.generate_many(3, workers=3, chunksize=1, **options)),
+                         list(generator.generate_many(3, workers=1, **options)))
+
+    def test_caged(self):
+        cage = ['A1', 'A5', 'A9', 'E2', 'E4', 'E8', 'I3', 'I6', 'I7']
+        caged = get_rules(cages=[cage])
+        box_index = dict((box, i) for i, box in enumerate(solution.boxes))
+        for seed in range(3):
+            puzzle = generator.generate(caged, random.Random(seed))
+            self.assertEqual(sorted(puzzle.solution[box_index[box]] for box in cage), list('123456789'))
+            self.assertTrue(solution.is_unique(puzzle.puzzle, rules=caged))
+            self.assertEqual(solution.grid_string(solution.solve(puzzle.puzzle, rules=caged)), puzzle.solution)
+
+    def test_grades_filter(self):
+        for puzzle in generator.generate_many(2, workers=1, seed=7, rules=CLASSIC, grades=['easy']):
+            self.assertEqual(puzzle.grade, 'easy')
+
+
+if __name__ == '__main__':
+    unittest.main()
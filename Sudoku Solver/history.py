@@ -0,0 +1,173 @@
+"""
+A compact record of how a Sudoku was solved, for replaying it.
+
+History keeps the starting grid and every (box, old, new) change of the candidates made through
+solution.assign_value() and undone by an UndoTrail, as three arrays of small integers: a few bytes
+per change instead of a copy of the 81 boxes per solved box. Any frame can be rebuilt on demand,
+and replay() walks through all of them updating a single dictionary, which is what PySudoku.play
+and the text and JSON exporters below consume. Example:
+
+    history = History()
+    solution.solve(grid, recorder=history)
+    print(history.to_text())
+
+or from the command line, without pygame:
+
+    python history.py <grid> --json > trace.json
+"""
+import argparse
+import json
+import sys
+from array import array
+
+from rules import boxes
+
+DIGITS = '123456789'
+MASK_DIGITS = [''.join(d for i, d in enumerate(DIGITS) if mask >> i & 1) for mask in range(1 << len(DIGITS))]
+_BOX_INDEX = dict((box, i) for i, box in enumerate(boxes))
+_masks = {}
+
+
+def _mask(value):
+    """
+    Return the 9-bit mask of a string of candidates.
+    """
+    mask = _masks.get(value)
+    if mask is None:
+        mask = _masks[value] = sum(1 << DIGITS.index(d) for d in set(value))
+    return mask
+
+
+class History(object):
+    """
+    The starting grid and the changes of a solve.
+    Args:
+        values(dict): start recording from this grid, see start().
+    Attributes:
+        cells, old, new(array): the box index, the old candidates and the new candidates of every
+            change, the candidates as 9-bit masks.
+    """
+
+    def __init__(self, values=None):
+        self.initial = array('H', [(1 << len(DIGITS)) - 1] * len(boxes))
+        self.cells = array('B')
+        self.old = array('H')
+        self.new = array('H')
+        if values is not None:
+            self.start(values)
+
+    def start(self, values):
+        """
+        Forget the recorded changes and start again from a values dictionary.
+        """
+        self.initial = array('H', [_mask(values[box]) for box in boxes])
+        del self.cells[:], self.old[:], self.new[:]
+
+    def record(self, box, old, new):
+        """
+        Record that the candidates of box changed from old to new.
+        """
+        self.cells.append(_BOX_INDEX[box])
+        self.old.append(_mask(old))
+        self.new.append(_mask(new))
+
+    def __len__(self):
+        return len(self.cells)
+
+    def frames(self):
+        """
+        Return the positions worth showing: the start, then after every change that solved a box.
+        A position is the number of changes applied to the starting grid.
+        """
+        new = self.new
+        return [0] + [i + 1 for i in range(len(new)) if new[i] and not new[i] & (new[i] - 1)]
+
+    def state(self, position=None):
+        """
+        Rebuild the values dictionary after position changes, the end of the solve when None.
+        """
+        masks = list(self.initial)
+        cells, new = self.cells, self.new
+        for i in range(len(cells) if position is None else position):
+            masks[cells[i]] = new[i]
+        return dict((box, MASK_DIGITS[mask]) for box, mask in zip(boxes, masks))
+
+    def frame(self, i):
+        """
+        Rebuild the values dictionary of frame i, see frames().
+        """
+        return self.state(self.frames()[i])
+
+    def replay(self):
+        """
+        Yield the values of every frame in order. The same dictionary is yielded every time,
+        updated in place, so copy it to keep a frame.
+        """
+        values = dict((box, MASK_DIGITS[mask]) for box, mask in zip(boxes, self.initial))
+        yield values
+        for cell, new in zip(self.cells, self.new):
+            values[boxes[cell]] = MASK_DIGITS[new]
+            if new and not new & (new - 1):
+                yield values
+
+    @classmethod
+    def from_snapshots(cls, snapshots):
+        """
+        Build a History from a list of values dictionaries, like the global assignments list of
+        solution.py, recording the boxes that changed between consecutive snapshots.
+        """
+        history = cls()
+        last = None
+        for values in snapshots:
+            if last is None:
+                history.start(values)
+            else:
+                for box in boxes:
+                    if values[box] != last[box]:
+                        history.record(box, last[box], values[box])
+            last = values
+        return history
+
+    def to_dict(self):
+        """
+        Return the history as plain lists: the starting grid and [box, old, new] changes.
+        """
+        return {
+            'start': [MASK_DIGITS[mask] for mask in self.initial],
+            'changes': [[boxes[cell], MASK_DIGITS[old], MASK_DIGITS[new]]
+                        for cell, old, new in zip(self.cells, self.old, self.new)],
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+    def to_text(self):
+        """
+        Return every frame as a 9x9 grid of digits, '.' for the unsolved boxes, separated by blank
+        lines: an animated text trace of the solve.
+        """
+        frames = []
+        for values in self.replay():
+            frames.append('\n'.join(''.join(values[r + c] if len(values[r + c]) == 1 else '.' for c in DIGITS)
+                                    for r in 'ABCDEFGHI'))
+        return '\n\n'.join(frames) + '\n'
+
+
+def main(argv=None):
+    import solution
+    from rules import get_rules
+
+    parser = argparse.ArgumentParser(description='Solve a Sudoku and write the history of the solve.')
+    parser.add_argument('grid', help='the puzzle, 81 characters with . for the blanks')
+    parser.add_argument('--json', action='store_true', help='write the changes as JSON instead of text frames')
+    parser.add_argument('--classic', action='store_true', help='solve without the diagonal units')
+    args = parser.parse_args(argv)
+
+    history = History()
+    solution.solve(args.grid, rules=get_rules('classic' if args.classic else 'diagonal'), recorder=history)
+    sys.stdout.write(history.to_json() + '\n' if args.json else history.to_text())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import json
+import unittest
+
+import solution
+import solution_test
+from history import History
+from rules import CLASSIC
+
+
+class TestHistory(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+    hard_grid = '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......'
+
+    def test_record(self):
+        values = solution.grid_values(self.diagonal_grid)
+        history = History(values)
+        history.record('A2', '123456789', '6')
+        history.record('A3', '123456789', '12')
+        history.record('A3', '12', '123456789')
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history.frames(), [0, 1])
+        self.assertEqual(history.frame(0), values)
+        self.assertEqual(history.frame(1)['A2'], '6')
+        self.assertEqual(history.state(2)['A3'], '12')
+        self.assertEqual(history.state()['A3'], '123456789')
+        self.assertEqual(history.cells.itemsize, 1)
+
+    def test_solve(self):
+        for grid, rules in ((self.diagonal_grid, None), (self.hard_grid, CLASSIC)):
+            history = History()
+            result = solution.solve(grid, rules=rules, recorder=history)
+            self.assertEqual(history.state(0), solution.grid_values(grid))
+            self.assertEqual(history.state(), result)
+            frames = [dict(values) for values in history.replay()]
+            self.assertEqual(len(frames), len(history.frames()))
+            self.assertEqual(frames[-1], result)
+            self.assertEqual(frames[3], history.frame(3))
+
+    def test_undo_recorded(self):
+        # this grid needs backtracking, whose undos must be replayed too
+        grid = '85...24..72......9..4.........1.7..23.5...9...4...........8..7..17..........36.4.'
+        history = History()
+        solution.solve(grid, propagation='queue', rules=CLASSIC, recorder=history)
+        self.assertTrue(any(history.new[i] & ~history.old[i] for i in range(len(history))))
+        self.assertEqual(history.state(), solution.solve(grid, rules=CLASSIC))
+
+    def test_from_snapshots(self):
+        del solution.assignments[:]
+        solution.record_assignments = True
+        try:
+            result = solution.solve(self.diagonal_grid)
+        finally:
+            solution.record_assignments = False
+        history = History.from_snapshots(solution.assignments)
+        self.assertEqual(history.state(), solution.assignments[-1])
+        self.assertEqual(history.state(), result)
+        del solution.assignments[:]
+
+    def test_export(self):
+        history = History()
+        solution.solve(self.diagonal_grid, recorder=history)
+        exported = json.loads(history.to_json())
+        self.assertEqual(len(exported['changes']), len(history))
+        self.assertEqual(exported['start'][0], '2')
+        text = history.to_text().split('\n\n')
+        self.assertEqual(len(text), len(history.frames()))
+        self.assertEqual(''.join(text[-1].split()),
+                         solution.grid_string(solution_test.TestDiagonalSudoku.solved_diag_sudoku))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,261 @@
+"""
+Size-parametric Sudoku engine for 9x9, 16x16, 25x25, ... grids.
+
+A grid with n = box_size ** 2 digits per unit is a list of n * n integer candidate masks, like in
+bitboard.py but without its 9-bit lookup tables. Propagation is driven by a queue of the cells that
+lost candidates, and the next cell to branch on is taken from a heap of (candidates, cell) entries
+instead of scanning or sorting the whole grid, so the work per search node grows with the number of
+changes rather than with the size of the grid.
+
+Grids are strings of n * n characters using the first n symbols of SYMBOLS for the digits and '.'
+for the blanks, e.g. '1'-'9' and 'A'-'G' for 16x16. Whitespace is ignored.
+"""
+import heapq
+from collections import deque
+
+SYMBOLS = '123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+if hasattr(int, 'bit_count'):
+    popcount = int.bit_count
+else:
+    def popcount(mask):
+        return bin(mask).count('1')
+
+
+class GridRules(object):
+    """
+    Unit and peer index tables for a grid of box_size x box_size boxes.
+    Args:
+        box_size(int): the side of a box, 3 for 9x9, 4 for 16x16, 5 for 25x25.
+        diagonal(bool): add the two main diagonals as units.
+        units(list): use these tuples of cell indexes as the units instead of rows, columns,
+            boxes and diagonals, e.g. the unit_index of a rules.SudokuRules.
+        peers(list): the peers of every cell as a tuple of cell indexes, the cells that share a
+            unit with it when None. More peers than that add constraints that are not units, like
+            the peer_index of a rules.SudokuRules with cages.
+    """
+
+    def __init__(self, box_size=3, diagonal=False, units=None, peers=None):
+        n = box_size * box_size
+        if n > len(SYMBOLS):
+            raise ValueError('No symbols for a box size of {}'.format(box_size))
+        self.box_size = box_size
+        self.n = n
+        self.cells = n * n
+        self.symbols = SYMBOLS[:n]
+        self.digit_mask = dict((s, 1 << i) for i, s in enumerate(self.symbols))
+        self.all_digits = (1 << n) - 1
+
+        if units is None:
+            rows = [tuple(r * n + c for c in range(n)) for r in range(n)]
+            columns = [tuple(r * n + c for r in range(n)) for c in range(n)]
+            boxes = [tuple((br * box_size + r) * n + bc * box_size + c
+                           for r in range(box_size) for c in range(box_size))
+                     for br in range(box_size) for bc in range(box_size)]
+            units = rows + columns + boxes
+            if diagonal:
+                units = units + [tuple(i * n + i for i in range(n)),
+                                 tuple(i * n + n - 1 - i for i in range(n))]
+        self.units = [tuple(unit) for unit in units]
+
+        cell_units = [[] for _ in range(self.cells)]
+        for unit in self.units:
+            for cell in unit:
+                cell_units[cell].append(unit)
+        self.cell_units = [tuple(u) for u in cell_units]
+        if peers is None:
+            peers = [set(c for u in self.cell_units[cell] for c in u) - set([cell]) for cell in range(self.cells)]
+        self.peers = [tuple(sorted(p)) for p in peers]
+
+
+_cache = {}
+
+
+def get_rules(box_size=3, diagonal=False):
+    """
+    Return the GridRules for a box size, building its tables only the first time.
+    """
+    key = (box_size, bool(diagonal))
+    if key not in _cache:
+        _cache[key] = GridRules(box_size, diagonal)
+    return _cache[key]
+
+
+def from_sudoku_rules(sudoku_rules):
+    """
+    Return 9x9 GridRules with the same units and peers as a rules.SudokuRules, cages included,
+    building them only once.
+    """
+    if sudoku_rules not in _cache:
+        _cache[sudoku_rules] = GridRules(3, units=sudoku_rules.unit_index, peers=sudoku_rules.peer_index)
+    return _cache[sudoku_rules]
+
+
+def parse_grid(grid, rules):
+    """
+    Convert a grid string into a list of candidate masks, all digits for the blanks.
+    """
+    all_digits, digit_mask = rules.all_digits, rules.digit_mask
+    masks = [all_digits if ch == '.' else digit_mask[ch] for ch in grid
+             if ch == '.' or ch in digit_mask]
+    assert len(masks) == rules.cells
+    return masks
+
+
+def format_grid(masks, rules):
+    """
+    Convert a list of candidate masks back into a grid string, '.' for unsolved cells.
+    """
+    symbols = rules.symbols
+    return ''.join(symbols[mask.bit_length() - 1] if mask and not mask & (mask - 1) else '.'
+                   for mask in masks)
+
+
+def propagate(masks, rules, changed=None, heap=None):
+    """
+    Args:
+        masks(list): the candidate masks of the grid, updated in place
+        rules(GridRules): the units of the grid
+        changed(dict): maps the cells that lost candidates to the digits they lost. Every cell
+            that lacks some digits is visited with those when None.
+        heap(list): (candidates, cell) entries to push the new size of every changed cell on
+    Returns: True once no solved cell or hidden single is left to propagate, False as soon as a
+        cell runs out of candidates or a digit has no place left in a unit.
+    """
+    peers, cell_units = rules.peers, rules.cell_units
+    if changed is None:
+        # every cell starts out having lost the digits it lacks, the cells with all of them are
+        # not queued
+        all_digits = rules.all_digits
+        changed = dict((cell, all_digits & ~masks[cell]) for cell in range(rules.cells)
+                       if masks[cell] != all_digits)
+    lost = dict(changed)
+    queue = deque(lost)
+
+    while queue:
+        cell = queue.popleft()
+        removed = lost.pop(cell)
+        mask = masks[cell]
+
+        # a solved cell removes its digit from its peers
+        if not mask & (mask - 1):
+            for peer in peers[cell]:
+                if masks[peer] & mask:
+                    remaining = masks[peer] & ~mask
+                    if not remaining:
+                        return False
+                    masks[peer] = remaining
+                    if peer in lost:
+                        lost[peer] |= mask
+                    else:
+                        lost[peer] = mask
+                        queue.append(peer)
+                    if heap is not None:
+                        heapq.heappush(heap, (popcount(remaining), peer))
+
+        # a digit this cell lost may now fit in a single cell of one of its units
+        for unit in cell_units[cell]:
+            digits = removed
+            while digits:
+                digit = digits & -digits
+                digits ^= digit
+                place = -1
+                for c in unit:
+                    if masks[c] & digit:
+                        if place >= 0:
+                            place = -2
+                            break
+                        place = c
+                if place == -1:
+                    return False
+                if place >= 0 and masks[place] != digit:
+                    old = masks[place]
+                    masks[place] = digit
+                    if place in lost:
+                        lost[place] |= old & ~digit
+                    else:
+                        lost[place] = old & ~digit
+                        queue.append(place)
+    return True
+
+
+def _min_remaining(masks, heap):
+    """
+    Pop stale entries off the heap and return the unsolved cell with the fewest candidates,
+    or None when every cell is solved.
+    """
+    while heap:
+        count, cell = heap[0]
+        if count > 1 and popcount(masks[cell]) == count:
+            return cell
+        heapq.heappop(heap)
+    return None
+
+
+def search(masks, rules, heap, rng=None):
+    """
+    Args:
+        masks(list): propagated candidate masks
+        rules(GridRules): the units of the grid
+        heap(list): holds a (candidates, cell) entry for the current size of every unsolved cell
+        rng(random.Random): try the candidates of a cell in random order instead of lowest first
+    Returns: depth-first search over the cell with the fewest candidates, the solved masks or
+        False if there is no solution
+    """
+    cell = _min_remaining(masks, heap)
+    if cell is None:
+        return masks
+    if len(heap) > 4 * rules.cells:
+        # drop the stale entries before the heap gets copied into every branch
+        heap = [(popcount(mask), c) for c, mask in enumerate(masks) if mask & (mask - 1)]
+        heapq.heapify(heap)
+
+    mask = masks[cell]
+    digits = []
+    while mask:
+        digit = mask & -mask
+        mask ^= digit
+        digits.append(digit)
+    if rng is not None:
+        rng.shuffle(digits)
+
+    for digit in digits:
+        masks_try = masks[:]
+        heap_try = heap[:]
+        masks_try[cell] = digit
+        if propagate(masks_try, rules, {cell: masks[cell] & ~digit}, heap_try):
+            solve_try = search(masks_try, rules, heap_try, rng)
+            if solve_try:
+                return solve_try
+    return False
+
+
+def solve_masks(masks, rules, rng=None):
+    """
+    Propagate and search a list of candidate masks. Returns the solved masks or False.
+    """
+    if not propagate(masks, rules):
+        return False
+    heap = [(popcount(mask), cell) for cell, mask in enumerate(masks) if mask & (mask - 1)]
+    heapq.heapify(heap)
+    return search(masks, rules, heap, rng)
+
+
+def solve(grid, rules=None, rng=None):
+    """
+    Find the solution to a Sudoku grid of any size.
+    Args:
+        grid(string): the grid, e.g. 256 characters for 16x16.
+        rules(GridRules): the units of the grid, the plain rules for its size when None.
+        rng(random.Random): try candidates in random order, e.g. to fill an empty grid.
+    Returns:
+        The solved grid as a string, False if no solution exists.
+    """
+    if rules is None:
+        cells = sum(1 for ch in grid if not ch.isspace())
+        box_size = int(round(cells ** 0.25))
+        rules = get_rules(box_size)
+    masks = solve_masks(parse_grid(grid, rules), rules, rng)
+    if masks is False:
+        return False
+    return format_grid(masks, rules)
@@ -0,0 +1,49 @@
+import random
+import unittest
+
+import benchmark
+import nxn
+import solution
+import solution_test
+
+
+class TestNxN(unittest.TestCase):
+    classic_grid = '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......'
+
+    def assertValid(self, solved, rules):
+        for unit in rules.units:
+            self.assertEqual(sorted(solved[cell] for cell in unit), sorted(rules.symbols))
+
+    def test_tables(self):
+        rules = nxn.get_rules(4)
+        self.assertEqual((rules.n, rules.cells, len(rules.units)), (16, 256, 48))
+        self.assertEqual(len(rules.peers[0]), 3 * 15 - 2 * 3)
+        self.assertIs(nxn.get_rules(4), rules)
+
+    def test_round_trip(self):
+        rules = nxn.get_rules(3)
+        self.assertEqual(nxn.format_grid(nxn.parse_grid(self.classic_grid, rules), rules), self.classic_grid)
+
+    def test_classic(self):
+        self.assertEqual(nxn.solve(self.classic_grid),
+                         '417369825632158947958724316825437169791586432346912758289643571573291684164875293')
+
+    def test_diagonal(self):
+        self.assertEqual(solution.solve(solution_test.TestDiagonalSudoku.diagonal_grid, engine='nxn'),
+                         solution_test.TestDiagonalSudoku.solved_diag_sudoku)
+
+    def test_no_solution(self):
+        self.assertFalse(nxn.solve('22' + '.' * 79))
+
+    def test_larger_grids(self):
+        rng = random.Random(0)
+        for box_size in (4, 5):
+            rules = nxn.get_rules(box_size)
+            grid = benchmark.random_grid(rules, benchmark.CLUES[box_size], rng)
+            solved = nxn.solve(grid)
+            self.assertValid(solved, rules)
+            self.assertTrue(all(g in ('.', s) for g, s in zip(grid, solved)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+"""
+Packed binary storage for large Sudoku corpora.
+
+A packed file holds fixed size records of RECORD_SIZE bytes, one per grid, with 4 bits per box
+in row-major order: the high nibble of a byte is the even box and the low nibble the odd one,
+0 for a blank and 1-9 for a digit, and the last nibble of a record is unused. The file layout is
+
+    header   HEADER_SIZE bytes, see HEADER
+    records  count * RECORD_SIZE bytes
+    index    count little-endian uint32, the line of the text file each record was read from
+
+so record i starts at HEADER_SIZE + i * RECORD_SIZE and nothing has to be parsed to find it.
+PackedReader memory-maps a file and hands out memoryview slices of the records without copying
+them, which grid() turns into the string form of solution.grid_values() and masks() straight into
+the candidate masks of bitboard.py. Convert a text corpus with one puzzle per line with
+
+    python packed.py puzzles.txt puzzles.sdk
+    python packed.py --to-text puzzles.sdk > puzzles.txt
+"""
+import argparse
+import mmap
+import struct
+import sys
+from array import array
+
+from bitboard import ALL_DIGITS, DIGIT_MASK
+
+MAGIC = b'SDKP'
+VERSION = 1
+CELLS = 81
+RECORD_SIZE = (CELLS + 1) // 2
+# magic, version, cells per record, record size, record count, offset of the index
+HEADER = struct.Struct('<4sHHIQQ4x')
+HEADER_SIZE = HEADER.size
+
+# A record is the grid in hexadecimal with '0' for the blanks, so bytes.fromhex() packs it and
+# .hex() unpacks it without a Python loop over the boxes.
+_HEX_MASKS = dict(zip('0123456789abcdef', [ALL_DIGITS] + [DIGIT_MASK[d] for d in '123456789'] + [0] * 6))
+
+
+def encode(grid):
+    """
+    Pack a grid string of 81 digits, '.' or '0' for the blanks, into RECORD_SIZE bytes.
+    Raises ValueError for anything else.
+    """
+    grid = grid.strip()
+    if len(grid) != CELLS or grid.strip('.0123456789'):
+        raise ValueError('Not a grid: {!r}'.format(grid))
+    return bytes.fromhex(grid.replace('.', '0') + '0')
+
+
+def grid(record):
+    """
+    Unpack a record into a grid string with '.' for the blanks.
+    """
+    return record.hex()[:CELLS].replace('0', '.')
+
+
+def masks(record):
+    """
+    Unpack a record into the list of 81 candidate masks of bitboard.py.
+    """
+    return list(map(_HEX_MASKS.__getitem__, record.hex()[:CELLS]))
+
+
+def write(path, lines):
+    """
+    Write a packed file.
+    Args:
+        path(string): the file to write.
+        lines(iterable): grid strings, e.g. an open text file with one puzzle per line. Blank lines
+            and lines that are not grids are skipped, the index keeps the line of every grid.
+    Returns:
+        (written, skipped): the number of grids written and of non-blank lines skipped.
+    """
+    index = array('I')
+    skipped = 0
+    with open(path, 'wb') as f:
+        f.write(b'\0' * HEADER_SIZE)
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = encode(line)
+            except ValueError:
+                skipped += 1
+                continue
+            f.write(record)
+            index.append(number)
+        if sys.byteorder != 'little':
+            index.byteswap()
+        index.tofile(f)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, CELLS, RECORD_SIZE, len(index),
+                            HEADER_SIZE + len(index) * RECORD_SIZE))
+    return len(index), skipped
+
+
+def is_packed(path):
+    """
+    Return True if path starts like a packed file.
+    """
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class PackedReader(object):
+    """
+    Memory-mapped access to the records of a packed file.
+
+    reader[i] and iterating over the reader give memoryview slices of the mapped file; pass them to
+    grid() or masks(), or use grids() and all_masks(). Release the views that are kept before
+    closing the reader, the file cannot be unmapped while they exist. Raises ValueError if the
+    file is not a packed file of 9x9 grids.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError('Not a packed file: {}'.format(path))
+        if len(self._mmap) < HEADER_SIZE:
+            self.close()
+            raise ValueError('Not a packed file: {}'.format(path))
+        magic, version, cells, record_size, self.count, index_offset = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION or cells != CELLS or record_size != RECORD_SIZE or \
+                len(self._mmap) < index_offset + 4 * self.count:
+            self.close()
+            raise ValueError('Not a packed file: {}'.format(path))
+        self._view = memoryview(self._mmap)
+        self._index_offset = index_offset
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError('record out of range')
+        start = HEADER_SIZE + i * RECORD_SIZE
+        return self._view[start:start + RECORD_SIZE]
+
+    def __iter__(self):
+        view = self._view
+        for start in range(HEADER_SIZE, HEADER_SIZE + self.count * RECORD_SIZE, RECORD_SIZE):
+            yield view[start:start + RECORD_SIZE]
+
+    def line(self, i):
+        """
+        Return the line of the text file record i was converted from.
+        """
+        if not 0 <= i < self.count:
+            raise IndexError('record out of range')
+        return struct.unpack_from('<I', self._mmap, self._index_offset + 4 * i)[0]
+
+    def grids(self):
+        """
+        Yield every record as a grid string.
+        """
+        return map(grid, self)
+
+    def all_masks(self):
+        """
+        Yield every record as a list of bitboard masks.
+        """
+        return map(masks, self)
+
+    def close(self):
+        if getattr(self, '_view', None) is not None:
+            self._view.release()
+            self._view = None
+        if getattr(self, '_mmap', None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convert Sudoku puzzles between text and packed files.')
+    parser.add_argument('source', help='text file with one puzzle per line, - for stdin, or a packed file with --to-text')
+    parser.add_argument('target', nargs='?', help='packed file to write')
+    parser.add_argument('--to-text', action='store_true', help='write the grids of a packed file to stdout')
+    args = parser.parse_args(argv)
+
+    if args.to_text:
+        with PackedReader(args.source) as reader:
+            for text in reader.grids():
+                sys.stdout.write(text + '\n')
+        return 0
+    if not args.target:
+        parser.error('the packed file to write is required')
+    lines = sys.stdin if args.source == '-' else open(args.source)
+    try:
+        written, skipped = write(args.target, lines)
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+    sys.stderr.write('{} grids written, {} lines skipped\n'.format(written, skipped))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
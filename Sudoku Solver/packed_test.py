@@ -0,0 +1,71 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+import bitboard
+import packed
+import solve_puzzles
+import solution_test
+from rules import CLASSIC
+
+
+class TestPacked(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+    hard_grid = '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......'
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.sdk')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_encode(self):
+        record = packed.encode(self.hard_grid)
+        self.assertEqual(len(record), packed.RECORD_SIZE)
+        self.assertEqual(record[0], 0x40)
+        self.assertEqual(packed.grid(record), self.hard_grid)
+        self.assertEqual(packed.grid(packed.encode(self.hard_grid.replace('.', '0'))), self.hard_grid)
+        self.assertEqual(packed.masks(record), bitboard.grid_masks(self.hard_grid))
+        self.assertRaises(ValueError, packed.encode, self.hard_grid[1:])
+        self.assertRaises(ValueError, packed.encode, 'x' + self.hard_grid[1:])
+
+    def test_read_write(self):
+        lines = [self.diagonal_grid + '\n', '\n', 'not a puzzle\n', self.hard_grid + '\n']
+        self.assertEqual(packed.write(self.path, lines), (2, 1))
+        self.assertEqual(os.path.getsize(self.path), packed.HEADER_SIZE + 2 * (packed.RECORD_SIZE + 4))
+        self.assertTrue(packed.is_packed(self.path))
+        with packed.PackedReader(self.path) as reader:
+            self.assertEqual(len(reader), 2)
+            self.assertEqual(list(reader.grids()), [self.diagonal_grid, self.hard_grid])
+            self.assertEqual([reader.line(0), reader.line(1)], [1, 4])
+            view = reader[-1]
+            self.assertIsInstance(view, memoryview)
+            self.assertEqual(packed.grid(view), self.hard_grid)
+            view.release()
+            masks = list(reader.all_masks())[1]
+            self.assertTrue(bitboard.search(masks, CLASSIC))
+            self.assertRaises(IndexError, reader.__getitem__, 2)
+
+    def test_not_packed(self):
+        with open(self.path, 'w') as f:
+            f.write(self.hard_grid + '\n')
+        self.assertFalse(packed.is_packed(self.path))
+        self.assertRaises(ValueError, packed.PackedReader, self.path)
+
+    def test_solve_puzzles(self):
+        packed.write(self.path, ['\n', self.diagonal_grid])
+        stdout, stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = io.StringIO(), io.StringIO()
+        try:
+            solve_puzzles.main([self.path])
+            rows = [line.split('\t') for line in sys.stdout.getvalue().splitlines()]
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+        self.assertEqual([(row[0], row[1]) for row in rows], [('2', 'solved')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import solution
+import solution_test
+import unittest
+
+
+class TestQueuePropagation(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+
+    def test_matches_reduce_puzzle(self):
+        swept = solution.reduce_puzzle(solution.grid_values(self.diagonal_grid))
+        queued = solution.propagate(solution.grid_values(self.diagonal_grid))
+        # The queue applies the same strategies, so it reaches at least the sweep's fixed point
+        for box in solution.boxes:
+            self.assertTrue(set(queued[box]) <= set(swept[box]))
+
+    def test_solve(self):
+        self.assertEqual(solution.solve(self.diagonal_grid, propagation='queue'),
+                         solution_test.TestDiagonalSudoku.solved_diag_sudoku)
+
+    def test_contradiction(self):
+        # Two 2s in the first row
+        self.assertFalse(solution.propagate(solution.grid_values('22' + '.' * 79)))
+
+    def test_only_changed_boxes(self):
+        values = solution.propagate(solution.grid_values(self.diagonal_grid))
+        unchanged = values.copy()
+        self.assertEqual(solution.propagate(values, changed=[]), unchanged)
+
+
+if __name__ == '__main__':
+    unittest.main()
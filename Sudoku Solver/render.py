@@ -0,0 +1,164 @@
+"""
+Draw Sudoku boards with pygame, on screen for PySudoku.play or off screen to image files.
+
+BoardRenderer draws onto any pygame surface, keeps one pre-rendered tile per digit and one for an
+empty box, and only redraws the boxes that changed since the last frame. Off screen it needs no
+display at all, so solve animations can be rendered on a server, e.g.
+
+    python render.py <grid> --gif solve.gif
+    python render.py <grid> --png-dir frames
+
+PNG frames are written by pygame itself, GIFs need Pillow as well.
+"""
+import argparse
+import os
+import sys
+
+import pygame
+
+from objects.SudokuSquare import AAfilledRoundedRect
+
+ROWS = 'ABCDEFGHI'
+DIGITS = '123456789'
+SIZE = (700, 700)
+BACKGROUND = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'images', 'sudoku-board-bare.jpg')
+
+# The look of SudokuSquare: a rounded box, teal with a white digit when solved, white when not
+TILE_SIZE = (45, 40)
+SOLVED_COLOR = (2, 204, 186)
+EMPTY_COLOR = (255, 255, 255)
+TEXT_COLOR = (255, 255, 255)
+TEXT_OFFSET = (17, 4)
+
+
+def box_position(x, y):
+    """
+    Return the top left corner of the box in column x and row y, both 0-8, on the board image.
+    """
+    return x * 57 + (38, 99, 159)[x // 3], y * 57 + (35, 100, 165)[y // 3]
+
+
+class BoardRenderer(object):
+    """
+    Draws the values of a board onto a surface.
+    Args:
+        surface(Surface): where to draw, a new off screen surface of SIZE when None.
+        background(string): the image of the empty board.
+    Attributes:
+        surface(Surface): the drawn board.
+        drawn(int): the number of boxes drawn since the renderer was made.
+    """
+
+    def __init__(self, surface=None, background=BACKGROUND):
+        if not pygame.font.get_init():
+            pygame.font.init()
+        self.surface = surface if surface is not None else pygame.Surface(SIZE)
+        self.background = pygame.image.load(background)
+        self.surface.blit(self.background, (0, 0))
+
+        font = pygame.font.SysFont('opensans', 21)
+        self.tiles = {'': self._tile(EMPTY_COLOR)}
+        for digit in DIGITS:
+            self.tiles[digit] = self._tile(SOLVED_COLOR, font.render(digit, 1, TEXT_COLOR))
+
+        self.rects = [pygame.Rect(box_position(x, y), TILE_SIZE) for y in range(9) for x in range(9)]
+        self.boxes = [r + c for r in ROWS for c in DIGITS]
+        self.shown = [None] * len(self.boxes)
+        self.drawn = 0
+
+    def _tile(self, color, text=None):
+        tile = pygame.Surface(TILE_SIZE, pygame.SRCALPHA)
+        AAfilledRoundedRect(tile, ((0, 0), TILE_SIZE), color)
+        if text is not None:
+            tile.blit(text, TEXT_OFFSET)
+        return tile
+
+    def draw(self, values):
+        """
+        Draw a values dictionary, only the boxes that changed since the last call.
+        Returns: the list of rects that were drawn, e.g. for pygame.display.update().
+        """
+        changed = []
+        for i, box in enumerate(self.boxes):
+            value = values[box]
+            digit = value if len(value) == 1 and value != '.' else ''
+            if self.shown[i] != digit:
+                rect = self.rects[i]
+                self.surface.blit(self.background, rect, rect)
+                self.surface.blit(self.tiles[digit], rect)
+                self.shown[i] = digit
+                changed.append(rect)
+        self.drawn += len(changed)
+        return changed
+
+    def save(self, path):
+        """
+        Write the board to an image file, PNG for a .png path.
+        """
+        pygame.image.save(self.surface, path)
+
+
+def write_png_frames(frames, directory, renderer=None):
+    """
+    Draw every values dictionary of frames and save it as directory/frame-00000.png, ...
+    Returns: the number of frames written.
+    """
+    renderer = renderer or BoardRenderer()
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    count = 0
+    for values in frames:
+        renderer.draw(values)
+        renderer.save(os.path.join(directory, 'frame-{:05d}.png'.format(count)))
+        count += 1
+    return count
+
+
+def write_gif(frames, path, duration=200, renderer=None):
+    """
+    Draw every values dictionary of frames into an animated GIF, duration milliseconds per frame.
+    Needs Pillow. Returns: the number of frames written.
+    """
+    from PIL import Image
+
+    renderer = renderer or BoardRenderer()
+    images = []
+    for values in frames:
+        renderer.draw(values)
+        image = Image.frombytes('RGB', renderer.surface.get_size(),
+                                pygame.image.tostring(renderer.surface, 'RGB'))
+        # every frame shares the palette of the first one, which has all the colors of the board
+        images.append(image.quantize(palette=images[0]) if images else image.quantize())
+    if images:
+        images[0].save(path, save_all=True, append_images=images[1:], duration=duration, loop=0)
+    return len(images)
+
+
+def main(argv=None):
+    import solution
+    from history import History
+    from rules import get_rules
+
+    parser = argparse.ArgumentParser(description='Render the solve of a Sudoku to image files.')
+    parser.add_argument('grid', help='the puzzle, 81 characters with . for the blanks')
+    parser.add_argument('--gif', help='write an animated GIF to this path')
+    parser.add_argument('--png-dir', help='write one PNG per frame to this directory')
+    parser.add_argument('--duration', type=int, default=200, help='milliseconds per GIF frame (default: 200)')
+    parser.add_argument('--classic', action='store_true', help='solve without the diagonal units')
+    args = parser.parse_args(argv)
+    if not args.gif and not args.png_dir:
+        parser.error('give --gif or --png-dir')
+
+    history = History()
+    solution.solve(args.grid, rules=get_rules('classic' if args.classic else 'diagonal'), recorder=history)
+    if args.png_dir:
+        count = write_png_frames(history.replay(), args.png_dir)
+        sys.stderr.write('{} frames written to {}\n'.format(count, args.png_dir))
+    if args.gif:
+        count = write_gif(history.replay(), args.gif, args.duration)
+        sys.stderr.write('{} frames written to {}\n'.format(count, args.gif))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import itertools
+import os
+import shutil
+import tempfile
+import unittest
+
+import solution
+import solution_test
+from history import History
+
+try:
+    import render
+except ImportError:
+    render = None
+
+try:
+    import PIL
+except ImportError:
+    PIL = None
+
+
+@unittest.skipIf(render is None, 'pygame is not installed')
+class TestBoardRenderer(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.history = History()
+        solution.solve(self.diagonal_grid, recorder=self.history)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_draw_changes(self):
+        renderer = render.BoardRenderer()
+        values = solution.grid_values(self.diagonal_grid)
+        self.assertEqual(len(renderer.draw(values)), 81)
+        self.assertEqual(renderer.draw(values), [])
+        values['A2'] = '6'
+        self.assertEqual(renderer.draw(values), [renderer.rects[1]])
+        self.assertEqual(renderer.drawn, 82)
+
+    def test_tiles(self):
+        renderer = render.BoardRenderer()
+        self.assertEqual(sorted(renderer.tiles), [''] + list('123456789'))
+        renderer.draw(solution_test.TestDiagonalSudoku.solved_diag_sudoku)
+        x, y = render.box_position(0, 0)
+        self.assertEqual(tuple(renderer.surface.get_at((x + 22, y + 35)))[:3], render.SOLVED_COLOR)
+
+    def test_png_frames(self):
+        count = render.write_png_frames(itertools.islice(self.history.replay(), 3), self.directory)
+        self.assertEqual(count, 3)
+        self.assertEqual(sorted(os.listdir(self.directory))[0], 'frame-00000.png')
+        self.assertEqual(len(os.listdir(self.directory)), count)
+
+    @unittest.skipIf(PIL is None, 'Pillow is not installed')
+    def test_gif(self):
+        path = os.path.join(self.directory, 'solve.gif')
+        count = render.write_gif(self.history.replay(), path)
+        from PIL import Image
+        image = Image.open(path)
+        self.assertEqual(image.size, render.SIZE)
+        self.assertEqual(image.n_frames, count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Unit and peer tables for the Sudoku variants the solver understands.
+
+A SudokuRules object precomputes everything the propagation strategies look up, by box name for
+solution.py and by box index for bitboard.py, so switching between variants does not rebuild
+anything at solve time. get_rules() builds each variant once and hands out the same object after
+that, e.g.
+
+    solution.solve(grid, rules=get_rules('windoku'))
+    solution.solve(grid, rules=get_rules(cages=[['A1', 'A2', 'B1'], ...]))
+"""
+
+rows = 'ABCDEFGHI'
+columns = '123456789'
+boxes = [r + c for r in rows for c in columns]
+
+row_units = [[r + c for c in columns] for r in rows]
+column_units = [[r + c for r in rows] for c in columns]
+square_units = [[r + c for r in rs for c in cs] for rs in ('ABC', 'DEF', 'GHI') for cs in ('123', '456', '789')]
+diagonal_units = [[rows[i] + columns[i] for i in range(len(rows))],
+                  [rows[i] + columns[::-1][i] for i in range(len(rows))]]
+# The four extra 3x3 windows of Windoku
+windoku_units = [[r + c for r in rs for c in cs] for rs in ('BCD', 'FGH') for cs in ('234', '678')]
+
+
+class SudokuRules(object):
+    """
+    The units of a Sudoku variant and the tables derived from them.
+    Args:
+        diagonal(bool): add the two main diagonals as units.
+        extra_units(list): more units of 9 boxes that must hold every digit once, e.g. windoku_units.
+        cages(list): groups of boxes that must hold different digits, like the cages of Killer
+            Sudoku. They only add peers, the cage sums are not checked.
+    Attributes:
+        unit_list, units, peers: the same tables solution.py used to keep as globals.
+        group_list: the units and the cages, every group of boxes that must hold different digits.
+        unit_index, peer_index: the units and the peers of each box as tuples of box indexes.
+        group_index: the groups of group_list as tuples of box indexes.
+    """
+
+    def __init__(self, diagonal=False, extra_units=(), cages=()):
+        self.diagonal = diagonal
+        self.extra_units = _check_groups(extra_units, 'unit', len(columns))
+        self.cages = _check_groups(cages, 'cage')
+        self.unit_list = row_units + column_units + square_units
+        if diagonal:
+            self.unit_list = self.unit_list + diagonal_units
+        self.unit_list = self.unit_list + [list(unit) for unit in self.extra_units]
+        self.group_list = self.unit_list + [list(cage) for cage in self.cages]
+        self.units = dict((s, [u for u in self.unit_list if s in u]) for s in boxes)
+        self.peers = dict((s, set(sum(self.units[s], [])) - set([s])) for s in boxes)
+        for cage in self.cages:
+            for box in cage:
+                self.peers[box].update(b for b in cage if b != box)
+
+        box_index = dict((box, i) for i, box in enumerate(boxes))
+        self.unit_index = [tuple(box_index[box] for box in unit) for unit in self.unit_list]
+        self.group_index = [tuple(box_index[box] for box in group) for group in self.group_list]
+        self.peer_index = [tuple(sorted(box_index[peer] for peer in self.peers[box])) for box in boxes]
+
+    def __repr__(self):
+        return 'SudokuRules(diagonal={!r}, extra_units={!r}, cages={!r})'.format(
+            self.diagonal, [list(u) for u in self.extra_units], [list(c) for c in self.cages])
+
+
+def _check_groups(groups, kind, size=None):
+    """
+    Return groups as a sorted tuple of sorted tuples of boxes, raising ValueError for unknown boxes,
+    repeated boxes or a group of the wrong size.
+    """
+    checked = []
+    for group in groups:
+        group = tuple(sorted(group))
+        if not set(group) <= set(boxes) or len(set(group)) != len(group):
+            raise ValueError('Invalid {}: {}'.format(kind, list(group)))
+        if size is not None and len(group) != size:
+            raise ValueError('A {} needs {} boxes: {}'.format(kind, size, list(group)))
+        checked.append(group)
+    return tuple(sorted(checked))
+
+
+_cache = {}
+
+
+def get_rules(variant=None, diagonal=False, extra_units=(), cages=()):
+    """
+    Return the SudokuRules for a variant, building its tables only the first time it is asked for.
+    Args:
+        variant(string): one of the names in VARIANTS, or None to describe the variant with the
+            other arguments, which are the same as for SudokuRules.
+    """
+    if variant is not None:
+        if variant not in VARIANTS:
+            raise ValueError('Unknown variant: {}'.format(variant))
+        return VARIANTS[variant]
+    key = (bool(diagonal), _check_groups(extra_units, 'unit', len(columns)), _check_groups(cages, 'cage'))
+    if key not in _cache:
+        _cache[key] = SudokuRules(*key)
+    return _cache[key]
+
+
+CLASSIC = get_rules()
+DIAGONAL = get_rules(diagonal=True)
+WINDOKU = get_rules(extra_units=windoku_units)
+
+VARIANTS = {
+    'classic': CLASSIC,
+    'diagonal': DIAGONAL,
+    'windoku': WINDOKU,
+}
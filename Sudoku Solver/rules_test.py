@@ -0,0 +1,65 @@
+import bitboard
+import rules
+import solution
+import unittest
+
+
+class TestSudokuRules(unittest.TestCase):
+    classic_grid = '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......'
+
+    def test_tables(self):
+        self.assertEqual(len(rules.CLASSIC.unit_list), 27)
+        self.assertEqual(len(rules.DIAGONAL.unit_list), 29)
+        self.assertEqual(len(rules.CLASSIC.peers['E5']), 20)
+        self.assertEqual(len(rules.DIAGONAL.peers['E5']), 32)
+        self.assertEqual(rules.DIAGONAL.peer_index[40], tuple(sorted(
+            bitboard.BOX_INDEX[peer] for peer in rules.DIAGONAL.peers['E5'])))
+
+    def test_default_rules(self):
+        self.assertIs(solution.peers, solution.default_rules.peers)
+        self.assertIs(solution.default_rules, rules.DIAGONAL)
+
+    def test_classic(self):
+        expected = '417369825632158947958724316825437169791586432346912758289643571573291684164875293'
+        for engine in ('strings', 'bitboard'):
+            values = solution.solve(self.classic_grid, engine=engine, rules=rules.CLASSIC)
+            self.assertEqual(solution.grid_string(values), expected)
+        # The solution breaks the diagonal units
+        self.assertFalse(solution.solve(self.classic_grid, engine='bitboard', rules=rules.DIAGONAL))
+
+    def test_get_rules_cached(self):
+        self.assertIs(rules.get_rules(), rules.CLASSIC)
+        self.assertIs(rules.get_rules('diagonal'), rules.DIAGONAL)
+        self.assertIs(rules.get_rules(extra_units=reversed(rules.windoku_units)), rules.WINDOKU)
+        cage = ['A2', 'A1', 'B1']
+        self.assertIs(rules.get_rules(cages=[cage]), rules.get_rules(cages=[sorted(cage)]))
+        self.assertRaises(ValueError, rules.get_rules, 'killer')
+        self.assertRaises(ValueError, rules.get_rules, extra_units=[['A1', 'A2']])
+        self.assertRaises(ValueError, rules.get_rules, cages=[['A1', 'A1']])
+
+    def test_cages(self):
+        caged = rules.get_rules(cages=[['A1', 'E5']])
+        self.assertIn('E5', caged.peers['A1'])
+        self.assertNotIn('E5', rules.CLASSIC.peers['A1'])
+        self.assertEqual(len(caged.unit_list), 27)
+
+    def test_cages_every_engine(self):
+        # a cage of 9 boxes spread over 3 rows, 3 columns and 3 squares
+        cage = ['A1', 'A5', 'A9', 'E2', 'E4', 'E8', 'I3', 'I6', 'I7']
+        caged = rules.get_rules(cages=[cage])
+        grid = '.' * 36 + '123456789' + '.' * 36
+        for engine in ('strings', 'bitboard', 'nxn', 'dlx'):
+            values = solution.solve(grid, engine=engine, rules=caged)
+            self.assertEqual(sorted(values[box] for box in cage), list('123456789'), engine)
+            for unit in caged.unit_list:
+                self.assertEqual(sorted(values[box] for box in unit), list('123456789'), engine)
+
+    def test_windoku(self):
+        for engine in ('strings', 'bitboard'):
+            values = solution.solve('.' * 81, engine=engine, rules=rules.WINDOKU)
+            for unit in rules.WINDOKU.unit_list:
+                self.assertEqual(sorted(values[box] for box in unit), list('123456789'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import solution
+import solution_test
+import time
+import unittest
+from rules import CLASSIC
+from stats import SolveStats
+
+
+class TestUndoTrail(unittest.TestCase):
+
+    def test_undo(self):
+        values = {'A1': '123', 'A2': '45'}
+        trail = solution.UndoTrail()
+        mark = trail.mark()
+        solution.assign_value(values, 'A1', '1', trail)
+        solution.assign_value(values, 'A2', '4', trail)
+        self.assertEqual(values, {'A1': '1', 'A2': '4'})
+        trail.undo(values, mark)
+        self.assertEqual(values, {'A1': '123', 'A2': '45'})
+        self.assertEqual(trail.changes, [])
+
+    def test_history_callback(self):
+        recorded = []
+        values = {'A1': '123'}
+        trail = solution.UndoTrail(history=lambda v, box, value: recorded.append((box, value)))
+        solution.assign_value(values, 'A1', '12', trail)
+        solution.assign_value(values, 'A1', '2', trail)
+        self.assertEqual(recorded, [('A1', '2')])
+
+
+class TestTrailSearch(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+
+    def test_solve(self):
+        for propagation in ('sweep', 'queue'):
+            result = solution.solve(self.diagonal_grid, propagation=propagation, trail=True)
+            self.assertEqual(result, solution_test.TestDiagonalSudoku.solved_diag_sudoku)
+
+    def test_no_global_history(self):
+        del solution.assignments[:]
+        solution.solve(self.diagonal_grid, trail=True)
+        self.assertEqual(solution.assignments, [])
+
+    def test_streamed_history(self):
+        recorded = []
+        solution.solve(self.diagonal_grid, trail=True, history=lambda v, box, value: recorded.append(box))
+        self.assertTrue(recorded)
+        self.assertTrue(set(recorded) <= set(solution.boxes))
+
+    def test_no_solution(self):
+        self.assertFalse(solution.solve('22' + '.' * 79, trail=True))
+
+
+class TestSolver(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+
+    def test_own_history(self):
+        del solution.assignments[:]
+        solver = solution.Solver(record_history=True)
+        self.assertEqual(solver.solve(self.diagonal_grid), solution_test.TestDiagonalSudoku.solved_diag_sudoku)
+        self.assertTrue(len(solver.history))
+        self.assertEqual(solver.history.state(), solution_test.TestDiagonalSudoku.solved_diag_sudoku)
+        self.assertEqual(solution.assignments, [])
+
+
+class TestCountSolutions(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+
+    def test_unique(self):
+        for propagation in ('sweep', 'queue'):
+            self.assertEqual(solution.count_solutions(self.diagonal_grid, propagation=propagation), 1)
+            self.assertTrue(solution.is_unique(self.diagonal_grid, propagation=propagation))
+
+    def test_limit(self):
+        # without the diagonals the same clues leave many solutions
+        stats = SolveStats()
+        self.assertEqual(solution.count_solutions(self.diagonal_grid, 5, rules=CLASSIC, stats=stats), 5)
+        self.assertFalse(solution.is_unique(self.diagonal_grid, rules=CLASSIC))
+        self.assertGreater(stats.nodes, 5)
+        self.assertEqual(solution.count_solutions('.' * 81, limit=3), 3)
+
+    def test_no_solution(self):
+        self.assertEqual(solution.count_solutions('22' + '.' * 79), 0)
+        self.assertFalse(solution.is_unique('22' + '.' * 79))
+
+
+class TestSearchBudget(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+    # no solution, but it takes the search many seconds to find that out
+    slow_grid = '.....5.8....6.1.43..........1.5........1.6...3.......553.....61........4.........'
+
+    def test_max_nodes(self):
+        stats = SolveStats(self.slow_grid)
+        with self.assertRaises(solution.SearchAborted) as raised:
+            solution.solve(self.slow_grid, propagation='queue', trail=True, rules=CLASSIC, stats=stats,
+                           max_nodes=50, keep_best=True)
+        self.assertIs(raised.exception.stats, stats)
+        self.assertTrue(stats.aborted)
+        self.assertEqual(stats.abort_reason, 'nodes')
+        self.assertFalse(stats.solved)
+        self.assertEqual(stats.nodes, 50)
+        # the best grid is a reduced copy, not the values the search left behind
+        best = raised.exception.values
+        self.assertEqual(len(best), 81)
+        self.assertLess(sum(map(len, best.values())), sum(map(len, solution.grid_values(self.slow_grid).values())))
+        self.assertTrue(all(best[box] == d for box, d in zip(solution.boxes, self.slow_grid) if d != '.'))
+        # and it was recorded after propagation: reducing it again changes nothing
+        self.assertEqual(solution.propagate(best.copy(), rules=CLASSIC), best)
+
+    def test_deadline(self):
+        start = time.time()
+        with self.assertRaises(solution.SearchAborted) as raised:
+            solution.solve(self.slow_grid, rules=CLASSIC, deadline=start + 0.1)
+        self.assertLess(time.time() - start, 1)
+        # the best grid is only kept on request
+        self.assertIsNone(raised.exception.values)
+        # the stats are collected even when none were given
+        stats = raised.exception.stats
+        self.assertEqual(stats.abort_reason, 'deadline')
+        self.assertGreater(stats.nodes, 0)
+        self.assertEqual(stats.to_dict()['abort_reason'], 'deadline')
+
+    def test_best_is_reduced(self):
+        budget = solution.SearchBudget(max_nodes=1, keep_best=True)
+        with self.assertRaises(solution.SearchAborted):
+            solution.solve(self.slow_grid, rules=CLASSIC, abort=budget)
+        # the first node was reduced before the second one stopped the search
+        reduced = solution.reduce_puzzle(solution.grid_values(self.slow_grid), rules=CLASSIC)
+        self.assertEqual(budget.best, reduced)
+        self.assertIsNone(solution.SearchBudget(max_nodes=1).best)
+
+    def test_within_budget(self):
+        budget = solution.SearchBudget(max_nodes=1000, deadline=time.time() + 60)
+        values = solution.solve(self.diagonal_grid, trail=True, abort=budget)
+        self.assertEqual(values, solution_test.TestDiagonalSudoku.solved_diag_sudoku)
+        self.assertIsNone(budget.reason)
+        self.assertGreater(budget.nodes, 0)
+        self.assertEqual(solution.solve(self.diagonal_grid, max_nodes=1000), values)
+
+    def test_abort_reason(self):
+        budget = solution.SearchBudget(abort=lambda values: True)
+        with self.assertRaises(solution.SearchAborted):
+            solution.solve(self.diagonal_grid, abort=budget)
+        self.assertEqual(budget.reason, 'abort')
+        with self.assertRaises(solution.SearchAborted) as raised:
+            solution.solve(self.diagonal_grid, abort=lambda values: True)
+        self.assertEqual(raised.exception.stats.abort_reason, 'abort')
+        # stopped before the first node was counted
+        self.assertEqual(raised.exception.stats.nodes, 0)
+
+    def test_engine_without_budget(self):
+        for engine in ('bitboard', 'nxn', 'dlx'):
+            with self.assertRaises(ValueError):
+                solution.solve(self.diagonal_grid, engine=engine, max_nodes=1000)
+            with self.assertRaises(ValueError):
+                solution.solve(self.diagonal_grid, engine=engine, abort=lambda values: False)
+
+
+if __name__ == '__main__':
+    unittest.main()
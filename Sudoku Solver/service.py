@@ -0,0 +1,322 @@
+"""
+An asyncio service that solves Sudoku grids for clients on the same machine.
+
+Clients connect over TCP to localhost and send one request per line, either a bare grid string or
+a JSON object {"id": ..., "grid": ..., "timeout": seconds}, and get one JSON line back per request:
+
+    {"id": 1, "status": "solved", "grid": "4173698...", "seconds": 0.004}
+
+where status is 'solved', 'unsolvable', 'invalid' or 'timeout'. Answers are written as soon as they
+are ready, so the answers to pipelined requests may come back out of order: match them by id.
+
+The event loop never solves anything itself. Requests that arrive within batch_delay of each other
+are coalesced into micro-batches of at most batch_size grids, and every batch is solved in one call
+to a worker of a ProcessPoolExecutor. At most max_pending requests are accepted at a time; beyond
+that the service stops reading from its clients until one is answered, which pushes back on them
+through TCP. A request that times out, or whose client goes away, is cancelled in its worker too:
+each request owns a flag in shared memory that the search checks on every node along with the
+deadline of the request, see solution.SearchBudget. Example:
+
+    python service.py --port 8765 --workers 4 --classic
+    echo '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......' | nc -q 5 localhost 8765
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import solution
+from rules import get_rules
+
+# The cancel flags and the solve options of the current worker process, see _init_worker
+_worker_cancel = None
+_worker_options = None
+
+
+def _init_worker(cancel, options):
+    global _worker_cancel, _worker_options
+    _worker_cancel = cancel
+    _worker_options = options
+
+
+def _solve_batch(items):
+    """
+    Solve a batch of (slot, grid, deadline) requests in a worker process. A request is abandoned
+    as soon as its cancel flag is set or time.time() passes its deadline.
+    Returns: a list of (status, solved grid or None, seconds), one per request.
+    """
+    results = []
+    for slot, grid, deadline in items:
+        def cancelled(values, slot=slot):
+            return _worker_cancel[slot]
+
+        start = time.perf_counter()
+        solved = None
+        if _worker_cancel[slot] or time.time() > deadline:
+            status = 'timeout'
+        else:
+            try:
+                values = solution.solve(grid, trail=True, abort=cancelled, deadline=deadline, **_worker_options)
+            except solution.SearchAborted:
+                status = 'timeout'
+            except AssertionError:
+                # grid_values() rejects grids that don't have 81 boxes
+                status = 'invalid'
+            else:
+                status = 'solved' if values else 'unsolvable'
+                solved = solution.grid_string(values) if values else None
+        results.append((status, solved, time.perf_counter() - start))
+    return results
+
+
+def parse_request(line):
+    """
+    Read a request line: a JSON object with a 'grid' and optionally an 'id' and a 'timeout', or a
+    bare grid string. Raises ValueError if it is neither.
+    Returns: the request as a dictionary.
+    """
+    line = line.strip()
+    if not line.startswith('{'):
+        return {'grid': line}
+    request = json.loads(line)
+    if not isinstance(request, dict) or not isinstance(request.get('grid'), str):
+        raise ValueError('A request needs a grid')
+    timeout = request.get('timeout')
+    if timeout is not None and (not isinstance(timeout, (int, float)) or timeout <= 0):
+        raise ValueError('The timeout must be a positive number of seconds')
+    return request
+
+
+class SolveService(object):
+    """
+    Solves grids in micro-batches across a process pool for asyncio clients.
+    Args:
+        workers(int): number of worker processes, os.cpu_count() when None.
+        batch_size(int): the most grids sent to a worker at once.
+        batch_delay(float): seconds to wait for more requests after the first one of a batch.
+        max_pending(int): the most requests accepted and not answered yet, see handle().
+        timeout(float): seconds before a request is answered with 'timeout' when it doesn't give one.
+        rules(SudokuRules): the variant to solve, solution.default_rules when None.
+        propagation(string): 'queue' or 'sweep', see solution.search().
+    Attributes:
+        requests, batches, cancelled(int): the requests received, the batches sent to the workers
+            and the requests cancelled after a timeout or a disconnect.
+    """
+
+    def __init__(self, workers=None, batch_size=16, batch_delay=0.002, max_pending=256, timeout=10.,
+                 rules=None, propagation='queue'):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.options = {'rules': rules, 'propagation': propagation}
+        self.requests = self.batches = self.cancelled = 0
+        # One cancel flag per pending request, read by the workers on every search node
+        self._cancel = multiprocessing.get_context('spawn').RawArray('b', max_pending)
+        self._free = list(range(max_pending))
+        self._executor = None
+
+    async def start(self):
+        """
+        Start the worker processes and the batching task, from inside the event loop.
+        """
+        # spawned rather than forked, so the workers don't hold on to the sockets of the clients
+        workers = self.workers or multiprocessing.cpu_count()
+        self._executor = ProcessPoolExecutor(workers, multiprocessing.get_context('spawn'),
+                                             initializer=_init_worker, initargs=(self._cancel, self.options))
+        # wait for the workers to start, so the first requests don't spend their timeout on it
+        loop = asyncio.get_event_loop()
+        await asyncio.gather(*[loop.run_in_executor(self._executor, _solve_batch, []) for _ in range(workers)])
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._dispatched = set()
+        self._batcher = asyncio.ensure_future(self._collect())
+
+    async def close(self):
+        """
+        Cancel every pending request and stop the workers.
+        """
+        self._batcher.cancel()
+        for slot in range(self.max_pending):
+            self._cancel[slot] = 1
+        if self._dispatched:
+            await asyncio.wait(self._dispatched)
+        await asyncio.get_event_loop().run_in_executor(None, self._executor.shutdown)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def pending(self):
+        """
+        The number of requests accepted and not finished by the workers yet.
+        """
+        return self.max_pending - len(self._free)
+
+    async def solve(self, grid, timeout=None):
+        """
+        Solve a grid in the worker processes, waiting while max_pending requests are already pending.
+        Args:
+            grid(string): the grid in the string form accepted by solution.grid_values().
+            timeout(float): seconds to wait for the solution, the service timeout when None.
+        Returns:
+            A dictionary with the 'status', the 'grid', solved when the status is 'solved', and the
+            'seconds' spent on it by the worker.
+        """
+        slot = await self._acquire()
+        return await self._submit(slot, grid, timeout)
+
+    async def _acquire(self):
+        await self._slots.acquire()
+        return self._free.pop()
+
+    def _release(self, slot):
+        self._cancel[slot] = 0
+        self._free.append(slot)
+        self._slots.release()
+
+    async def _submit(self, slot, grid, timeout):
+        timeout = self.timeout if timeout is None else timeout
+        future = asyncio.get_event_loop().create_future()
+        self.requests += 1
+        self._queue.put_nowait((slot, grid, time.time() + timeout, future))
+        try:
+            # the slot belongs to the batch until the worker is done with it, see _dispatch
+            status, solved, seconds = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self._cancel_request(slot, future)
+            return {'status': 'timeout', 'grid': grid, 'seconds': timeout}
+        except asyncio.CancelledError:
+            self._cancel_request(slot, future)
+            raise
+        return {'status': status, 'grid': solved or grid, 'seconds': seconds}
+
+    def _cancel_request(self, slot, future):
+        self.cancelled += 1
+        # once the future is done the worker has finished and the slot may already be reused
+        if not future.done():
+            self._cancel[slot] = 1
+
+    async def _collect(self):
+        """
+        Take the requests off the queue in batches and dispatch every batch without waiting for it.
+        """
+        while True:
+            batch = [await self._queue.get()]
+            if self.batch_delay and self._queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.batch_delay)
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            task = asyncio.ensure_future(self._dispatch(batch))
+            self._dispatched.add(task)
+            task.add_done_callback(self._dispatched.discard)
+
+    async def _dispatch(self, batch):
+        self.batches += 1
+        items = [(slot, grid, deadline) for slot, grid, deadline, _ in batch]
+        try:
+            results = await asyncio.get_event_loop().run_in_executor(self._executor, _solve_batch, items)
+        except Exception:
+            # e.g. a worker process died: give up on the batch rather than on the service
+            results = [('timeout', None, 0.)] * len(batch)
+        for (slot, _, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+            self._release(slot)
+
+    async def handle(self, reader, writer):
+        """
+        Answer the requests of one client connection, see asyncio.start_server(). The requests of a
+        connection are solved concurrently, and reading stops while max_pending requests are pending.
+        """
+        lock = asyncio.Lock()
+        answering = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                # the slot goes to the request once _answer takes it out of the ticket, until then
+                # it is released with the task, which may be cancelled before it even starts
+                ticket = [await self._acquire()]
+                task = asyncio.ensure_future(self._answer(ticket, line.decode('utf-8', 'replace'), writer, lock))
+                answering.add(task)
+                task.add_done_callback(answering.discard)
+                task.add_done_callback(lambda _, ticket=ticket: ticket and self._release(ticket.pop()))
+            # the client is done sending, answer what it already sent
+            if answering:
+                await asyncio.wait(answering)
+        except ConnectionError:
+            pass
+        finally:
+            for task in answering:
+                task.cancel()
+            writer.close()
+
+    async def _answer(self, ticket, line, writer, lock):
+        try:
+            request = parse_request(line)
+        except ValueError as e:
+            self._release(ticket.pop())
+            response = {'status': 'invalid', 'error': str(e)}
+        else:
+            response = {'id': request.get('id')} if 'id' in request else {}
+            response.update(await self._submit(ticket.pop(), request['grid'], request.get('timeout')))
+        async with lock:
+            try:
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
+            except ConnectionError:
+                # the client went away, nobody is left to answer
+                pass
+
+
+async def serve(host='127.0.0.1', port=8765, **options):
+    """
+    Run a SolveService on host:port until cancelled.
+    Args:
+        options: keyword arguments for SolveService.
+    """
+    async with SolveService(**options) as service:
+        server = await asyncio.start_server(service.handle, host, port)
+        sys.stderr.write('Solving on {}:{}\n'.format(host, port))
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Solve Sudoku grids sent over a local TCP socket.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='port to listen on (default: 8765)')
+    parser.add_argument('--workers', type=int, help='number of worker processes (default: one per CPU)')
+    parser.add_argument('--batch-size', type=int, default=16, help='most grids per batch (default: 16)')
+    parser.add_argument('--batch-delay', type=float, default=0.002,
+                        help='seconds to wait for more requests before sending a batch (default: 0.002)')
+    parser.add_argument('--max-pending', type=int, default=256,
+                        help='most requests in flight before clients are made to wait (default: 256)')
+    parser.add_argument('--timeout', type=float, default=10.,
+                        help='seconds before a request is cancelled (default: 10)')
+    parser.add_argument('--classic', action='store_true', help='solve without the diagonal units')
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers, batch_size=args.batch_size,
+                          batch_delay=args.batch_delay, max_pending=args.max_pending, timeout=args.timeout,
+                          rules=get_rules('classic' if args.classic else 'diagonal')))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import time
+import unittest
+
+import service
+import solution
+import solution_test
+from rules import CLASSIC
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestParseRequest(unittest.TestCase):
+
+    def test_bare_grid(self):
+        self.assertEqual(service.parse_request(' 2.3 \n'), {'grid': '2.3'})
+
+    def test_json(self):
+        request = service.parse_request('{"id": 7, "grid": "2.3", "timeout": 0.5}')
+        self.assertEqual(request, {'id': 7, 'grid': '2.3', 'timeout': 0.5})
+
+    def test_invalid(self):
+        for line in ('{"id": 7}', '{"grid": 5}', '{"grid": "2.3", "timeout": -1}', '{not json'):
+            with self.assertRaises(ValueError):
+                service.parse_request(line)
+
+
+class TestSolveService(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+    solved = solution.grid_string(solution_test.TestDiagonalSudoku.solved_diag_sudoku)
+    # no solution, but it takes the search many seconds to find that out
+    slow_grid = '.....5.8....6.1.43..........1.5........1.6...3.......553.....61........4.........'
+
+    def test_solve(self):
+        async def main():
+            async with service.SolveService(workers=1) as solver:
+                return await solver.solve(self.diagonal_grid), await solver.solve('22' + '.' * 79), \
+                    await solver.solve('123')
+
+        solved, unsolvable, invalid = run(main())
+        self.assertEqual(solved['status'], 'solved')
+        self.assertEqual(solved['grid'], self.solved)
+        self.assertEqual(unsolvable['status'], 'unsolvable')
+        self.assertEqual(invalid['status'], 'invalid')
+
+    def test_micro_batches(self):
+        async def main():
+            async with service.SolveService(workers=2, batch_size=4, batch_delay=0.05) as solver:
+                results = await asyncio.gather(*[solver.solve(self.diagonal_grid) for _ in range(8)])
+                return results, solver.batches
+
+        results, batches = run(main())
+        self.assertTrue(all(result['grid'] == self.solved for result in results))
+        self.assertEqual(batches, 2)
+
+    def test_backpressure(self):
+        async def main():
+            async with service.SolveService(workers=2, max_pending=2, batch_delay=0) as solver:
+                most = []
+
+                async def solve():
+                    result = await solver.solve(self.diagonal_grid)
+                    most.append(solver.pending)
+                    return result
+
+                results = await asyncio.gather(*[solve() for _ in range(6)])
+                return results, max(most), solver.pending
+
+        results, most, pending = run(main())
+        self.assertEqual(len(results), 6)
+        self.assertLessEqual(most, 2)
+        self.assertEqual(pending, 0)
+
+    def test_timeout_cancels_the_search(self):
+        async def main():
+            async with service.SolveService(workers=1, rules=CLASSIC) as solver:
+                start = time.perf_counter()
+                result = await solver.solve(self.slow_grid, timeout=0.2)
+                # the worker gives up on the grid, so the next one doesn't wait for the whole search
+                after = await solver.solve(self.diagonal_grid)
+                return result, after, time.perf_counter() - start, solver.cancelled
+
+        result, after, elapsed, cancelled = run(main())
+        self.assertEqual(result['status'], 'timeout')
+        self.assertEqual(after['status'], 'solved')
+        self.assertLess(elapsed, 2)
+        self.assertEqual(cancelled, 1)
+
+    def test_socket(self):
+        async def main():
+            async with service.SolveService(workers=1, timeout=5) as solver:
+                server = await asyncio.start_server(solver.handle, '127.0.0.1', 0)
+                port = server.sockets[0].getsockname()[1]
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                writer.write(json.dumps({'id': 'a', 'grid': self.diagonal_grid}).encode() + b'\n')
+                writer.write(self.diagonal_grid.encode() + b'\n\n')
+                writer.write(b'{"id": 3}\n')
+                writer.write_eof()
+                lines = [json.loads(line) for line in (await reader.read()).splitlines()]
+                writer.close()
+                server.close()
+                await server.wait_closed()
+                return lines
+
+        responses = run(main())
+        self.assertEqual(len(responses), 3)
+        self.assertEqual(sorted(r['status'] for r in responses), ['invalid', 'solved', 'solved'])
+        self.assertIn({'id': 'a', 'status': 'solved', 'grid': self.solved},
+                      [dict((k, r[k]) for k in ('id', 'status', 'grid') if k in r) for r in responses])
+
+    def test_disconnect_releases_the_slots(self):
+        class Reader(object):
+            # hands out its lines without ever yielding to the loop, then drops the connection
+            def __init__(self, lines):
+                self.lines = list(lines)
+
+            async def readline(self):
+                if not self.lines:
+                    raise ConnectionResetError()
+                return self.lines.pop(0)
+
+        class Writer(object):
+            def write(self, data):
+                pass
+
+            async def drain(self):
+                raise ConnectionResetError()
+
+            def close(self):
+                pass
+
+        async def main():
+            async with service.SolveService(workers=1, max_pending=4) as solver:
+                lines = [b'{"grid": 5}\n', self.diagonal_grid.encode() + b'\n']
+                # the answer tasks are cancelled before they start
+                await solver.handle(Reader(lines), Writer())
+                await asyncio.sleep(0.1)
+                after_cancel = solver.pending
+                # solved, but the client is gone when the answer is written
+                await solver._answer([await solver._acquire()], self.diagonal_grid, Writer(), asyncio.Lock())
+                return after_cancel, solver.pending
+
+        after_cancel, after_answer = run(main())
+        self.assertEqual(after_cancel, 0)
+        self.assertEqual(after_answer, 0)
+
+
+class TestAbort(unittest.TestCase):
+
+    def test_abort(self):
+        grid = TestSolveService.diagonal_grid
+        with self.assertRaises(solution.SearchAborted):
+            solution.solve(grid, abort=lambda values: True)
+        with self.assertRaises(solution.SearchAborted):
+            solution.solve(grid, trail=True, propagation='queue', abort=lambda values: True)
+        self.assertTrue(solution.solve(grid, trail=True, abort=lambda values: False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,56 +1,223 @@
+import time
+from collections import deque
+from itertools import combinations
 
+from history import History
+from rules import CLASSIC, DIAGONAL
+from stats import SolveStats, timed
 
-def assign_value(values, box, value):
+
+def assign_value(values, box, value, trail=None):
     """
     Please use this function to update your values dictionary!
     Assigns a value to a given box. If it updates the board record it.
+    With an UndoTrail the old value is kept for undo and the trail decides what history is recorded.
+    Without one a copy of the values is added to the global assignments list when a box is solved,
+    only if record_assignments is set.
     """
 
     # Don't waste memory appending actions that don't actually change any values
     if values[box] == value:
         return values
 
+    if trail is not None:
+        trail.changes.append((box, values[box]))
+        if trail.recorder is not None:
+            trail.recorder.record(box, values[box], value)
+        values[box] = value
+        if len(value) == 1 and trail.history is not None:
+            trail.history(values, box, value)
+        return values
+
     values[box] = value
-    if len(value) == 1:
+    if len(value) == 1 and record_assignments:
         assignments.append(values.copy())
     return values
 
 
-def naked_twins(values):
+class SearchAborted(Exception):
+    """
+    Raised by search() when its abort callable asks it to stop.
+    Attributes:
+        values(dict): set by solve(), the reduced grid with the fewest candidates the search reached
+            when it was given a SearchBudget that keeps it, None otherwise.
+        stats(SolveStats): set by solve(), the stats of the search up to the abort, with its reason.
+    """
+    values = None
+    stats = None
+
+
+class SearchBudget(object):
+    """
+    An abort callable for search() that stops it after a number of nodes or at a point in time,
+    and optionally keeps the most reduced grid the search reached in the meantime.
+    Args:
+        max_nodes(int): abort on the search node after this many, never when None.
+        deadline(float): abort on the first node after this time.time(), never when None.
+        abort(callable): also abort as soon as abort(values) returns True, e.g. when a flag is set
+            by another process.
+        keep_best(bool): have search() pass every reduced grid to record(), which copies the one
+            with the fewest candidates. Off by default, as counting and copying cost every node.
+    Attributes:
+        nodes(int): the nodes checked so far.
+        best(dict): with keep_best, a copy of the reduced values with the fewest candidates so far.
+        reason(string): 'nodes', 'deadline' or 'abort' once the budget has stopped the search.
+    """
+
+    def __init__(self, max_nodes=None, deadline=None, abort=None, keep_best=False):
+        self.max_nodes = max_nodes
+        self.deadline = deadline
+        self.abort = abort
+        self.keep_best = keep_best
+        self.nodes = 0
+        self.best = None
+        self.reason = None
+        self._fewest = None
+
+    def record(self, values):
+        """
+        Keep a copy of values if it has fewer candidates than the best grid so far.
+        """
+        left = sum(map(len, values.values()))
+        if self._fewest is None or left < self._fewest:
+            self._fewest = left
+            self.best = values.copy()
+
+    def __call__(self, values):
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            self.reason = 'nodes'
+        elif self.deadline is not None and time.time() > self.deadline:
+            self.reason = 'deadline'
+        elif self.abort is not None and self.abort(values):
+            self.reason = 'abort'
+        return self.reason is not None
+
+
+class UndoTrail(object):
+    """
+    Records the old value of every box changed through assign_value(), so that search() can roll
+    back a failed branch instead of copying the values dictionary for each candidate.
+    Args:
+        history(callable): called as history(values, box, value) whenever a box is solved.
+            No history is kept when None.
+        recorder(History): record every change and every undo in a history.History.
+    """
+
+    def __init__(self, history=None, recorder=None):
+        self.changes = []
+        self.history = history
+        self.recorder = recorder
+
+    def mark(self):
+        """Return a position on the trail that undo() can roll back to."""
+        return len(self.changes)
+
+    def undo(self, values, mark):
+        """Restore the values of every box changed since mark() was taken."""
+        changes = self.changes
+        recorder = self.recorder
+        while len(changes) > mark:
+            box, value = changes.pop()
+            if recorder is not None:
+                recorder.record(box, values[box], value)
+            values[box] = value
+
+
+def naked_twins(values, trail=None, rules=None):
     """Eliminate values using the naked twins strategy.
     Args:
         values(dict): a dictionary of the form {'box_name': '123456789', ...}
+        trail(UndoTrail): optional trail recording the changes
+        rules(SudokuRules): the units to use, default_rules when None
 
     Returns:
         the values dictionary with the naked twins eliminated from peers.
     """
 
-    # Find all instances of naked twins
-    # Eliminate the naked twins as possibilities for their peers
-    possibilities = [box for box in values.keys() if len(values[box]) == 2]
-
-    # assigning all sets of naked twins by comparing it with its peers and if they are equal then append pairs to nakedTwins
-    naked_twins = [[b1, b2] for b1 in possibilities for b2 in peers[b1] if values[b1] == values[b2]]
-
-    # going through each pair in nakedTwins
-    for b1, b2 in naked_twins:
-        # checking to make sure the length of each pair is two
-        if len(values[b1]) == 2 and len(values[b2]) == 2:
-            d1 = values[b1][0]
-            d2 = values[b1][1]
-            # grabbing all common peers for the twins
-            commons = list(set(peers[b1]) & set(peers[b2]))
-            for p in commons:
-                # removing the values of the naked twins from all other peers
-                # while making sure it does not remove it from the twin itself
-                if len(values[p]) > 1 and values[p] != values[b1] and values[p] != values[b2]:
-                    values[p] = values[p].replace(d1, '')
-                    values[p] = values[p].replace(d2, '')
+    for unit in (rules or default_rules).group_list:
+        # bucket the boxes with two possibilities by their value, two boxes in a bucket are twins
+        buckets = {}
+        for box in unit:
+            if len(values[box]) == 2:
+                buckets.setdefault(values[box], []).append(box)
+
+        for twins, found in buckets.items():
+            if len(found) == 2:
+                _remove_from_unit(values, unit, twins, found, trail)
 
     # returning values
     return values
 
 
+def _remove_from_unit(values, unit, digits, keep, trail):
+    """
+    Remove digits from the unsolved boxes of unit that are not in keep.
+    """
+    for box in unit:
+        if box not in keep and len(values[box]) > 1:
+            remaining = ''.join(d for d in values[box] if d not in digits)
+            assign_value(values, box, remaining, trail)
+
+
+def naked_subsets(values, size, trail=None, rules=None):
+    """Eliminate values using naked subsets, the naked twins strategy for any number of boxes.
+    Args:
+        values(dict): a dictionary of the form {'box_name': '123456789', ...}
+        size(int): the number of boxes in a subset, 3 for triples and 4 for quads
+        trail(UndoTrail): optional trail recording the changes
+        rules(SudokuRules): the units to use, default_rules when None
+
+    Returns:
+        the values dictionary with the digits of every group of size boxes sharing size digits
+        eliminated from the rest of their unit.
+    """
+    for unit in (rules or default_rules).group_list:
+        candidates = [box for box in unit if 1 < len(values[box]) <= size]
+        for subset in combinations(candidates, size):
+            digits = set(''.join(values[box] for box in subset))
+            if len(digits) == size:
+                _remove_from_unit(values, unit, digits, subset, trail)
+    return values
+
+
+def naked_triples(values, trail=None, rules=None):
+    """Eliminate values using naked triples, see naked_subsets()."""
+    return naked_subsets(values, 3, trail, rules)
+
+
+def naked_quads(values, trail=None, rules=None):
+    """Eliminate values using naked quads, see naked_subsets()."""
+    return naked_subsets(values, 4, trail, rules)
+
+
+def hidden_pairs(values, trail=None, rules=None):
+    """Eliminate values using the hidden pairs strategy.
+    Args:
+        values(dict): a dictionary of the form {'box_name': '123456789', ...}
+        trail(UndoTrail): optional trail recording the changes
+        rules(SudokuRules): the units to use, default_rules when None
+
+    Returns:
+        the values dictionary where two digits that only fit in the same two boxes of a unit
+        are the only possibilities left in those boxes.
+    """
+    for unit in (rules or default_rules).unit_list:
+        # bucket the digits that fit in exactly two boxes by those boxes
+        buckets = {}
+        for digit in digits:
+            places = tuple(box for box in unit if digit in values[box])
+            if len(places) == 2:
+                buckets.setdefault(places, []).append(digit)
+
+        for places, found in buckets.items():
+            if len(found) == 2:
+                pair = ''.join(found)
+                for box in places:
+                    assign_value(values, box, ''.join(d for d in values[box] if d in pair), trail)
+    return values
+
+
 def cross(A, B):
     """
     Cross product of elements in A and elements in B.
@@ -79,6 +246,14 @@ def grid_values(grid):
     return dict(zip(boxes, chars))
 
 
+def grid_string(values):
+    """
+    Convert a values dictionary back into the 81 character form accepted by grid_values,
+    with '.' for the boxes that are not solved.
+    """
+    return ''.join(values[box] if len(values[box]) == 1 else '.' for box in boxes)
+
+
 def display(values):
     """
     Display the values as a 2-D grid.
@@ -95,45 +270,55 @@ def display(values):
     return
 
 
-def eliminate(values):
+def eliminate(values, trail=None, rules=None):
     """
     Args:
         values:
+        trail(UndoTrail): optional trail recording the changes
+        rules(SudokuRules): the units to use, default_rules when None
     Returns: deletes the value once a solution to a  box is found
 
     """
+    peers = (rules or default_rules).peers
     solved_values = [box for box in values.keys() if len(values[box]) == 1]
     for box in solved_values:
         digit = values[box]
         for peer in peers[box]:
-            assign_value(values, peer, values[peer].replace(digit, ''))
+            assign_value(values, peer, values[peer].replace(digit, ''), trail)
     return values
 
 
-def only_choice(values):
+def only_choice(values, trail=None, rules=None):
     """
     Args:
         values(dict): a dictionary of the form {'box_name': '123456789', ...}
+        trail(UndoTrail): optional trail recording the changes
+        rules(SudokuRules): the units to use, default_rules when None
 
     Returns: returns value of the only valid choice for that box using back prop
 
     """
     all_digits = '123456789'
-    for unit in unit_list:
+    for unit in (rules or default_rules).unit_list:
         for digit in all_digits:
             # get all boxes in the unit that have the digit
             boxes_with_digit = [box for box in unit if digit in values[box]]
             # if there is only 1 box, update it
             if len(boxes_with_digit) == 1:
-                assign_value(values, boxes_with_digit[0], digit)
+                assign_value(values, boxes_with_digit[0], digit, trail)
 
     return values
 
 
-def reduce_puzzle(values):
+def reduce_puzzle(values, trail=None, rules=None, strategies=None, stats=None):
     """
     Args:
         values(dict): a dictionary of the form {'box_name': '123456789', ...}
+        trail(UndoTrail): optional trail recording the changes
+        rules(SudokuRules): the units to use, default_rules when None
+        strategies(tuple): the strategies to apply on every pass, called as
+            strategy(values, trail, rules). STRATEGIES when None, see also ALL_STRATEGIES.
+        stats(SolveStats): optional stats to count the passes and time every strategy call in
 
     Returns: a resulting sudoku puzzle is in dictionary form
 
@@ -142,9 +327,13 @@ def reduce_puzzle(values):
 
     while not stalled:
         solved_values_before = len([box for box in values.keys() if len(values[box]) == 1])
-        values = eliminate(values)
-        values = only_choice(values)
-        values = naked_twins(values)
+        if stats is None:
+            for strategy in strategies or STRATEGIES:
+                values = strategy(values, trail, rules)
+        else:
+            stats.passes += 1
+            for strategy in strategies or STRATEGIES:
+                values = timed(stats, strategy.__name__, strategy, values, trail, rules)
 
         solved_values_after = len([box for box in values.keys() if len(values[box]) == 1])
 
@@ -155,17 +344,115 @@ def reduce_puzzle(values):
     return values
 
 
-def search(values):
+def _shrink(values, box, value, queue, removed, trail):
+    """
+    Assign a smaller set of candidates to box and queue it for propagation, remembering which
+    digits it lost. Returns False if the box has no candidates left.
+    """
+    lost = ''.join(d for d in values[box] if d not in value)
+    assign_value(values, box, value, trail)
+    if not value:
+        return False
+    if box in removed:
+        removed[box] += lost
+    else:
+        removed[box] = lost
+        queue.append(box)
+    return True
+
+
+def propagate(values, changed=None, trail=None, rules=None):
+    """
+    Args:
+        values(dict): a dictionary of the form {'box_name': '123456789', ...}
+        changed(list): the boxes whose candidates shrank since the puzzle was last reduced.
+            Every box is visited when None.
+        trail(UndoTrail): optional trail recording the changes
+        rules(SudokuRules): the units to use, default_rules when None
+
+    Returns: the same strategies as reduce_puzzle, driven by a queue of changed boxes so that only
+        the peers and units of a box that shrank are revisited. False as soon as a box runs out of
+        candidates or a digit has no place left in a unit.
+
+    """
+    rules = rules or default_rules
+    peers = rules.peers
+    units = rules.units
+    queue = deque(boxes if changed is None else changed)
+    # digits each queued box lost since it was queued. For the starting boxes that is every digit
+    # they no longer have, so the boxes that still have all of them are not checked for nothing.
+    removed = dict((box, ''.join(d for d in digits if d not in values[box])) for box in queue)
+
+    while queue:
+        box = queue.popleft()
+        lost = removed.pop(box)
+
+        # eliminate: a solved box removes its digit from its peers
+        value = values[box]
+        if len(value) == 1:
+            for peer in peers[box]:
+                if value in values[peer]:
+                    if not _shrink(values, peer, values[peer].replace(value, ''), queue, removed, trail):
+                        return False
+
+        for unit in units[box]:
+            # only choice: a digit the box lost may now fit in a single box of the unit
+            for digit in lost:
+                places = [b for b in unit if digit in values[b]]
+                if not places:
+                    return False
+                if len(places) == 1 and values[places[0]] != digit:
+                    _shrink(values, places[0], digit, queue, removed, trail)
+
+            # naked twins: a pair of boxes sharing two candidates removes them from the rest of the unit
+            value = values[box]
+            if len(value) == 2 and any(b != box and values[b] == value for b in unit):
+                for b in unit:
+                    if values[b] != value and (value[0] in values[b] or value[1] in values[b]):
+                        remaining = values[b].replace(value[0], '').replace(value[1], '')
+                        if not _shrink(values, b, remaining, queue, removed, trail):
+                            return False
+    return values
+
+
+def search(values, propagation='sweep', changed=None, trail=None, rules=None, strategies=None,
+           stats=None, abort=None):
     """
     Args:
         values: values(dict): a dictionary of the form {'box_name': '123456789', ...}
+        propagation(string): 'sweep' to run reduce_puzzle over the whole board on every node,
+            'queue' to only propagate from the boxes that changed (see propagate).
+        changed(list): the boxes assigned since the parent node, used by the 'queue' propagation.
+        trail(UndoTrail): search values in place, undoing the changes of each failed branch
+            instead of copying the dictionary for every candidate.
+        rules(SudokuRules): the units to use, default_rules when None
+        strategies(tuple): the strategies of the 'sweep' propagation, see reduce_puzzle.
+        stats(SolveStats): optional stats to count the nodes, depth and backtracks of the search in
+        abort(callable): called with the values on every node, the search raises SearchAborted as
+            soon as it returns True. See SearchBudget, whose record() is also given the values
+            once they are reduced when it has keep_best.
 
     Returns: using depth-first search and propagation, it creates a search tree and solves the sudoku puzzle.
 
     """
-    values = reduce_puzzle(values)
+    if abort is not None and abort(values):
+        raise SearchAborted()
+    if stats is not None:
+        stats.nodes += 1
+    if propagation == 'queue':
+        if stats is None:
+            values = propagate(values, changed, trail, rules)
+        else:
+            stats.passes += 1
+            values = timed(stats, 'propagate', propagate, values, changed, trail, rules)
+    else:
+        values = reduce_puzzle(values, trail, rules, strategies, stats)
     if values is False:
         return False
+    if abort is not None and getattr(abort, 'keep_best', False):
+        abort.record(values)
+    if trail is not None:
+        return _search_trail(values, propagation, trail, rules, strategies, stats, abort)
     # Chose one of the unfilled square s with the fewest possibilities
     unsolved_values = [box for box in values.keys() if len(values[box]) > 1]
     # print(len(unsolved_values))
@@ -176,57 +463,251 @@ def search(values):
             values_try = values.copy()
             assign_value(values_try, box, v)
             # values_try[box] = v
-            solve_try = search(values_try)
+            if stats is not None:
+                stats.guess()
+            solve_try = search(values_try, propagation, [box], rules=rules, strategies=strategies,
+                               stats=stats, abort=abort)
+            if stats is not None:
+                stats.undo_guess(not solve_try)
             if solve_try:
                 return solve_try
     else:
         return values
 
 
-def solve(grid):
+def _search_trail(values, propagation, trail, rules, strategies, stats=None, abort=None):
+    """
+    The branching step of search() with an undo trail, for values that have already been reduced.
+    """
+    unsolved_values = [box for box in values.keys() if len(values[box]) > 1]
+    if not unsolved_values:
+        return values
+    box = min(unsolved_values, key=lambda b: len(values[b]))
+    mark = trail.mark()
+    for v in values[box]:
+        assign_value(values, box, v, trail)
+        if stats is not None:
+            stats.guess()
+        solved = search(values, propagation, [box], trail, rules, strategies, stats, abort)
+        if stats is not None:
+            stats.undo_guess(not solved)
+        if solved:
+            return values
+        trail.undo(values, mark)
+    return False
+
+
+def solve(grid, engine='strings', propagation='sweep', trail=False, history=None, rules=None,
+          strategies=None, stats=None, recorder=None, abort=None, max_nodes=None, deadline=None,
+          keep_best=False):
     """
     Find the solution to a Sudoku grid.
     Args:
         grid(string): a string representing a sudoku grid.
             Example: '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+        engine(string): 'strings' for the dictionary solver in this file, 'bitboard' for the
+            integer mask solver in bitboard.py, 'nxn' for the size-parametric solver in nxn.py,
+            'dlx' for the exact cover solver in dlx.py. All of them return the same dictionary.
+        propagation(string): 'sweep' or 'queue', see search().
+        trail(bool): search with an undo trail instead of copying the values for every branch.
+        history(callable): with trail, called as history(values, box, value) for every box
+            solved along the way. Nothing is recorded when None. See UndoTrail.
+        rules(SudokuRules): the variant to solve, default_rules when None.
+        strategies(tuple): the strategies of the strings engine, STRATEGIES when None.
+        stats(SolveStats): collect the strategy, search and timing stats of the strings engine in
+            it. The dlx engine records its search nodes, depth and backtracks, the other engines
+            only the total time and whether the grid was solved.
+        recorder(History): record the starting grid and every change of the strings engine in a
+            history.History, to replay the solve. Implies trail.
+        abort(callable): stop the search of the strings engine by raising SearchAborted as soon as
+            abort(values) returns True, see search(). Only the strings engine takes it.
+        max_nodes(int): with the strings engine, give up after this many search nodes.
+        deadline(float): with the strings engine, give up once time.time() passes this.
+        keep_best(bool): with max_nodes or deadline, keep the most reduced grid the search reached
+            for SearchAborted, see SearchBudget.
     Returns:
         The dictionary representation of the final sudoku grid. False if no solution exists.
+        Raises SearchAborted when the search is stopped by abort, max_nodes or deadline. Its stats
+        are the given ones or a new SolveStats, and with keep_best its values are the most reduced
+        grid the search reached.
+        Raises ValueError when abort, max_nodes or deadline is given to another engine.
+    """
+    if engine != 'strings' and (abort is not None or max_nodes is not None or deadline is not None):
+        raise ValueError('The {} engine has no search budget, use the strings engine'.format(engine))
+    if max_nodes is not None or deadline is not None:
+        abort = SearchBudget(max_nodes, deadline, abort, keep_best)
+    if abort is not None and stats is None:
+        # so that every SearchAborted tells how far the search went
+        stats = SolveStats(grid)
+
+    if engine == 'bitboard':
+        import bitboard
+        values = bitboard.solve(grid, rules)
+    elif engine == 'nxn':
+        import nxn
+        solved = nxn.solve(grid, nxn.from_sudoku_rules(rules or default_rules))
+        values = grid_values(solved) if solved else False
+    elif engine == 'dlx':
+        import dlx
+        values = dlx.solve(grid, rules, stats)
+    elif engine != 'strings':
+        raise ValueError('Unknown engine: {}'.format(engine))
+    else:
+        try:
+            if trail or recorder is not None:
+                values = grid_values(grid)
+                if recorder is not None:
+                    recorder.start(values)
+                values = search(values, propagation, trail=UndoTrail(history, recorder), rules=rules,
+                                strategies=strategies, stats=stats, abort=abort)
+            else:
+                values = search(grid_values(grid), propagation, rules=rules, strategies=strategies,
+                                stats=stats, abort=abort)
+        except SearchAborted as e:
+            e.values = getattr(abort, 'best', None)
+            e.stats = stats
+            stats.aborted = True
+            stats.abort_reason = getattr(abort, 'reason', 'abort')
+            stats.finish(False)
+            raise
+
+    if stats is not None:
+        stats.finish(values)
+    return values
+
+
+def _count_trail(values, propagation, changed, trail, rules, strategies, limit, stats):
+    """
+    The counting step of count_solutions(): propagate values in place, then try every candidate of
+    the box with the fewest, undoing each branch before the next one.
+    Returns: the number of solutions below this node, stopping once limit of them are found.
+    """
+    if stats is not None:
+        stats.nodes += 1
+    if propagation == 'queue':
+        values = propagate(values, changed, trail, rules)
+    else:
+        values = reduce_puzzle(values, trail, rules, strategies, stats)
+    if values is False:
+        return 0
+    unsolved_values = [box for box in values.keys() if len(values[box]) > 1]
+    if not unsolved_values:
+        return 1
+    box = min(unsolved_values, key=lambda b: len(values[b]))
+    mark = trail.mark()
+    found = 0
+    for v in values[box]:
+        assign_value(values, box, v, trail)
+        if stats is not None:
+            stats.guess()
+        count = _count_trail(values, propagation, [box], trail, rules, strategies, limit - found, stats)
+        if stats is not None:
+            stats.undo_guess(not count)
+        trail.undo(values, mark)
+        found += count
+        if found >= limit:
+            break
+    return found
+
+
+def count_solutions(grid, limit=2, propagation='queue', rules=None, strategies=None, stats=None):
+    """
+    Count the solutions of a Sudoku grid with the propagation and undo trail of the strings engine.
+    Args:
+        grid(string): a string representing a sudoku grid.
+        limit(int): stop searching as soon as this many solutions are found.
+        propagation(string): 'queue' or 'sweep', see search(). The queue is the faster one when
+            the whole tree has to be searched.
+        rules(SudokuRules): the variant to solve, default_rules when None.
+        strategies(tuple): the strategies of the 'sweep' propagation, STRATEGIES when None.
+        stats(SolveStats): optional stats to count the search nodes and backtracks in.
+    Returns:
+        The number of solutions, at most limit.
     """
     values = grid_values(grid)
-    values = search(values)
+    found = _count_trail(values, propagation, None, UndoTrail(), rules, strategies, limit, stats)
+    if stats is not None:
+        stats.finish(found)
+    return found
+
+
+def is_unique(grid, propagation='queue', rules=None, strategies=None, stats=None):
+    """
+    Return True if a Sudoku grid has exactly one solution, see count_solutions().
+    """
+    return count_solutions(grid, 2, propagation, rules, strategies, stats) == 1
+
+
+class Solver(object):
+    """
+    A reusable Sudoku solver that keeps its options and assignment history on the instance instead
+    of in the module globals, so that every thread or worker process can own one.
+    Args:
+        engine(string): 'strings' or 'bitboard', see solve().
+        propagation(string): 'sweep' or 'queue', see search().
+        record_history(bool): record the last solve in self.history, a history.History.
+        rules(SudokuRules): the variant to solve, default_rules when None.
+        strategies(tuple): the strategies of the strings engine, STRATEGIES when None.
+        collect_stats(bool): keep the SolveStats of the last solve in self.stats.
+    """
+
+    def __init__(self, engine='strings', propagation='sweep', record_history=False, rules=None,
+                 strategies=None, collect_stats=False):
+        self.engine = engine
+        self.propagation = propagation
+        self.history = History() if record_history else None
+        self.rules = rules
+        self.strategies = strategies
+        self.collect_stats = collect_stats
+        self.stats = None
+
+    def solve(self, grid):
+        """
+        Find the solution to a Sudoku grid, the same as the solve() function.
+        """
+        if self.collect_stats:
+            self.stats = SolveStats(grid)
+        if self.engine != 'strings':
+            return solve(grid, engine=self.engine, rules=self.rules, stats=self.stats)
+        return solve(grid, propagation=self.propagation, trail=True, rules=self.rules,
+                     strategies=self.strategies, stats=self.stats, recorder=self.history)
 
-    return values
 
 # Defined Parameters and Global variables
+# Set record_assignments to copy the values into assignments whenever assign_value() solves a box
+# without an UndoTrail. A history.History records a solve with much less memory.
+record_assignments = False
 assignments = []
 rows = 'ABCDEFGHI'
 columns = '123456789'
+# The candidates of a box, the same characters as the column labels but not the same thing
+digits = '123456789'
 boxes = cross(rows, columns)
-columns_reversed = columns[::-1]
-
-row_units = [cross(r, columns) for r in rows]
-column_units = [cross(rows, c) for c in columns]
-square_units = [cross(rs, cs) for rs in ('ABC', 'DEF', 'GHI') for cs in ('123', '456', '789')]
-d1_units = [[rows[i] + columns[i] for i in range(len(rows))]]
-d2_units = [[rows[i] + columns_reversed[i] for i in range(len(rows))]]
 
 do_diagnonal = 1
 
+# The rules used when a function is not given any, see rules.py for the tables
 if do_diagnonal == 1:
-    unit_list = row_units + column_units + square_units + d1_units + d2_units
+    default_rules = DIAGONAL
 else:
-    unit_list = row_units + column_units + square_units
+    default_rules = CLASSIC
+
+unit_list = default_rules.unit_list
+units = default_rules.units
+peers = default_rules.peers
 
-units = dict((s, [u for u in unit_list if s in u]) for s in boxes)
-peers = dict((s, set(sum(units[s], []))-set([s])) for s in boxes)
+# The strategies reduce_puzzle applies by default, and every strategy available to it
+STRATEGIES = (eliminate, only_choice, naked_twins)
+ALL_STRATEGIES = (eliminate, only_choice, naked_twins, hidden_pairs, naked_triples, naked_quads)
 
 if __name__ == '__main__':
     diag_sudoku_grid = '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
-    display(solve(diag_sudoku_grid))
+    solve_history = History()
+    display(solve(diag_sudoku_grid, recorder=solve_history))
 
     try:
         from visualize import visualize_assignments
-        visualize_assignments(assignments)
+        visualize_assignments(solve_history)
 
     except SystemExit:
         pass
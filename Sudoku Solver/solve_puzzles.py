@@ -0,0 +1,147 @@
+"""
+Solve a file of Sudoku puzzles from the command line.
+
+Puzzles are read one per line, in the 81 character form accepted by solution.grid_values, from a
+file or from stdin. They are solved lazily as they are read and every result is written as soon as
+it is available, one tab separated line per puzzle:
+
+    <line number>  <solved|unsolvable|invalid>  <milliseconds>  <grid>
+
+where grid is the solution, or the puzzle as read when it could not be solved. Blank lines are
+skipped, and the puzzles keep the numbers of their lines in the file. Packed files
+written by packed.py are read too, numbered by the lines of the text file they were converted
+from. With --stats the counters and timers of every solve (see stats.py) are written to a file as
+well, one JSON object per line. Example:
+
+    python solve_puzzles.py puzzles.txt --parallel 8 --classic > solutions.tsv
+    python solve_puzzles.py puzzles.txt --engine strings --stats stats.jsonl > solutions.tsv
+"""
+import argparse
+import bisect
+import json
+import sys
+import time
+
+import packed
+from batch import solve_many
+from rules import get_rules
+from solution import grid_string
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Solve Sudoku puzzles, one per line.')
+    parser.add_argument('puzzles', nargs='?', default='-',
+                        help='file with one puzzle per line, stdin when omitted or -')
+    parser.add_argument('-p', '--parallel', type=int, default=1, metavar='N',
+                        help='number of worker processes (default: 1, solve in this process)')
+    variant = parser.add_mutually_exclusive_group()
+    variant.add_argument('--diagonal', dest='variant', action='store_const', const='diagonal',
+                         default='diagonal', help='the two main diagonals are units too (default)')
+    variant.add_argument('--classic', dest='variant', action='store_const', const='classic',
+                         help='only rows, columns and squares are units')
+    variant.add_argument('--windoku', dest='variant', action='store_const', const='windoku',
+                         help='four extra 3x3 windows are units too')
+    parser.add_argument('--engine', choices=['strings', 'bitboard', 'nxn', 'dlx'], default='bitboard',
+                        help='solver engine (default: bitboard)')
+    parser.add_argument('--propagation', choices=['sweep', 'queue'], default='sweep',
+                        help='propagation of the strings engine (default: sweep)')
+    parser.add_argument('--unordered', action='store_true',
+                        help='write results as they finish instead of in input order')
+    parser.add_argument('--stats', metavar='FILE',
+                        help='write the stats of every puzzle to FILE as JSON lines')
+    return parser.parse_args(argv)
+
+
+class TextPuzzles(object):
+    """
+    Iterates over the non-blank lines of a text file of puzzles.
+    Args:
+        lines(iterable): the lines of the file.
+    """
+
+    def __init__(self, lines):
+        self.lines = lines
+        # the index of the first puzzle after every run of blank lines, and the blank lines
+        # skipped up to it, so memory only grows with the number of runs
+        self._indexes = []
+        self._skipped = []
+
+    def __iter__(self):
+        index = skipped = 0
+        for text in self.lines:
+            if not text.strip():
+                skipped += 1
+                continue
+            if skipped and (not self._skipped or self._skipped[-1] != skipped):
+                self._indexes.append(index)
+                self._skipped.append(skipped)
+            yield text
+            index += 1
+
+    def line(self, index):
+        """
+        Return the line number of the puzzle at index, counting from 1.
+        """
+        run = bisect.bisect_right(self._indexes, index) - 1
+        return index + 1 + (self._skipped[run] if run >= 0 else 0)
+
+
+def format_result(result, line=None):
+    """
+    Format a batch.SolveResult as an output line, numbered line or the position of the puzzle.
+    """
+    if result.values is None:
+        status, grid = 'invalid', result.grid
+    elif result.values is False:
+        status, grid = 'unsolvable', result.grid
+    else:
+        status, grid = 'solved', grid_string(result.values)
+    if line is None:
+        line = result.index + 1
+    return '{}\t{}\t{:.3f}\t{}\n'.format(line, status, result.seconds * 1000, grid)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.puzzles != '-' and packed.is_packed(args.puzzles):
+        reader = packed.PackedReader(args.puzzles)
+        puzzles, line = reader.grids(), reader.line
+    else:
+        reader = None
+        lines = sys.stdin if args.puzzles == '-' else open(args.puzzles)
+        puzzles = TextPuzzles(lines)
+        line = puzzles.line
+    rules = get_rules(args.variant)
+
+    stats = open(args.stats, 'w') if args.stats else None
+
+    start = time.perf_counter()
+    count = solved = 0
+    try:
+        results = solve_many(puzzles, workers=args.parallel, ordered=not args.unordered,
+                             engine=args.engine, propagation=args.propagation, rules=rules,
+                             collect_stats=stats is not None)
+        for result in results:
+            number = result.index + 1 if line is None else line(result.index)
+            sys.stdout.write(format_result(result, number))
+            if result.stats is not None:
+                result.stats['line'] = number
+                stats.write(json.dumps(result.stats, sort_keys=True) + '\n')
+            count += 1
+            solved += bool(result.values)
+    finally:
+        if reader is not None:
+            reader.close()
+        elif lines is not sys.stdin:
+            lines.close()
+        if stats is not None:
+            stats.close()
+
+    elapsed = time.perf_counter() - start
+    sys.stderr.write('{} puzzles, {} solved in {:.2f}s ({:.1f} puzzles/s)\n'.format(
+        count, solved, elapsed, count / elapsed if elapsed else 0.))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
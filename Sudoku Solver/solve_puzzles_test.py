@@ -0,0 +1,67 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+import solve_puzzles
+import solution_test
+
+
+class TestSolvePuzzles(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+
+    def run_main(self, lines, *args):
+        handle, path = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(handle, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        stdout, stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = io.StringIO(), io.StringIO()
+        try:
+            solve_puzzles.main([path] + list(args))
+            return [line.split('\t') for line in sys.stdout.getvalue().splitlines()]
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+            os.remove(path)
+
+    def test_statuses(self):
+        rows = self.run_main([self.diagonal_grid, '22' + '.' * 79, 'not a puzzle'])
+        self.assertEqual([(row[0], row[1]) for row in rows],
+                         [('1', 'solved'), ('2', 'unsolvable'), ('3', 'invalid')])
+        self.assertEqual(rows[0][3], '267945381853716249491823576576438192384192657129657438642379815935281764718564923')
+        self.assertEqual(rows[2][3], 'not a puzzle')
+
+    def test_blank_lines(self):
+        rows = self.run_main(['', self.diagonal_grid, '', '  ', self.diagonal_grid, 'not a puzzle', ''])
+        self.assertEqual([(row[0], row[1]) for row in rows], [('2', 'solved'), ('5', 'solved'), ('6', 'invalid')])
+        rows = self.run_main([self.diagonal_grid, '', self.diagonal_grid] * 3, '--parallel', '2')
+        self.assertEqual([row[0] for row in rows], ['1', '3', '4', '6', '7', '9'])
+
+    def test_text_puzzles(self):
+        puzzles = solve_puzzles.TextPuzzles(['a\n', '\n', '\n', 'b\n', 'c\n', '\n', 'd\n'])
+        self.assertEqual(list(puzzles), ['a\n', 'b\n', 'c\n', 'd\n'])
+        self.assertEqual([puzzles.line(i) for i in range(4)], [1, 4, 5, 7])
+
+    def test_parallel_classic(self):
+        rows = self.run_main([self.diagonal_grid] * 4, '--parallel', '2', '--classic', '--unordered')
+        self.assertEqual(sorted(row[0] for row in rows), ['1', '2', '3', '4'])
+        self.assertTrue(all(row[1] == 'solved' for row in rows))
+
+    def test_stats(self):
+        handle, path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(handle)
+        try:
+            self.run_main([self.diagonal_grid, 'not a puzzle'], '--engine', 'strings', '--stats', path)
+            with open(path) as f:
+                lines = [json.loads(line) for line in f]
+        finally:
+            os.remove(path)
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]['line'], 1)
+        self.assertTrue(lines[0]['solved'])
+        self.assertIn('eliminate', lines[0]['strategies'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Counters and timers for a single solve of the strings engine.
+
+Collecting stats is opt-in: the solver functions take a stats argument that defaults to None and
+only time and count anything when they are given a SolveStats, so a plain solve pays for a single
+`is None` check per call. Example:
+
+    stats = SolveStats(grid)
+    solution.solve(grid, trail=True, stats=stats)
+    print(stats.to_json())
+"""
+import json
+import time
+
+
+class SolveStats(object):
+    """
+    What one solve spent its time on.
+    Args:
+        puzzle(string): the grid being solved, copied into the JSON export.
+    Attributes:
+        strategies(dict): maps each strategy name to a dictionary with the number of calls, the
+            seconds spent in them and the candidates they removed.
+        nodes(int): search() calls.
+        depth(int): the current number of guesses on the search path.
+        max_depth(int): the deepest the search went.
+        backtracks(int): guesses that led to a contradiction and were undone.
+        passes(int): rounds of the reduce_puzzle loop, and calls of the queue propagation.
+        solved(bool): whether a solution was found, set by finish().
+        aborted(bool): whether the search was stopped before it finished, see solution.SearchBudget.
+        abort_reason(string): why it was stopped, 'nodes', 'deadline' or 'abort', None otherwise.
+        seconds(float): the time of the whole solve, set by finish().
+    """
+
+    def __init__(self, puzzle=None):
+        self.puzzle = puzzle
+        self.strategies = {}
+        self.nodes = 0
+        self.depth = 0
+        self.max_depth = 0
+        self.backtracks = 0
+        self.passes = 0
+        self.solved = None
+        self.aborted = False
+        self.abort_reason = None
+        self.seconds = 0.0
+        self._start = time.perf_counter()
+
+    def strategy(self, name, seconds, removals):
+        """
+        Record one call of a strategy.
+        """
+        counts = self.strategies.get(name)
+        if counts is None:
+            counts = self.strategies[name] = {'calls': 0, 'seconds': 0.0, 'removals': 0}
+        counts['calls'] += 1
+        counts['seconds'] += seconds
+        counts['removals'] += removals
+
+    def guess(self):
+        """
+        Record a step down the search tree.
+        """
+        self.depth += 1
+        if self.depth > self.max_depth:
+            self.max_depth = self.depth
+
+    def undo_guess(self, failed):
+        """
+        Record a step back up the search tree, a backtrack if the guess failed.
+        """
+        self.depth -= 1
+        if failed:
+            self.backtracks += 1
+
+    def finish(self, solved):
+        """
+        Stop the clock of the solve.
+        """
+        self.solved = bool(solved)
+        self.seconds = time.perf_counter() - self._start
+
+    def to_dict(self):
+        return {
+            'puzzle': self.puzzle,
+            'solved': self.solved,
+            'aborted': self.aborted,
+            'abort_reason': self.abort_reason,
+            'seconds': self.seconds,
+            'nodes': self.nodes,
+            'max_depth': self.max_depth,
+            'backtracks': self.backtracks,
+            'passes': self.passes,
+            'strategies': dict((name, dict(counts)) for name, counts in self.strategies.items()),
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), sort_keys=True)
+
+
+def candidates(values):
+    """
+    Return the number of candidates left in a dictionary of values.
+    """
+    return sum(len(v) for v in values.values())
+
+
+def timed(stats, name, strategy, values, *args):
+    """
+    Call strategy(values, *args), recording its time and the candidates it removed in stats.
+    """
+    before = candidates(values)
+    start = time.perf_counter()
+    result = strategy(values, *args)
+    seconds = time.perf_counter() - start
+    after = candidates(result) if result else before
+    stats.strategy(name, seconds, before - after)
+    return result
@@ -0,0 +1,55 @@
+import json
+import unittest
+
+import solution
+import solution_test
+from stats import SolveStats
+
+
+class TestSolveStats(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+    hard_grid = '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......'
+
+    def test_strategies(self):
+        stats = SolveStats(self.diagonal_grid)
+        result = solution.solve(self.diagonal_grid, stats=stats)
+        self.assertEqual(result, solution_test.TestDiagonalSudoku.solved_diag_sudoku)
+        self.assertTrue(stats.solved)
+        self.assertEqual(sorted(stats.strategies), ['eliminate', 'naked_twins', 'only_choice'])
+        self.assertGreater(stats.strategies['eliminate']['removals'], 0)
+        self.assertEqual(stats.strategies['eliminate']['calls'], stats.passes)
+        self.assertEqual(stats.depth, 0)
+
+    def test_search(self):
+        for trail in (False, True):
+            stats = SolveStats()
+            self.assertTrue(solution.solve(self.hard_grid, trail=trail, rules=solution.CLASSIC, stats=stats))
+            self.assertGreater(stats.nodes, 1)
+            self.assertGreater(stats.max_depth, 0)
+            self.assertEqual(stats.depth, 0)
+            # every node but the root is a guess, and every guess off the solution path failed
+            self.assertGreaterEqual(stats.backtracks, stats.nodes - 1 - stats.max_depth)
+            self.assertLess(stats.backtracks, stats.nodes)
+
+    def test_queue(self):
+        stats = SolveStats()
+        solution.solve(self.diagonal_grid, propagation='queue', trail=True, stats=stats)
+        self.assertEqual(list(stats.strategies), ['propagate'])
+        self.assertEqual(stats.strategies['propagate']['calls'], stats.nodes)
+
+    def test_json(self):
+        solver = solution.Solver(collect_stats=True)
+        solver.solve(self.diagonal_grid)
+        exported = json.loads(solver.stats.to_json())
+        self.assertEqual(exported['puzzle'], self.diagonal_grid)
+        self.assertTrue(exported['solved'])
+        self.assertIn('naked_twins', exported['strategies'])
+
+    def test_off_by_default(self):
+        solver = solution.Solver()
+        solver.solve(self.diagonal_grid)
+        self.assertIsNone(solver.stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
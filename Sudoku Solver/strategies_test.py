@@ -0,0 +1,51 @@
+import unittest
+
+import rules
+import solution
+import solution_test
+
+
+class TestStrategies(unittest.TestCase):
+
+    def empty_board(self):
+        return dict((box, '123456789') for box in solution.boxes)
+
+    def test_naked_triples(self):
+        values = self.empty_board()
+        values.update({'A1': '12', 'A2': '23', 'A3': '13'})
+        solution.naked_triples(values, rules=rules.CLASSIC)
+        self.assertEqual([values['A' + c] for c in '4789'], ['456789'] * 4)
+        self.assertEqual(values['B1'], '456789')
+        self.assertEqual(values['D1'], '123456789')
+        self.assertEqual([values['A1'], values['A2'], values['A3']], ['12', '23', '13'])
+
+    def test_naked_quads(self):
+        values = self.empty_board()
+        values.update({'A1': '12', 'A5': '23', 'A6': '34', 'A9': '14'})
+        solution.naked_quads(values, rules=rules.CLASSIC)
+        self.assertEqual(values['A2'], '56789')
+        self.assertEqual(values['B1'], '123456789')
+
+    def test_hidden_pairs(self):
+        values = self.empty_board()
+        values.update(dict(('A' + c, '3456789') for c in '3456789'))
+        values.update({'A1': '1234', 'A2': '125'})
+        solution.hidden_pairs(values, rules=rules.CLASSIC)
+        self.assertEqual([values['A1'], values['A2']], ['12', '12'])
+
+    def test_twins_in_cage(self):
+        caged = rules.get_rules(cages=[['A1', 'E5', 'I9']])
+        values = self.empty_board()
+        values.update({'A1': '12', 'E5': '12'})
+        solution.naked_twins(values, rules=caged)
+        self.assertEqual(values['I9'], '3456789')
+
+    def test_solve_with_all_strategies(self):
+        grid = solution_test.TestDiagonalSudoku.diagonal_grid
+        for trail in (False, True):
+            self.assertEqual(solution.solve(grid, trail=trail, strategies=solution.ALL_STRATEGIES),
+                             solution_test.TestDiagonalSudoku.solved_diag_sudoku)
+
+
+if __name__ == '__main__':
+    unittest.main()
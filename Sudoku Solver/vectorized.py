@@ -0,0 +1,171 @@
+"""
+Batch propagation of many Sudoku grids at once with NumPy.
+
+The grids are held as an (N, 81) uint16 array of the candidate masks of bitboard.py, and the
+eliminate and only_choice strategies are applied to the whole batch with array operations over
+index tables precomputed from a rules.SudokuRules. Most easy puzzles are solved by propagation
+alone, so only the grids it leaves open go on to the scalar depth-first search of bitboard.py.
+Example:
+
+    from vectorized import solve_batch
+    solutions = solve_batch(open('puzzles.txt').read().split())
+
+This module needs NumPy, which the rest of the solver does not.
+"""
+import numpy as np
+
+import bitboard
+import solution
+
+OPEN, SOLVED, FAILED = 0, 1, -1
+
+_BIT_COUNT = np.array(bitboard.BIT_COUNT, dtype=np.uint8)
+# Mask of every ASCII character of a grid string, 0 for the characters that are not part of a grid
+_CHAR_MASKS = np.zeros(256, dtype=np.uint16)
+_CHAR_MASKS[ord('.')] = bitboard.ALL_DIGITS
+for _digit, _mask in bitboard.DIGIT_MASK.items():
+    _CHAR_MASKS[ord(_digit)] = _mask
+
+
+class BatchRules(object):
+    """
+    Index arrays of a rules.SudokuRules for array operations.
+    Attributes:
+        peers(array): (81, P) the peers of every box, padded with the index 81 of an extra column
+            that is always 0, so that boxes with fewer peers can share one array.
+        unit_groups(list): (U, 9) arrays of units, the units of each array covering disjoint boxes
+            so that the boxes of a group can be written back at once.
+        units(array): (U, 9) all the units.
+    """
+
+    def __init__(self, rules):
+        width = max(len(peers) for peers in rules.peer_index)
+        self.peers = np.array([peers + (81,) * (width - len(peers)) for peers in rules.peer_index],
+                              dtype=np.intp)
+        groups = []
+        for unit in rules.unit_index:
+            for group in groups:
+                if not any(set(unit) & set(other) for other in group):
+                    group.append(unit)
+                    break
+            else:
+                groups.append([unit])
+        self.unit_groups = [np.array(group, dtype=np.intp) for group in groups]
+        self.units = np.array(rules.unit_index, dtype=np.intp)
+
+
+_cache = {}
+
+
+def get_batch_rules(rules=None):
+    """
+    Return the BatchRules of a rules.SudokuRules, solution.default_rules when None.
+    """
+    rules = rules or solution.default_rules
+    if rules not in _cache:
+        _cache[rules] = BatchRules(rules)
+    return _cache[rules]
+
+
+def grids_to_masks(grids):
+    """
+    Convert a sequence of 81 character grid strings, '.' for the blanks, into an (N, 81) uint16
+    array of candidate masks. Raises ValueError if a grid has anything else in it.
+    """
+    grids = [grid.strip() for grid in grids]
+    data = np.frombuffer(''.join(grids).encode('ascii'), dtype=np.uint8)
+    if any(len(grid) != 81 for grid in grids):
+        raise ValueError('Every grid needs 81 boxes')
+    masks = _CHAR_MASKS[data].reshape(len(grids), 81)
+    if not masks.all():
+        raise ValueError('Grids can only have digits and dots')
+    return masks
+
+
+def _eliminate(masks, rules):
+    """
+    Remove the digit of every solved box from the masks of its peers, for masks of shape (N, 82).
+    """
+    solved = np.where(_BIT_COUNT[masks] == 1, masks, 0)
+    solved[:, 81] = 0
+    taken = solved[:, rules.peers[:, 0]]
+    for i in range(1, rules.peers.shape[1]):
+        taken |= solved[:, rules.peers[:, i]]
+    masks[:, :81] &= ~taken
+
+
+def _only_choice(masks, rules):
+    """
+    Solve every box that is the only place left for a digit in one of its units.
+    """
+    for units in rules.unit_groups:
+        values = masks[:, units]
+        once = np.zeros(values.shape[:2], dtype=np.uint16)
+        twice = np.zeros_like(once)
+        for i in range(values.shape[2]):
+            twice |= once & values[:, :, i]
+            once |= values[:, :, i]
+        single = (once & ~twice)[:, :, None] & values
+        masks[:, units] = np.where(single != 0, single, values)
+
+
+def _status(masks, rules):
+    """
+    Return the OPEN, SOLVED or FAILED status of every grid of masks of shape (N, 82).
+    """
+    counts = _BIT_COUNT[masks[:, :81]]
+    units = np.bitwise_or.reduce(masks[:, rules.units], axis=2)
+    failed = (counts == 0).any(axis=1) | (units != bitboard.ALL_DIGITS).any(axis=1)
+    status = np.where((counts == 1).all(axis=1), SOLVED, OPEN).astype(np.int8)
+    status[failed] = FAILED
+    return status
+
+
+def reduce_batch(masks, rules=None):
+    """
+    Apply eliminate and only_choice to a batch of grids until none of them changes any more.
+    Args:
+        masks(array): (N, 81) candidate masks, e.g. from grids_to_masks(). Not modified.
+        rules(SudokuRules): the units to use, solution.default_rules when None.
+    Returns:
+        (masks, status): the reduced (N, 81) masks and an array with the OPEN, SOLVED or FAILED
+        status of every grid.
+    """
+    batch_rules = get_batch_rules(rules)
+    work = np.zeros((len(masks), 82), dtype=np.uint16)
+    work[:, :81] = masks
+    active = np.arange(len(masks))
+    while len(active):
+        before = work[active]
+        after = before.copy()
+        _eliminate(after, batch_rules)
+        _only_choice(after, batch_rules)
+        work[active] = after
+        changed = (after != before).any(axis=1)
+        # a grid that ran out of candidates keeps changing to 0, stop at the first empty box
+        changed &= (_BIT_COUNT[after[:, :81]] != 0).all(axis=1)
+        active = active[changed]
+    return work[:, :81], _status(work, batch_rules)
+
+
+def solve_batch(grids, rules=None):
+    """
+    Find the solutions of many grids, propagating them together and searching the rest one by one.
+    Args:
+        grids(list): grid strings, see grids_to_masks().
+        rules(SudokuRules): the variant to solve, solution.default_rules when None.
+    Returns:
+        A list with the dictionary representation of the solution of every grid, the same as
+        solution.solve(), or False for the grids without a solution.
+    """
+    masks, status = reduce_batch(grids_to_masks(grids), rules)
+    results = []
+    for row, state in zip(masks, status):
+        if state == FAILED:
+            results.append(False)
+            continue
+        row = row.tolist()
+        if state == OPEN:
+            row = bitboard.search(row, rules)
+        results.append(row and bitboard.masks_to_values(row))
+    return results
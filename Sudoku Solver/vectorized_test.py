@@ -0,0 +1,51 @@
+import unittest
+
+import bitboard
+import solution
+import solution_test
+from rules import CLASSIC, WINDOKU
+
+try:
+    import vectorized
+except ImportError:
+    vectorized = None
+
+
+@unittest.skipIf(vectorized is None, 'NumPy is not installed')
+class TestVectorized(unittest.TestCase):
+    diagonal_grid = solution_test.TestDiagonalSudoku.diagonal_grid
+    hard_grid = '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......'
+    easy_grid = '..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3..'
+
+    def test_grids_to_masks(self):
+        masks = vectorized.grids_to_masks([self.hard_grid, self.easy_grid])
+        self.assertEqual(masks.shape, (2, 81))
+        self.assertEqual(masks[0, 0], 1 << 3)
+        self.assertEqual(masks[0, 1], 511)
+        self.assertRaises(ValueError, vectorized.grids_to_masks, [self.hard_grid[1:]])
+        self.assertRaises(ValueError, vectorized.grids_to_masks, ['x' + self.hard_grid[1:]])
+
+    def test_reduce_batch(self):
+        grids = [self.easy_grid, self.hard_grid, '22' + '.' * 79]
+        masks, status = vectorized.reduce_batch(vectorized.grids_to_masks(grids), CLASSIC)
+        self.assertEqual(list(status), [vectorized.SOLVED, vectorized.OPEN, vectorized.FAILED])
+        expected = solution.reduce_puzzle(solution.grid_values(self.hard_grid), rules=CLASSIC,
+                                          strategies=(solution.eliminate, solution.only_choice))
+        self.assertEqual(bitboard.masks_to_values(masks[1].tolist()), expected)
+
+    def test_solve_batch(self):
+        grids = [self.easy_grid, self.hard_grid, '22' + '.' * 79]
+        self.assertEqual(vectorized.solve_batch(grids, CLASSIC),
+                         [solution.solve(grid, rules=CLASSIC) for grid in grids])
+        self.assertEqual(vectorized.solve_batch([self.diagonal_grid]),
+                         [solution_test.TestDiagonalSudoku.solved_diag_sudoku])
+
+    def test_unit_groups(self):
+        batch_rules = vectorized.get_batch_rules(WINDOKU)
+        for group in batch_rules.unit_groups:
+            self.assertEqual(len(set(group.ravel())), group.size)
+        self.assertEqual(sum(len(group) for group in batch_rules.unit_groups), len(WINDOKU.unit_list))
+
+
+if __name__ == '__main__':
+    unittest.main()